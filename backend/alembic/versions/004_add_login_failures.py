@@ -0,0 +1,31 @@
+"""Add login_failures table for shared login lockout
+
+Revision ID: 004_login_failures
+Revises: 003_notification_prefs
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "004_login_failures"
+down_revision = "003_notification_prefs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "login_failures",
+        sa.Column("key_hash", sa.String(64), primary_key=True),
+        sa.Column("window_index", sa.BigInteger, nullable=False),
+        sa.Column("prev_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("curr_count", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_login_failures_updated_at", "login_failures", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_login_failures_updated_at", table_name="login_failures")
+    op.drop_table("login_failures")
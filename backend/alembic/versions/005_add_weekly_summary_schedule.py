@@ -0,0 +1,32 @@
+"""Add weekly summary scheduling index and last-sent marker
+
+Revision ID: 005_weekly_summary_schedule
+Revises: 004_login_failures
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005_weekly_summary_schedule"
+down_revision = "004_login_failures"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("weekly_summary_last_sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_users_weekly_summary_schedule",
+        "users",
+        ["notification_timezone", "weekly_summary_day", "weekly_summary_hour"],
+        postgresql_where=sa.text("weekly_summary_enabled AND email_notifications_enabled"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_weekly_summary_schedule", table_name="users")
+    op.drop_column("users", "weekly_summary_last_sent_at")
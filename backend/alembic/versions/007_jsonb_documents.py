@@ -0,0 +1,46 @@
+"""Store review snapshots and analysis documents as JSONB
+
+Revision ID: 007_jsonb_documents
+Revises: 006_email_outbox
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+from sqlalchemy.dialects.postgresql import JSON, JSONB
+
+revision = "007_jsonb_documents"
+down_revision = "006_email_outbox"
+branch_labels = None
+depends_on = None
+
+DOCUMENT_COLUMNS = {
+    "weekly_reviews": ("snapshot", "prev_snapshot", "changes"),
+    "analysis_results": ("insights", "warnings", "recommendations", "raw_data"),
+}
+
+
+def _convert(type_, cast: str) -> None:
+    for table, columns in DOCUMENT_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=type_,
+                postgresql_using=f"{column}::{cast}",
+            )
+
+
+def upgrade() -> None:
+    _convert(JSONB(), "jsonb")
+    # Trend lookups ("latest analysis before a date") filter on the user and
+    # order by snapshot date.
+    op.create_index(
+        "ix_analysis_results_user_snapshot_date",
+        "analysis_results",
+        ["user_id", "snapshot_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analysis_results_user_snapshot_date", table_name="analysis_results")
+    _convert(JSON(), "json")
@@ -0,0 +1,89 @@
+"""Range-partition transactions by month
+
+Revision ID: 008_partition_transactions
+Revises: 007_jsonb_documents
+Create Date: 2026-10-19
+
+The existing heap is renamed aside, a partitioned ``transactions`` with the
+same columns is created with one partition per month from the oldest row
+through TRANSACTION_PARTITION_MONTHS_AHEAD months from now (plus a default
+partition), the rows are copied across and the old table is dropped. The copy
+takes an exclusive lock on transactions for its duration; for very large
+tables run it in a maintenance window.
+
+The primary key becomes (id, user_id, date): a unique constraint on a
+partitioned table must include every partition key, and including user_id
+lets TRANSACTION_HASH_PARTITIONS be enabled later for new months without
+another migration.
+"""
+
+from datetime import date
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.config import settings
+from app.services.partitions import MAX_MONTHS_BACK, add_months, month_start, partition_statements
+
+revision = "008_partition_transactions"
+down_revision = "007_jsonb_documents"
+branch_labels = None
+depends_on = None
+
+def _first_month(today: date) -> date:
+    earliest = month_start(add_months(today, -MAX_MONTHS_BACK))
+    if context.is_offline_mode():
+        return month_start(today)
+    oldest = op.get_bind().scalar(sa.text("SELECT min(date) FROM transactions_unpartitioned"))
+    return max(month_start(oldest), earliest) if oldest else month_start(today)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_unpartitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_unpartitioned_pkey")
+    op.execute("ALTER INDEX ix_transactions_user_id RENAME TO ix_transactions_unpartitioned_user_id")
+    op.execute("ALTER INDEX ix_transactions_account_id RENAME TO ix_transactions_unpartitioned_account_id")
+
+    op.execute(
+        "CREATE TABLE transactions "
+        "(LIKE transactions_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        "PARTITION BY RANGE (date)"
+    )
+    op.execute("ALTER TABLE transactions ADD PRIMARY KEY (id, user_id, date)")
+    op.create_foreign_key("transactions_account_id_fkey", "transactions", "accounts", ["account_id"], ["id"])
+    op.create_foreign_key("transactions_user_id_fkey", "transactions", "users", ["user_id"], ["id"])
+    op.execute("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT")
+
+    today = date.today()
+    month = _first_month(today)
+    last = add_months(month_start(today), settings.transaction_partition_months_ahead)
+    while month <= last:
+        for statement in partition_statements(month, settings.transaction_hash_partitions):
+            op.execute(statement)
+        month = add_months(month, 1)
+
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_unpartitioned")
+    # Built after the copy; each partition gets its own index.
+    op.create_index("ix_transactions_user_date", "transactions", ["user_id", "date"])
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+    op.drop_table("transactions_unpartitioned")
+    op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE transactions RENAME TO transactions_partitioned")
+    op.execute("ALTER INDEX transactions_pkey RENAME TO transactions_partitioned_pkey")
+    op.execute("ALTER INDEX ix_transactions_user_date RENAME TO ix_transactions_partitioned_user_date")
+    op.execute("ALTER INDEX ix_transactions_account_id RENAME TO ix_transactions_partitioned_account_id")
+
+    op.execute(
+        "CREATE TABLE transactions "
+        "(LIKE transactions_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+    op.execute("INSERT INTO transactions SELECT * FROM transactions_partitioned")
+    op.execute("ALTER TABLE transactions ADD PRIMARY KEY (id)")
+    op.create_foreign_key("transactions_account_id_fkey", "transactions", "accounts", ["account_id"], ["id"])
+    op.create_foreign_key("transactions_user_id_fkey", "transactions", "users", ["user_id"], ["id"])
+    op.create_index("ix_transactions_user_id", "transactions", ["user_id"])
+    op.create_index("ix_transactions_account_id", "transactions", ["account_id"])
+    op.execute("DROP TABLE transactions_partitioned CASCADE")
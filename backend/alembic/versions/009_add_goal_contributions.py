@@ -0,0 +1,56 @@
+"""Add goal_contributions ledger
+
+Revision ID: 009_goal_contributions
+Revises: 008_partition_transactions
+Create Date: 2026-10-19
+
+Every change to a goal's current_amount is recorded with the balance after
+it, so goal forecasts can fit the actual contribution rate. Existing goals
+with a non-zero balance get their current balance, dated when the goal was
+last updated, and, when that was after the goal was created, a zero balance
+at creation, so the backfilled history has a slope to fit.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "009_goal_contributions"
+down_revision = "008_partition_transactions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "goal_contributions",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("goal_id", UUID(as_uuid=True), sa.ForeignKey("goals.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("balance", sa.Numeric(12, 2), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_goal_contributions_user_goal", "goal_contributions", ["user_id", "goal_id"])
+    op.execute(
+        """
+        INSERT INTO goal_contributions (id, goal_id, user_id, amount, balance, recorded_at)
+        SELECT gen_random_uuid(), id, user_id, current_amount, current_amount,
+               COALESCE(updated_at, created_at, now())
+        FROM goals
+        WHERE current_amount <> 0
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO goal_contributions (id, goal_id, user_id, amount, balance, recorded_at)
+        SELECT gen_random_uuid(), id, user_id, 0, 0, created_at
+        FROM goals
+        WHERE current_amount <> 0 AND created_at < updated_at
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_goal_contributions_user_goal", table_name="goal_contributions")
+    op.drop_table("goal_contributions")
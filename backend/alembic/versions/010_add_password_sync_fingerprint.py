@@ -0,0 +1,26 @@
+"""Add users.password_sync_fingerprint
+
+Revision ID: 010_password_sync_fingerprint
+Revises: 009_goal_contributions
+Create Date: 2026-10-19
+
+A keyed HMAC of the password, bound to the local bcrypt hash, lets a
+Supabase login skip bcrypt when the local copy is already current. Existing
+users have none, so each gets one re-hash on their next login.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "010_password_sync_fingerprint"
+down_revision = "009_goal_contributions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("password_sync_fingerprint", sa.String(64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "password_sync_fingerprint")
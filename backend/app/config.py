@@ -1,12 +1,48 @@
 from pydantic_settings import BaseSettings
 
 
+def _normalise_database_url(url: str) -> str:
+    """Normalise a DB URL for SQLAlchemy 2.0 (postgres:// → postgresql://)."""
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def _asyncpg_url(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgresql", "postgresql+psycopg2"):
+        url = f"postgresql+asyncpg{sep}{rest}"
+    # asyncpg spells libpq's sslmode as ssl.
+    return url.replace("sslmode=", "ssl=")
+
+
 class Settings(BaseSettings):
     database_url: str
+    # Optional read replica for GET requests; see app.database.RoutingSession.
+    read_database_url: str | None = None
+    read_your_writes_seconds: float = 5.0
+    db_pool_size: int = 10
+    db_max_overflow: int = 5
+    db_pool_timeout_seconds: float = 10.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = False
+    db_connect_timeout_seconds: int = 10
+    db_statement_timeout_ms: int = 15_000
+    db_idle_in_transaction_timeout_ms: int = 30_000
+    # asyncpg server-side prepared statements per connection; 0 behind a
+    # transaction-pooling PgBouncer.
+    db_prepared_statement_cache_size: int = 500
+    # AnyIO threads for sync routes and run_in_threadpool work. Defaults to
+    # db_pool_size + db_max_overflow and may not exceed it; see
+    # app.database.api_threadpool_size.
+    api_threadpool_size: int | None = None
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_minutes: int = 60
     password_reset_expiration_minutes: int = 30
+    bcrypt_max_workers: int = 4
+    lockout_backend: str = "memory"
+    lockout_max_entries: int = 100_000
     encryption_key: str
     frontend_base_url: str | None = "http://localhost:3000"
     allowed_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
@@ -18,19 +54,100 @@ class Settings(BaseSettings):
     smtp_password: str | None = None
     smtp_use_tls: bool = True
     smtp_from_email: str | None = None
+    smtp_timeout_seconds: float = 20.0
+    smtp_pool_size: int = 4
+    smtp_max_messages_per_connection: int = 100
+    smtp_idle_seconds: float = 60.0
+    email_outbox_worker_enabled: bool = True
+    email_outbox_poll_seconds: float = 5.0
+    email_outbox_batch_size: int = 100
+    email_outbox_max_attempts: int = 8
+    email_outbox_backoff_base_seconds: float = 30.0
+    email_outbox_backoff_max_seconds: float = 3600.0
+    email_outbox_lease_seconds: int = 300
+    # Sent and permanently failed rows are deleted this long after they were queued.
+    email_outbox_retention_days: int = 7
+    email_outbox_purge_interval_seconds: float = 3600.0
+    weekly_summary_scheduler_enabled: bool = False
+    weekly_summary_dispatch_interval_seconds: int = 600
+    weekly_summary_batch_size: int = 500
+    weekly_summary_workers: int = 8
+    # Monthly transaction partitions; see app.services.partitions. Maintenance
+    # is meant to run as `python -m app.services.partitions`, not in the API.
+    transaction_partition_months_ahead: int = 3
+    transaction_hash_partitions: int = 0
+    transaction_partition_maintenance_enabled: bool = False
+    transaction_partition_maintenance_interval_seconds: int = 21_600
+    # Monte Carlo projections (app.services.projections), simulated on a
+    # process pool and cached per user and inputs.
+    projection_workers: int = 2
+    projection_paths: int = 2_000
+    projection_cache_size: int = 1_024
+    # Logging (app.logging_config): "text" or "json"; LOG_QUEUE_SIZE=0 writes
+    # synchronously on the calling thread instead of through the queue.
+    log_format: str = "text"
+    log_level: str = "INFO"
+    log_queue_size: int = 10_000
+    log_queue_block_ms: float = 100.0
+    # Per-request timing (app.middleware.timing): Server-Timing headers, plus
+    # warnings for slow requests and for requests issuing many statements.
+    request_timing_enabled: bool = True
+    slow_request_ms: float = 500.0
+    request_statement_warn_threshold: int = 25
+    slow_request_top_statements: int = 3
+    # Prometheus /metrics, off unless enabled; when a token is set, scrapers
+    # must send it as a bearer token.
+    metrics_enabled: bool = False
+    metrics_bearer_token: str | None = None
+    # Sampling profiler (app.middleware.profiling). A request whose X-Profile
+    # header or ?profile= parameter equals PROFILING_TOKEN gets its speedscope
+    # profile back instead of the normal body. Requests from the comma-separated
+    # PROFILING_USER_IDS are always profiled and stored in PROFILING_DIR.
+    # PROFILING_SAMPLE_RATE profiles that fraction of all requests into the
+    # per-route hot stacks served at /debug/hot-stacks.
+    profiling_token: str | None = None
+    profiling_user_ids: str = ""
+    profiling_dir: str = "/tmp/finpulse-profiles"
+    profiling_sample_rate: float = 0.0
+    profiling_interval_ms: float = 5.0
+    profiling_hot_stacks_per_route: int = 500
+    rate_limit_default: str = "300/minute"
+    rate_limit_expensive: str = "10/minute"
+    rate_limit_storage_url: str | None = None
+    rate_limit_sweep_seconds: float = 60.0
     supabase_url: str | None = None
     supabase_anon_key: str | None = None
     supabase_service_role_key: str | None = None
+    supabase_timeout_seconds: float = 10.0
+    supabase_login_timeout_seconds: float = 5.0
+    supabase_max_retries: int = 2
+    supabase_pool_size: int = 10
+    supabase_keepalive_seconds: float = 30.0
+    supabase_circuit_failure_threshold: int = 5
+    supabase_circuit_reset_seconds: float = 30.0
+    supabase_jwt_secret: str | None = None
+    supabase_jwt_audience: str = "authenticated"
+    supabase_jwks_refresh_seconds: int = 600
 
     model_config = {"env_file": ".env"}
 
     @property
     def effective_database_url(self) -> str:
-        """Normalise the DB URL for SQLAlchemy 2.0 (postgres:// → postgresql://)."""
-        url = self.database_url
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql://", 1)
-        return url
+        return _normalise_database_url(self.database_url)
+
+    @property
+    def async_database_url(self) -> str:
+        """The same database addressed through the asyncpg driver."""
+        return _asyncpg_url(self.effective_database_url)
+
+    @property
+    def effective_read_database_url(self) -> str | None:
+        return _normalise_database_url(self.read_database_url) if self.read_database_url else None
+
+    @property
+    def async_read_database_url(self) -> str | None:
+        url = self.effective_read_database_url
+        return _asyncpg_url(url) if url else None
 
     @property
     def cors_origins(self) -> list[str]:
@@ -44,6 +161,14 @@ class Settings(BaseSettings):
         regex = (self.allowed_origin_regex or "").strip()
         return regex or None
 
+    @property
+    def profiling_user_id_set(self) -> frozenset[str]:
+        return frozenset(u.strip().lower() for u in self.profiling_user_ids.split(",") if u.strip())
+
+    @property
+    def profiling_enabled(self) -> bool:
+        return bool(self.profiling_token or self.profiling_user_id_set or self.profiling_sample_rate > 0)
+
     @property
     def supabase_enabled(self) -> bool:
         return bool((self.supabase_url or "").strip() and (self.supabase_anon_key or "").strip())
@@ -1,19 +1,403 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.config import settings
+from app.metrics import record_cache_lookup
+
+
+class _CheckoutStatsMixin:
+    """Records how long pool checkouts wait for a free connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_seconds_total += waited
+                self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep the counters cumulative.
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        return pool
+
+
+class InstrumentedQueuePool(_CheckoutStatsMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _server_options() -> dict[str, str]:
+    # Server-side guards so one runaway query or abandoned transaction cannot
+    # hold a pooled connection indefinitely.
+    return {
+        "statement_timeout": str(settings.db_statement_timeout_ms),
+        "idle_in_transaction_session_timeout": str(settings.db_idle_in_transaction_timeout_ms),
+    }
+
+
+def _connect_args(url: str) -> dict:
+    if not url.startswith("postgresql"):
+        return {}
+    return {
+        "options": " ".join(f"-c {name}={value}" for name, value in _server_options().items()),
+        "connect_timeout": settings.db_connect_timeout_seconds,
+        # TCP keepalives surface dead peers without a pre-ping per checkout.
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 3,
+    }
+
+
+class QueryStats:
+    """SQL statements issued while serving one request (see app.middleware.timing)."""
+
+    def __init__(self, keep_slowest: int = 3):
+        self.count = 0
+        self.seconds = 0.0
+        self._keep = keep_slowest
+        self._slowest: list[tuple[float, str]] = []
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if len(self._slowest) < self._keep:
+            heapq.heappush(self._slowest, (seconds, statement))
+        elif self._keep and seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (seconds, statement))
+
+    def slowest(self) -> list[tuple[float, str]]:
+        return sorted(self._slowest, reverse=True)
+
+
+# Set per request by the timing middleware; sync routes see it through the
+# context copied into their worker thread, async sessions through the greenlet.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_query_stats.get() is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    cache_hit = getattr(context, "cache_hit", None)
+    if cache_hit is CACHE_HIT or cache_hit is CACHE_MISS:
+        record_cache_lookup("sql_compiled", cache_hit is CACHE_HIT)
+    stats = current_query_stats.get()
+    started = getattr(context, "_query_started", None)
+    if stats is not None and started is not None:
+        stats.add(statement, time.perf_counter() - started)
+
+
+def instrument_queries(bind: Engine) -> Engine:
+    """Count and time every statement *bind* runs into the request's QueryStats.
+
+    Also counts compiled-statement cache hits and misses for ``/metrics``.
+    """
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+    return bind
+
+
+def build_engine(url: str) -> Engine:
+    """Create an engine whose pool is sized and bounded by settings.
+
+    With pre-ping off, stale connections are handled by ``pool_recycle`` and by
+    SQLAlchemy's disconnect detection, which invalidates the pool when a query
+    fails with a disconnect error so the next checkout reconnects.
+    """
+    bind = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=True,
+        connect_args=_connect_args(url),
+    )
+    return instrument_queries(bind)
+
+
+class RecentWriters:
+    """Users who wrote within the last ``window_seconds``, for read-your-writes.
+
+    Per process and bounded: the oldest entries are dropped past ``max_entries``.
+    """
+
+    def __init__(self, window_seconds: float, max_entries: int = 100_000, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._written_at: OrderedDict = OrderedDict()
+
+    def mark(self, user_id) -> None:
+        with self._lock:
+            self._written_at[user_id] = self._clock()
+            self._written_at.move_to_end(user_id)
+            while len(self._written_at) > self.max_entries:
+                self._written_at.popitem(last=False)
+
+    def is_recent(self, user_id) -> bool:
+        with self._lock:
+            written_at = self._written_at.get(user_id)
+            if written_at is None:
+                return False
+            if self._clock() - written_at < self.window_seconds:
+                return True
+            del self._written_at[user_id]
+            return False
 
-engine = create_engine(settings.effective_database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+recent_writers = RecentWriters(settings.read_your_writes_seconds)
+
+READ_YOUR_WRITES_COOKIE = "finpulse_wrote_at"
+
+
+class WriteMarker:
+    """One request's read-your-writes state across workers (see app.middleware.read_your_writes).
+
+    ``cookie_written_at`` is the client's last write time as echoed back in
+    ``READ_YOUR_WRITES_COOKIE``; ``written_at`` is set when this request
+    writes, so its response can refresh the cookie.
+    """
+
+    def __init__(self, cookie_written_at: float | None = None, clock=time.time):
+        self.cookie_written_at = cookie_written_at
+        self.written_at: float | None = None
+        self._clock = clock
+
+    def mark(self) -> None:
+        self.written_at = self._clock()
+
+    def is_recent(self) -> bool:
+        if self.cookie_written_at is None:
+            return False
+        # A time in the future is not a write this API recorded.
+        return 0 <= self._clock() - self.cookie_written_at < settings.read_your_writes_seconds
+
+
+# Set per request by ReadYourWritesMiddleware; sync routes share the same
+# marker object through the context copied into their worker thread.
+current_write_marker: ContextVar[WriteMarker | None] = ContextVar("current_write_marker", default=None)
+
+
+class RoutingSession(Session):
+    """Session that sends reads to a replica and everything else to the primary.
+
+    Only sessions given ``info["replica_bind"]`` (GET requests, see ``get_db``)
+    use the replica. Flushes, DML and ``FOR UPDATE`` selects go to the primary,
+    and once a session has written, or ``info["use_primary"]`` is set, all of
+    its later reads do too so it sees its own changes. A user who wrote
+    recently, on this worker or (by the request's write cookie) on another,
+    reads from the primary too.
+    """
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        replica = self.info.get("replica_bind")
+        is_write = self._flushing or (
+            clause is not None
+            and (getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None)
+        )
+        if is_write:
+            self._note_write()
+        elif replica is not None and not self.info.get("use_primary"):
+            return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _note_write(self) -> None:
+        self.info["use_primary"] = True
+        user_id = self.info.get("user_id")
+        if user_id is not None:
+            recent_writers.mark(user_id)
+        marker = current_write_marker.get()
+        if marker is not None:
+            marker.mark()
+
+    def bind_user(self, user_id) -> None:
+        """Attach the request's user; route to the primary if they wrote recently."""
+        self.info["user_id"] = user_id
+        marker = current_write_marker.get()
+        if recent_writers.is_recent(user_id) or (marker is not None and marker.is_recent()):
+            self.info["use_primary"] = True
+
+    @property
+    def reads_from_replica(self) -> bool:
+        return self.info.get("replica_bind") is not None and not self.info.get("use_primary")
+
+
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+engine = build_engine(settings.effective_database_url)
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+replica_engine = (
+    build_engine(settings.effective_read_database_url) if settings.effective_read_database_url else None
+)
+
+# The asyncpg engine is created on first use so the sync-only entry points
+# (Alembic, cron jobs) never need the async driver.
+_async_engine: AsyncEngine | None = None
+_async_replica_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+_async_engine_lock = threading.Lock()
+
+
+def build_async_engine(url: str) -> AsyncEngine:
+    async_engine = create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        pool_use_lifo=True,
+        connect_args={
+            "server_settings": _server_options(),
+            "timeout": settings.db_connect_timeout_seconds,
+            "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        },
+    )
+    instrument_queries(async_engine.sync_engine)
+    return async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    global _async_engine, _async_replica_engine, _async_session_factory
+    if _async_engine is None:
+        with _async_engine_lock:
+            if _async_engine is None:
+                if settings.async_read_database_url:
+                    _async_replica_engine = build_async_engine(settings.async_read_database_url)
+                _async_engine = build_async_engine(settings.async_database_url)
+                # Routes return plain data after commit; nothing needs re-loading.
+                _async_session_factory = async_sessionmaker(
+                    _async_engine,
+                    sync_session_class=RoutingSession,
+                    autoflush=False,
+                    expire_on_commit=False,
+                )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_replica_engine, _async_session_factory
+    if _async_replica_engine is not None:
+        await _async_replica_engine.dispose()
+        _async_replica_engine = None
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+def api_threadpool_size() -> int:
+    """Threads for sync routes: the sync pool's capacity unless API_THREADPOOL_SIZE lowers it.
+
+    More threads than connections only moves the queue from AnyIO into pool
+    checkouts, where requests time out instead of waiting, so a larger value
+    is a configuration error and raises RuntimeError.
+    """
+    capacity = settings.db_pool_size + settings.db_max_overflow
+    if settings.api_threadpool_size is None:
+        return capacity
+    if settings.api_threadpool_size > capacity:
+        raise RuntimeError(
+            f"API_THREADPOOL_SIZE ({settings.api_threadpool_size}) exceeds the database pool's capacity "
+            f"(DB_POOL_SIZE + DB_MAX_OVERFLOW = {capacity})"
+        )
+    return settings.api_threadpool_size
+
+
+def pool_metrics(bind: Engine = engine) -> dict:
+    """Snapshot of connection pool gauges and checkout wait statistics."""
+    pool = bind.pool
+    checkouts = getattr(pool, "checkouts", 0)
+    wait_total = getattr(pool, "wait_seconds_total", 0.0)
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.db_max_overflow,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "checkouts": checkouts,
+        "timeouts": getattr(pool, "timeouts", 0),
+        "wait_ms_avg": round(wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+        "wait_ms_max": round(getattr(pool, "wait_seconds_max", 0.0) * 1000, 3),
+    }
+
+
+def all_pool_metrics() -> dict:
+    metrics = {
+        "sync": pool_metrics(engine),
+        "async": pool_metrics(_async_engine.sync_engine) if _async_engine is not None else None,
+    }
+    if replica_engine is not None:
+        metrics["sync_replica"] = pool_metrics(replica_engine)
+        metrics["async_replica"] = (
+            pool_metrics(_async_replica_engine.sync_engine) if _async_replica_engine is not None else None
+        )
+    return metrics
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    if replica_engine is not None and request.method in READ_ONLY_METHODS:
+        db.info["replica_bind"] = replica_engine
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db(request: Request):
+    """Async counterpart of ``get_db``: the DB wait does not hold a worker thread.
+
+    Existing sync service functions can run on it via ``await db.run_sync(fn, ...)``.
+    """
+    get_async_engine()
+    async with _async_session_factory() as db:
+        if _async_replica_engine is not None and request.method in READ_ONLY_METHODS:
+            db.sync_session.info["replica_bind"] = _async_replica_engine.sync_engine
+        yield db
@@ -3,22 +3,32 @@ import uuid
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.database import get_db
+from app.database import get_async_db, get_db
+from app.logging_config import set_log_user
 from app.models.user import User
+from app.services.queries import get_user
+from app.services.supabase_jwt import verify_supabase_access_token
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    token = credentials.credentials
+def _decode_access_token(token: str) -> dict:
+    """Accept our own access tokens and, in Supabase mode, Supabase-issued ones."""
+    try:
+        return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        if not settings.supabase_enabled:
+            raise
+    return verify_supabase_access_token(token)
+
+
+def user_id_from_token(token: str) -> uuid.UUID:
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+        payload = _decode_access_token(token)
         user_id: str = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
@@ -26,11 +36,40 @@ def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
     try:
-        user_uuid = uuid.UUID(user_id)
+        return uuid.UUID(user_id)
     except (TypeError, ValueError):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
 
-    user = db.query(User).filter(User.id == user_uuid).first()
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db),
+) -> User:
+    user_uuid = user_id_from_token(credentials.credentials)
+    set_log_user(user_uuid)
+    db.bind_user(user_uuid)
+    user = get_user(db, user_uuid)
+    if user is None and db.reads_from_replica:
+        # A user who just registered may not have replicated yet.
+        db.info["use_primary"] = True
+        user = get_user(db, user_uuid)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """Like ``get_current_user`` but loads the user on the request's AsyncSession."""
+    user_uuid = user_id_from_token(credentials.credentials)
+    set_log_user(user_uuid)
+    db.sync_session.bind_user(user_uuid)
+    user = await db.get(User, user_uuid)
+    if user is None and db.sync_session.reads_from_replica:
+        db.sync_session.info["use_primary"] = True
+        user = await db.get(User, user_uuid)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return user
@@ -1,17 +1,173 @@
+"""Application logging.
+
+Records from the ``finpulse`` loggers go through a bounded in-memory queue: the
+calling thread only renders the message and enqueues it, and a listener
+thread does the formatting and the blocking write to stdout. When a burst
+fills the queue, records below WARNING are dropped (and counted in
+``finpulse_log_records_dropped_total``); WARNING and above wait up to
+``LOG_QUEUE_BLOCK_MS`` for room before being dropped.
+
+``LOG_FORMAT=json`` emits one JSON object per line, carrying the request id,
+user id, route and time since the request started for records logged while
+serving a request (see ``app.middleware.request_context``).
+"""
+
+import atexit
+import copy
+import json
 import logging
+import queue
 import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
+from app.config import settings
+from app.metrics import LOG_RECORDS_DROPPED
 
-def setup_logging() -> None:
-    """Configure structured logging for the application."""
-    formatter = logging.Formatter(
-        fmt="%(asctime)s %(levelname)-8s %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+TEXT_FORMAT = "%(asctime)s %(levelname)-8s %(name)s: %(message)s"
+
+
+class RequestLogContext:
+    """Per-request fields stamped onto log records.
+
+    Mutable so that a dependency running in a worker thread (with a copy of
+    the request's context) can still fill in the user id.
+    """
+
+    __slots__ = ("request_id", "scope", "user_id", "started")
+
+    def __init__(self, request_id: str, scope: dict):
+        self.request_id = request_id
+        self.scope = scope
+        self.user_id: str | None = None
+        self.started = time.perf_counter()
+
+
+request_log_context: ContextVar[RequestLogContext | None] = ContextVar("request_log_context", default=None)
+
+
+def set_log_user(user_id) -> None:
+    context = request_log_context.get()
+    if context is not None:
+        context.user_id = str(user_id)
+
+
+class RequestContextFilter(logging.Filter):
+    """Copies the current request's fields onto the record, on the calling thread."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = request_log_context.get()
+        if context is not None:
+            scope = context.scope
+            path = getattr(scope.get("route"), "path", None) or scope.get("path", "")
+            record.request_id = context.request_id
+            record.user_id = context.user_id
+            record.route = f"{scope.get('method', '')} {path}"
+            record.duration_ms = round((time.perf_counter() - context.started) * 1000, 1)
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    _CONTEXT_FIELDS = ("request_id", "user_id", "route", "duration_ms")
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in self._CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, default=str, separators=(",", ":"))
 
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
 
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that never blocks the caller for long on a full queue."""
+
+    def __init__(self, log_queue: queue.Queue, block_seconds: float):
+        super().__init__(log_queue)
+        self.block_seconds = block_seconds
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render only the message here (args may be mutated once we return);
+        # the full formatting happens on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            if record.levelno >= logging.WARNING:
+                self.queue.put(record, timeout=self.block_seconds)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener whose ``stop()`` waits for room instead of failing on a full queue."""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+_listener: QueueListener | None = None
+_handler: logging.Handler | None = None
+
+
+def build_formatter(log_format: str) -> logging.Formatter:
+    if log_format == "json":
+        return JSONFormatter()
+    return logging.Formatter(fmt=TEXT_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+
+
+def setup_logging() -> None:
+    """Configure the ``finpulse`` loggers. Safe to call more than once."""
+    global _listener, _handler
     root = logging.getLogger("finpulse")
-    root.setLevel(logging.INFO)
+    if _handler is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(build_formatter(settings.log_format))
+
+    if settings.log_queue_size > 0:
+        handler = BoundedQueueHandler(queue.Queue(settings.log_queue_size), settings.log_queue_block_ms / 1000)
+        _listener = DrainingQueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(stop_logging)
+    else:
+        handler = stream_handler
+    handler.addFilter(RequestContextFilter())
+
+    _handler = handler
+    root.setLevel(settings.log_level.upper())
     root.addHandler(handler)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    dropped = getattr(_handler, "dropped", 0)
+    if dropped:
+        print(f"finpulse logging: dropped {dropped} record(s) while the queue was full", file=sys.stderr)
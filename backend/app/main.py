@@ -1,37 +1,83 @@
-from fastapi import FastAPI
+import hmac
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+from slowapi.middleware import SlowAPIASGIMiddleware
 
 from app.config import settings
+from app.database import all_pool_metrics, api_threadpool_size, dispose_async_engine
 from app.exceptions import register_exception_handlers
 from app.logging_config import setup_logging
+from app.metrics import mark_process_dead, render_latest, set_pool_metrics
+from app.middleware.metrics import PrometheusMiddleware
+from app.middleware.profiling import ProfilingMiddleware
 from app.middleware.rate_limit import limiter
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.middleware.request_context import RequestContextMiddleware
+from app.middleware.timing import RequestTimingMiddleware
+from app.profiling import hot_stacks
+from app.responses import ORJSONResponse
 from app.routers import (
     accounts,
     analysis,
     auth,
     credit_cards,
     dashboard,
+    debt_payoff,
     expenses,
     goals,
     investments,
     notifications,
+    projections,
     transactions,
     weekly_review,
 )
+from app.services.email_outbox import start_email_outbox_worker, stop_email_outbox_worker
+from app.services.notifications import close_smtp_pool
+from app.services.partitions import start_partition_maintenance, stop_partition_maintenance
+from app.services.projections import start_projection_pool, stop_projection_pool
+from app.services.supabase_auth import aclose_supabase_clients
+from app.services.supabase_jwt import start_supabase_key_refresh, stop_supabase_key_refresh
+from app.services.weekly_summaries import start_weekly_summary_scheduler, stop_weekly_summary_scheduler
 
 setup_logging()
 
 API_V1_PREFIX = "/api/v1"
 
-app = FastAPI(title="FinPulse API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = api_threadpool_size()
+    start_supabase_key_refresh()
+    start_email_outbox_worker()
+    start_weekly_summary_scheduler()
+    start_partition_maintenance()
+    start_projection_pool()
+    yield
+    stop_projection_pool()
+    stop_partition_maintenance()
+    stop_weekly_summary_scheduler()
+    stop_email_outbox_worker()
+    stop_supabase_key_refresh()
+    close_smtp_pool()
+    await aclose_supabase_clients()
+    await dispose_async_engine()
+    mark_process_dead()
+
+
+app = FastAPI(title="FinPulse API", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 register_exception_handlers(app)
 
+app.add_middleware(SlowAPIASGIMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -39,12 +85,26 @@ app.add_middleware(
     allow_credentials=settings.cors_allow_credentials and settings.cors_origins != ["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+if settings.effective_read_database_url:
+    app.add_middleware(ReadYourWritesMiddleware)
+
+# Added last so they wrap everything, including CORS and rate limiting.
+if settings.metrics_enabled:
+    app.add_middleware(PrometheusMiddleware)
+if settings.request_timing_enabled:
+    app.add_middleware(RequestTimingMiddleware)
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+
 app.include_router(auth.router, prefix=API_V1_PREFIX)
 app.include_router(dashboard.router, prefix=API_V1_PREFIX)
 app.include_router(expenses.router, prefix=API_V1_PREFIX)
 app.include_router(credit_cards.router, prefix=API_V1_PREFIX)
+app.include_router(debt_payoff.router, prefix=API_V1_PREFIX)
 app.include_router(investments.router, prefix=API_V1_PREFIX)
 app.include_router(goals.router, prefix=API_V1_PREFIX)
 app.include_router(transactions.router, prefix=API_V1_PREFIX)
@@ -52,13 +112,42 @@ app.include_router(accounts.router, prefix=API_V1_PREFIX)
 app.include_router(analysis.router, prefix=API_V1_PREFIX)
 app.include_router(weekly_review.router, prefix=API_V1_PREFIX)
 app.include_router(notifications.router, prefix=API_V1_PREFIX)
+app.include_router(projections.router, prefix=API_V1_PREFIX)
 
 
 @app.get("/health")
+@limiter.exempt
 def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+@limiter.exempt
+def metrics(request: Request):
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.metrics_bearer_token}".encode()
+    if settings.metrics_bearer_token and not hmac.compare_digest(
+        request.headers.get("authorization", "").encode(), expected
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    set_pool_metrics(all_pool_metrics())
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/debug/hot-stacks", include_in_schema=False)
+@limiter.exempt
+def debug_hot_stacks(request: Request, route: str | None = None):
+    """Collapsed stacks of randomly profiled requests in this worker, for speedscope or flamegraph.pl."""
+    if not settings.profiling_token:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    expected = f"Bearer {settings.profiling_token}".encode()
+    if not hmac.compare_digest(request.headers.get("authorization", "").encode(), expected):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid profiling token")
+    return Response(content=hot_stacks.collapsed(route), media_type="text/plain")
+
+
 @app.get("/")
 def root():
     return {"name": "FinPulse API", "status": "ok", "health": "/health", "docs": "/docs"}
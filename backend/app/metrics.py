@@ -0,0 +1,146 @@
+"""Prometheus metrics, served in the text exposition format at ``/metrics``.
+
+With several uvicorn workers, point ``PROMETHEUS_MULTIPROC_DIR`` at a
+directory shared by them (``start.sh`` empties it at boot). Each process then
+writes its samples to memory-mapped files there and ``/metrics`` aggregates
+all of them, so whichever worker answers a scrape reports the whole server.
+
+Hot-path updates go through label children resolved once and cached in a
+plain dict, so recording a request is a dict lookup plus one uncontended
+per-child lock; nothing is formatted until a scrape. Ratios and rates are left
+to PromQL, e.g. the SQL compiled-cache hit ratio::
+
+    sum(rate(finpulse_cache_lookups_total{cache="sql_compiled",result="hit"}[5m]))
+      / sum(rate(finpulse_cache_lookups_total{cache="sql_compiled"}[5m]))
+
+and CSV import throughput as
+``rate(finpulse_csv_import_rows_total[5m])`` (rows/sec).
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_LATENCY = Histogram(
+    "finpulse_http_request_duration_seconds",
+    "HTTP request latency by route template and status.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "finpulse_http_requests_in_progress",
+    "HTTP requests currently being served.",
+    multiprocess_mode="livesum",
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "finpulse_db_pool_connections",
+    "Connection pool gauges (size, checked_out, checked_in, overflow).",
+    ["pool", "state"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Gauge(
+    "finpulse_db_pool_checkout_timeouts",
+    "Pool checkouts that timed out since the worker started.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+CACHE_LOOKUPS = Counter(
+    "finpulse_cache_lookups",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+CSV_IMPORT_ROWS = Counter(
+    "finpulse_csv_import_rows",
+    "Rows from uploaded CSV files, by outcome (imported or duplicate).",
+    ["outcome"],
+)
+CSV_IMPORT_DURATION = Histogram(
+    "finpulse_csv_import_duration_seconds",
+    "Time to parse and store one uploaded CSV file.",
+    buckets=LATENCY_BUCKETS,
+)
+EMAIL_SEND_DURATION = Histogram(
+    "finpulse_email_send_duration_seconds",
+    "Time to hand one email to the SMTP server, including waiting for a pooled session.",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+SECTION_DURATION = Histogram(
+    "finpulse_section_duration_seconds",
+    "Time spent in instrumented service calls (app.profiling.profiled).",
+    ["section"],
+    buckets=LATENCY_BUCKETS,
+)
+LOG_RECORDS_DROPPED = Counter(
+    "finpulse_log_records_dropped",
+    "Log records dropped because the logging queue was full.",
+)
+
+_children: dict[tuple, object] = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = _children.setdefault(key, metric.labels(*labels))
+    return child
+
+
+def observe_request(method: str, route: str, status: int, seconds: float) -> None:
+    _child(REQUEST_LATENCY, method, route, str(status)).observe(seconds)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    _child(CACHE_LOOKUPS, cache, "hit" if hit else "miss").inc()
+
+
+def record_csv_import(imported: int, duplicates: int, seconds: float) -> None:
+    _child(CSV_IMPORT_ROWS, "imported").inc(imported)
+    _child(CSV_IMPORT_ROWS, "duplicate").inc(duplicates)
+    CSV_IMPORT_DURATION.observe(seconds)
+
+
+def observe_email_send(seconds: float, sent: bool) -> None:
+    _child(EMAIL_SEND_DURATION, "sent" if sent else "error").observe(seconds)
+
+
+def observe_section(section: str, seconds: float) -> None:
+    _child(SECTION_DURATION, section).observe(seconds)
+
+
+def set_pool_metrics(pools: dict[str, dict | None]) -> None:
+    """Publish ``app.database.all_pool_metrics()`` output for this process."""
+    for name, stats in pools.items():
+        if stats is None:
+            continue
+        for state in ("size", "checked_out", "checked_in", "overflow"):
+            _child(DB_POOL_CONNECTIONS, name, state).set(stats[state])
+        _child(DB_POOL_CHECKOUT_TIMEOUTS, name).set(stats["timeouts"])
+
+
+def render_latest() -> tuple[bytes, str]:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead() -> None:
+    """Drop this worker's live gauges from the shared directory on shutdown."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
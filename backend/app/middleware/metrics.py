@@ -0,0 +1,50 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database import all_pool_metrics
+from app.metrics import REQUESTS_IN_PROGRESS, observe_request, set_pool_metrics
+
+
+def route_label(scope: Scope) -> str:
+    # Only matched templates: raw paths of 404s would make the label unbounded.
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class PrometheusMiddleware:
+    """Records per-route latency and in-flight requests for ``/metrics``.
+
+    Pool gauges are refreshed from here at most every ``pool_refresh_seconds``
+    so every worker keeps its own pool samples current between scrapes.
+    """
+
+    def __init__(self, app: ASGIApp, pool_refresh_seconds: float = 1.0):
+        self.app = app
+        self.pool_refresh_seconds = pool_refresh_seconds
+        self._pools_refreshed_at = 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_PROGRESS.dec()
+            finished = time.perf_counter()
+            observe_request(scope["method"], route_label(scope), status_code, finished - started)
+            if finished - self._pools_refreshed_at >= self.pool_refresh_seconds:
+                self._pools_refreshed_at = finished
+                set_pool_metrics(all_pool_metrics())
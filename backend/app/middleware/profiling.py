@@ -0,0 +1,157 @@
+import hmac
+import json
+import logging
+import random
+import time
+import uuid
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import anyio
+from jose import JWTError, jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.logging_config import request_log_context
+from app.middleware.metrics import route_label
+from app.profiling import HotStacks, Profile, current_profile, hot_stacks
+
+logger = logging.getLogger("finpulse.profiling")
+
+PROFILE_HEADER = b"x-profile"
+
+# What to do with a request's profile.
+RETURN, STORE, AGGREGATE = "return", "store", "aggregate"
+
+
+def _header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope.get("headers", ()):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _profile_flag(scope: Scope) -> str | None:
+    flag = _header(scope, PROFILE_HEADER)
+    if flag is None and scope.get("query_string"):
+        flag = parse_qs(scope["query_string"].decode("latin-1")).get("profile", [None])[0]
+    return flag
+
+
+def _bearer_user_id(scope: Scope) -> str | None:
+    """The ``sub`` claim of the bearer token, unverified.
+
+    Verifying here would run on the event loop, including a blocking JWKS
+    fetch for an unknown Supabase key. The claim only selects whose requests
+    are profiled to disk; the route's own dependency still authenticates.
+    """
+    authorization = _header(scope, b"authorization") or ""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        user_id = jwt.get_unverified_claims(token).get("sub")
+    except JWTError:
+        return None
+    return user_id.lower() if isinstance(user_id, str) else None
+
+
+class ProfilingMiddleware:
+    """Runs selected requests under the sampling profiler in ``app.profiling``.
+
+    - ``X-Profile`` header or ``?profile=`` equal to ``profiling_token``: the
+      response body is replaced by the speedscope profile (the original status
+      is in ``X-Profiled-Status``).
+    - Requests authenticated as one of ``profiling_user_ids``: profiled as
+      usual and the profile is written to ``profiling_dir``.
+    - Otherwise a ``sample_rate`` fraction of requests is profiled into the
+      per-route ``hot_stacks``.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        token: str | None = None,
+        user_ids: frozenset[str] | None = None,
+        sample_rate: float | None = None,
+        interval_ms: float | None = None,
+        output_dir: str | None = None,
+        stacks: HotStacks = hot_stacks,
+    ):
+        self.app = app
+        self.token = (settings.profiling_token if token is None else token) or None
+        self.user_ids = settings.profiling_user_id_set if user_ids is None else user_ids
+        self.sample_rate = settings.profiling_sample_rate if sample_rate is None else sample_rate
+        self.interval_seconds = (settings.profiling_interval_ms if interval_ms is None else interval_ms) / 1000
+        self.output_dir = Path(settings.profiling_dir if output_dir is None else output_dir)
+        self.stacks = stacks
+
+    def _mode(self, scope: Scope) -> str | None:
+        if self.token:
+            flag = _profile_flag(scope)
+            if flag is not None and hmac.compare_digest(flag.encode(), self.token.encode()):
+                return RETURN
+        if self.user_ids and _bearer_user_id(scope) in self.user_ids:
+            return STORE
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return AGGREGATE
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        mode = self._mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = Profile(f"{scope['method']} {scope['path']}", self.interval_seconds)
+        ident = profile.attach()
+        token = current_profile.set(profile)
+        status_code = 500
+
+        async def hold_response(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+
+        profile.start()
+        try:
+            await self.app(scope, receive, send if mode != RETURN else hold_response)
+        finally:
+            profile.stop()
+            profile.detach(ident)
+            current_profile.reset(token)
+
+        route = f"{scope['method']} {route_label(scope)}"
+        if mode == RETURN:
+            await self._send_profile(send, profile, status_code)
+        elif mode == STORE:
+            await anyio.to_thread.run_sync(self._store, profile, route)
+        else:
+            self.stacks.add(route, profile.collapsed())
+
+    async def _send_profile(self, send: Send, profile: Profile, status_code: int) -> None:
+        body = json.dumps(profile.speedscope(), separators=(",", ":")).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"x-profiled-status", str(status_code).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def _store(self, profile: Profile, route: str) -> None:
+        context = request_log_context.get()
+        request_id = context.request_id if context is not None else uuid.uuid4().hex
+        path = self.output_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}.speedscope.json"
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(profile.speedscope(), separators=(",", ":")))
+        except OSError:
+            logger.exception("Could not write profile for %s to %s", route, path)
+            return
+        logger.info("Profiled %s: %d samples written to %s", route, profile.sample_count, path)
@@ -1,7 +1,21 @@
+import logging
+import math
+import threading
+import time
+
 from fastapi import Request
+from jose import JWTError
+from limits import RateLimitItem
+from limits.strategies import RateLimiter
+from limits.util import WindowStats
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
+from app.config import settings
+from app.dependencies import _decode_access_token
+
+logger = logging.getLogger("finpulse.rate_limit")
+
 
 def _client_ip(request: Request) -> str:
     # In Railway/Vercel/Reverse-proxy setups, use the first forwarded IP.
@@ -11,4 +25,194 @@ def _client_ip(request: Request) -> str:
     return get_remote_address(request)
 
 
-limiter = Limiter(key_func=_client_ip, default_limits=["300/minute"])
+def user_rate_limit_key(request: Request) -> str:
+    """Key expensive endpoints by authenticated user, falling back to client IP.
+
+    The token signature is verified so a client cannot dodge its limit by
+    minting arbitrary subjects.
+    """
+    authorization = request.headers.get("authorization") or ""
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            subject = _decode_access_token(token).get("sub")
+        except JWTError:
+            subject = None
+        if subject:
+            return f"user:{subject}"
+    return f"ip:{_client_ip(request)}"
+
+
+# ── GCRA storage ───────────────────────────────────────────────────────
+#
+# GCRA (generic cell rate algorithm) tracks a single "theoretical arrival
+# time" (TAT) per key: each hit pushes the TAT forward by period/amount, and a
+# hit is rejected when the TAT would run more than one period ahead of now.
+# That is one float per key, with no per-window bookkeeping.
+
+# Slack for float rounding on epoch timestamps so exactly `amount` hits fit in
+# one period.
+_TAT_TOLERANCE_SECONDS = 1e-3
+
+
+class InMemoryGCRAStore:
+    """Per-process GCRA state with periodic sweeping of idle keys."""
+
+    def __init__(self, sweep_seconds: float = 60.0, clock=time.time):
+        self.sweep_seconds = sweep_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tats: dict[str, float] = {}
+        self._next_sweep = clock() + sweep_seconds
+
+    def __len__(self) -> int:
+        return len(self._tats)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def update(self, key: str, increment: float, period: float, now: float) -> tuple[bool, float]:
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            tat = max(self._tats.get(key, now), now)
+            new_tat = tat + increment
+            if new_tat - now > period + _TAT_TOLERANCE_SECONDS:
+                return False, tat
+            self._tats[key] = new_tat
+            return True, new_tat
+
+    def get(self, key: str) -> float | None:
+        with self._lock:
+            return self._tats.get(key)
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._tats.pop(key, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._tats.clear()
+
+    def _sweep(self, now: float) -> None:
+        # A key whose TAT is in the past is indistinguishable from a new key.
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._next_sweep = now + self.sweep_seconds
+
+
+_REDIS_GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local increment = tonumber(ARGV[2])
+local period = tonumber(ARGV[3]) + tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then
+    tat = now
+end
+local new_tat = tat + increment
+if new_tat - now > period then
+    return {0, tostring(tat)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, tostring(new_tat)}
+"""
+
+
+class RedisGCRAStore:
+    """GCRA state shared by all workers in Redis (or any Redis-compatible server).
+
+    The check-and-update runs as a Lua script so it is atomic, and keys expire
+    on their own once their TAT passes, so no sweeping is needed.
+    """
+
+    def __init__(self, client, prefix: str = "finpulse:rl:"):
+        self._client = client
+        self._prefix = prefix
+        self._script = client.register_script(_REDIS_GCRA_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisGCRAStore":
+        try:
+            import redis
+        except ImportError as exc:  # pragma: no cover - depends on deployment extras
+            raise RuntimeError("RATE_LIMIT_STORAGE_URL requires the 'redis' package") from exc
+        return cls(redis.Redis.from_url(url))
+
+    def now(self) -> float:
+        return time.time()
+
+    def update(self, key: str, increment: float, period: float, now: float) -> tuple[bool, float]:
+        allowed, tat = self._script(
+            keys=[self._prefix + key],
+            args=[repr(now), repr(increment), repr(period), repr(_TAT_TOLERANCE_SECONDS)],
+        )
+        return bool(int(allowed)), float(tat)
+
+    def get(self, key: str) -> float | None:
+        value = self._client.get(self._prefix + key)
+        return float(value) if value is not None else None
+
+    def clear(self, key: str) -> None:
+        self._client.delete(self._prefix + key)
+
+    def reset(self) -> None:
+        for key in self._client.scan_iter(match=self._prefix + "*"):
+            self._client.delete(key)
+
+
+class GCRARateLimiter(RateLimiter):
+    """`limits` strategy backed by a GCRA store, so slowapi decorators keep working."""
+
+    def __init__(self, store):
+        # The base class insists on a `limits` storage; GCRA brings its own.
+        self.storage = store
+
+    @staticmethod
+    def _params(item: RateLimitItem) -> tuple[float, float]:
+        period = float(item.get_expiry())
+        return period / item.amount, period
+
+    def hit(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        emission_interval, period = self._params(item)
+        allowed, _ = self.storage.update(
+            item.key_for(*identifiers), emission_interval * cost, period, self.storage.now()
+        )
+        return allowed
+
+    def test(self, item: RateLimitItem, *identifiers: str, cost: int = 1) -> bool:
+        emission_interval, period = self._params(item)
+        now = self.storage.now()
+        tat = max(self.storage.get(item.key_for(*identifiers)) or now, now)
+        return tat + emission_interval * cost - now <= period + _TAT_TOLERANCE_SECONDS
+
+    def get_window_stats(self, item: RateLimitItem, *identifiers: str) -> WindowStats:
+        emission_interval, period = self._params(item)
+        now = self.storage.now()
+        tat = max(self.storage.get(item.key_for(*identifiers)) or now, now)
+        remaining = max(math.floor((period - (tat - now)) / emission_interval), 0)
+        return WindowStats(int(tat), remaining)
+
+
+class GCRALimiter(Limiter):
+    """slowapi Limiter whose counting is done by GCRA instead of fixed windows."""
+
+    def __init__(self, *args, gcra_store, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gcra_store = gcra_store
+        self._limiter = GCRARateLimiter(gcra_store)
+
+    def reset(self) -> None:
+        self.gcra_store.reset()
+
+
+def build_gcra_store():
+    if settings.rate_limit_storage_url:
+        logger.info("Using shared rate-limit storage")
+        return RedisGCRAStore.from_url(settings.rate_limit_storage_url)
+    return InMemoryGCRAStore(sweep_seconds=settings.rate_limit_sweep_seconds)
+
+
+limiter = GCRALimiter(
+    key_func=_client_ip,
+    default_limits=[settings.rate_limit_default],
+    gcra_store=build_gcra_store(),
+)
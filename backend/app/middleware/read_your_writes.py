@@ -0,0 +1,56 @@
+import math
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import READ_YOUR_WRITES_COOKIE, WriteMarker, current_write_marker
+
+
+def _cookie_written_at(scope: Scope) -> float | None:
+    for name, value in scope.get("headers", ()):
+        if name == b"cookie":
+            raw = cookie_parser(value.decode("latin-1")).get(READ_YOUR_WRITES_COOKIE)
+            try:
+                return float(raw) if raw else None
+            except ValueError:
+                return None
+    return None
+
+
+class ReadYourWritesMiddleware:
+    """Carries a client's last write time between workers in a cookie.
+
+    ``RecentWriters`` only knows the writes its own process served. A request
+    that writes gets ``READ_YOUR_WRITES_COOKIE`` set to the write time, and a
+    later request bearing a recent one reads from the primary whichever worker
+    serves it. The cookie only steers reads; a forged one just costs its sender
+    replica reads.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.max_age = math.ceil(settings.read_your_writes_seconds)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        marker = WriteMarker(_cookie_written_at(scope))
+        token = current_write_marker.set(marker)
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and marker.written_at is not None:
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{READ_YOUR_WRITES_COOKIE}={marker.written_at:.3f}; Max-Age={self.max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            current_write_marker.reset(token)
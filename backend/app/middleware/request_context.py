@@ -0,0 +1,48 @@
+import re
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.logging_config import RequestLogContext, request_log_context
+
+REQUEST_ID_HEADER = "x-request-id"
+# Accept a caller's id (e.g. from the load balancer) only if it looks sane.
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+def _incoming_request_id(scope: Scope) -> str | None:
+    for name, value in scope.get("headers", ()):
+        if name == REQUEST_ID_HEADER.encode():
+            request_id = value.decode("latin-1")
+            return request_id if _VALID_REQUEST_ID.match(request_id) else None
+    return None
+
+
+class RequestContextMiddleware:
+    """Gives each request an id and exposes it, the route and the user to log records.
+
+    The id is taken from an incoming ``X-Request-ID`` header when present and
+    echoed back on the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+        token = request_log_context.set(RequestLogContext(request_id, scope))
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_log_context.reset(token)
@@ -0,0 +1,102 @@
+import logging
+import re
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database import QueryStats, current_query_stats
+
+logger = logging.getLogger("finpulse.request_timing")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template (``/api/v1/goals/{goal_id}``), else the raw path."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope.get("path", "")
+
+
+def server_timing(total_seconds: float, stats: QueryStats) -> str:
+    return (
+        f"app;dur={total_seconds * 1000:.1f}, "
+        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+    )
+
+
+def _compact(statement: str, limit: int = 300) -> str:
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    return statement if len(statement) <= limit else statement[:limit] + "..."
+
+
+class RequestTimingMiddleware:
+    """Times each request and counts the SQL it issues.
+
+    Adds a ``Server-Timing`` header (wall time, DB time, statement count),
+    logs requests slower than ``slow_request_ms`` with their slowest
+    statements, and flags requests issuing more than
+    ``request_statement_warn_threshold`` statements, which usually means a
+    query in a loop.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_ms: float | None = None,
+        statement_warn_threshold: int | None = None,
+        top_statements: int | None = None,
+    ):
+        self.app = app
+        self.slow_request_ms = settings.slow_request_ms if slow_request_ms is None else slow_request_ms
+        self.statement_warn_threshold = (
+            settings.request_statement_warn_threshold if statement_warn_threshold is None else statement_warn_threshold
+        )
+        self.top_statements = settings.slow_request_top_statements if top_statements is None else top_statements
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(self.top_statements)
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(time.perf_counter() - started, stats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._report(scope, status_code, time.perf_counter() - started, stats)
+
+    def _report(self, scope: Scope, status_code: int, seconds: float, stats: QueryStats) -> None:
+        elapsed_ms = seconds * 1000
+        route = f"{scope['method']} {route_template(scope)}"
+        if elapsed_ms >= self.slow_request_ms:
+            slowest = "; ".join(f"[{s * 1000:.1f} ms] {_compact(sql)}" for s, sql in stats.slowest())
+            logger.warning(
+                "Slow request %s -> %d: %.1f ms (db %.1f ms, %d statements). Slowest: %s",
+                route,
+                status_code,
+                elapsed_ms,
+                stats.seconds * 1000,
+                stats.count,
+                slowest or "none",
+            )
+        if stats.count > self.statement_warn_threshold:
+            logger.warning(
+                "%s issued %d SQL statements (threshold %d); check for queries in a loop",
+                route,
+                stats.count,
+                self.statement_warn_threshold,
+            )
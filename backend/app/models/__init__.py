@@ -1,10 +1,13 @@
 from app.models.account import Account
 from app.models.analysis_result import AnalysisResult
 from app.models.credit_card import CreditCard
+from app.models.email_outbox import EmailOutbox
 from app.models.expense import Expense
 from app.models.goal import Goal
+from app.models.goal_contribution import GoalContribution
 from app.models.installment_plan import InstallmentPlan
 from app.models.investment import Investment
+from app.models.login_failure import LoginFailure
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.models.weekly_review import WeeklyReview
@@ -18,6 +21,9 @@ __all__ = [
     "InstallmentPlan",
     "Investment",
     "Goal",
+    "GoalContribution",
     "AnalysisResult",
     "WeeklyReview",
+    "LoginFailure",
+    "EmailOutbox",
 ]
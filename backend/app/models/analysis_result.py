@@ -1,11 +1,12 @@
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import Date, DateTime, ForeignKey
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy import Date, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
+from app.models.types import JSONDocument
 
 
 def _utcnow() -> datetime:
@@ -14,12 +15,15 @@ def _utcnow() -> datetime:
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        Index("ix_analysis_results_user_snapshot_date", "user_id", "snapshot_date"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
     snapshot_date: Mapped[date] = mapped_column(Date, nullable=False)
-    insights: Mapped[dict] = mapped_column(JSON, nullable=False)
-    warnings: Mapped[dict] = mapped_column(JSON, nullable=False)
-    recommendations: Mapped[dict] = mapped_column(JSON, nullable=False)
-    raw_data: Mapped[dict] = mapped_column(JSON, nullable=True)
+    insights: Mapped[dict] = mapped_column(JSONDocument, nullable=False)
+    warnings: Mapped[dict] = mapped_column(JSONDocument, nullable=False)
+    recommendations: Mapped[dict] = mapped_column(JSONDocument, nullable=False)
+    raw_data: Mapped[dict] = mapped_column(JSONDocument, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
@@ -38,3 +38,6 @@ class Goal(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
 
     user = relationship("User", back_populates="goals")
+    contributions = relationship(
+        "GoalContribution", back_populates="goal", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class LoginFailure(Base):
+    """Sliding-window failed-login counter shared by all API workers."""
+
+    __tablename__ = "login_failures"
+
+    key_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    window_index: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    prev_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    curr_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, index=True)
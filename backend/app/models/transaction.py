@@ -2,7 +2,7 @@ import uuid
 from datetime import date, datetime, timezone
 from enum import Enum as PyEnum
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Numeric, String
+from sqlalchemy import DDL, Date, DateTime, Enum, ForeignKey, Index, Numeric, String, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -20,10 +20,17 @@ class TransactionType(str, PyEnum):
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    # Range-partitioned by month on Postgres (see app.services.partitions).
+    # The primary key carries both partition keys, date and the optional
+    # user_id hash, as Postgres requires for unique constraints.
+    __table_args__ = (
+        Index("ix_transactions_user_date", "user_id", "date"),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     account_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("accounts.id"), index=True, nullable=False)
-    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
     amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
     transaction_type: Mapped[str] = mapped_column(
         Enum(TransactionType, values_callable=lambda e: [x.value for x in e]),
@@ -31,8 +38,18 @@ class Transaction(Base):
     )
     category: Mapped[str] = mapped_column(String(100), nullable=True)
     description: Mapped[str] = mapped_column(String(500), nullable=True)
-    date: Mapped[date] = mapped_column(Date, nullable=False)
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
 
     account = relationship("Account", back_populates="transactions")
     user = relationship("User", back_populates="transactions")
+
+
+# A partitioned table without partitions rejects every insert; metadata-created
+# schemas get the catch-all default, and monthly partitions come from
+# ensure_transaction_partitions.
+event.listen(
+    Transaction.__table__,
+    "after_create",
+    DDL("CREATE TABLE transactions_default PARTITION OF transactions DEFAULT").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,5 @@
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+
+# JSONB on Postgres; plain JSON elsewhere (the SQLite test schema).
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, DateTime, SmallInteger, String
+from sqlalchemy import Boolean, DateTime, Index, SmallInteger, String, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,16 +14,27 @@ def _utcnow() -> datetime:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index(
+            "ix_users_weekly_summary_schedule",
+            "notification_timezone",
+            "weekly_summary_day",
+            "weekly_summary_hour",
+            postgresql_where=text("weekly_summary_enabled AND email_notifications_enabled"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
+    password_sync_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True)
     full_name: Mapped[str] = mapped_column(String(255), nullable=False)
     email_notifications_enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     weekly_summary_enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     weekly_summary_day: Mapped[int] = mapped_column(SmallInteger, default=0, nullable=False)
     weekly_summary_hour: Mapped[int] = mapped_column(SmallInteger, default=9, nullable=False)
     notification_timezone: Mapped[str] = mapped_column(String(64), default="America/Toronto", nullable=False)
+    weekly_summary_last_sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=_utcnow, onupdate=_utcnow)
 
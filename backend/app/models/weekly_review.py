@@ -3,10 +3,11 @@ from datetime import date, datetime, timezone
 from enum import Enum as PyEnum
 
 from sqlalchemy import Date, DateTime, Enum, ForeignKey, Numeric, String, UniqueConstraint
-from sqlalchemy.dialects.postgresql import JSON, UUID
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
+from app.models.types import JSONDocument
 
 
 def _utcnow() -> datetime:
@@ -29,9 +30,10 @@ class WeeklyReview(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), ForeignKey("users.id"), index=True, nullable=False)
     week_start: Mapped[date] = mapped_column(Date, nullable=False)
     week_end: Mapped[date] = mapped_column(Date, nullable=False)
-    snapshot: Mapped[dict] = mapped_column(JSON, nullable=False)
-    prev_snapshot: Mapped[dict | None] = mapped_column(JSON, nullable=True)
-    changes: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    snapshot: Mapped[dict] = mapped_column(JSONDocument, nullable=False)
+    # Only read when a new review is computed; not part of any response.
+    prev_snapshot: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True, deferred=True)
+    changes: Mapped[dict | None] = mapped_column(JSONDocument, nullable=True)
     action_type: Mapped[str] = mapped_column(String(50), nullable=False)
     action_title: Mapped[str] = mapped_column(String(500), nullable=False)
     action_detail: Mapped[str | None] = mapped_column(String(1000), nullable=True)
@@ -0,0 +1,210 @@
+"""Sampling profiler for individual requests.
+
+A ``Profile`` runs a background thread that snapshots the Python stacks of
+the threads attached to it every ``interval_seconds`` (``sys._current_frames``),
+so the profiled code itself runs untouched. ``ProfilingMiddleware`` attaches
+the event-loop thread for the whole request; code decorated with
+``@profiled(section)`` attaches whichever thread it runs on (a threadpool
+worker for sync routes) while it runs. Sections also feed the
+``finpulse_section_duration_seconds`` histogram, profiled or not.
+
+Profiles export to the speedscope format (https://www.speedscope.app) and to
+collapsed stacks (``frame;frame;frame count``), which speedscope and
+``flamegraph.pl`` both read. ``hot_stacks`` aggregates the collapsed stacks of
+randomly sampled requests per route, per worker process.
+"""
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from app.config import settings
+from app.metrics import observe_section
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+MAX_STACK_DEPTH = 128
+
+# (qualified name, file, first line) of a function; one speedscope frame.
+Frame = tuple[str, str, int]
+
+
+def _short_path(filename: str) -> str:
+    parts = filename.replace(os.sep, "/").rsplit("/", 3)
+    return "/".join(parts[-3:])
+
+
+def _stack(frame) -> tuple[Frame, ...]:
+    """Root-first stack of ``frame``."""
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+def frame_label(frame: Frame) -> str:
+    name, filename, line = frame
+    return f"{name} ({_short_path(filename)}:{line})".replace(";", ",")
+
+
+class Profile:
+    def __init__(self, name: str, interval_seconds: float = 0.005):
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.samples: dict[int, list[tuple[tuple[Frame, ...], float]]] = {}
+        self._attached: dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def attach(self) -> int:
+        ident = threading.get_ident()
+        with self._lock:
+            self._attached[ident] = self._attached.get(ident, 0) + 1
+        return ident
+
+    def detach(self, ident: int) -> None:
+        with self._lock:
+            remaining = self._attached.get(ident, 0) - 1
+            if remaining > 0:
+                self._attached[ident] = remaining
+            else:
+                self._attached.pop(ident, None)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="finpulse-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval_seconds):
+            now = time.perf_counter()
+            weight_ms, last = (now - last) * 1000, now
+            frames = sys._current_frames()
+            with self._lock:
+                attached = list(self._attached)
+            for ident in attached:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples.setdefault(ident, []).append((_stack(frame), weight_ms))
+            del frames
+
+    @property
+    def sample_count(self) -> int:
+        return sum(len(samples) for samples in self.samples.values())
+
+    def collapsed(self) -> Counter:
+        """Sample count per root-first ``;``-joined stack, across threads."""
+        counts: Counter = Counter()
+        for samples in self.samples.values():
+            for stack, _ in samples:
+                counts[";".join(frame_label(frame) for frame in stack)] += 1
+        return counts
+
+    def speedscope(self) -> dict:
+        """The profile as a speedscope document, one sampled profile per thread."""
+        frames: list[dict] = []
+        index: dict[Frame, int] = {}
+
+        def frame_index(frame: Frame) -> int:
+            position = index.get(frame)
+            if position is None:
+                position = index[frame] = len(frames)
+                name, filename, line = frame
+                frames.append({"name": name, "file": filename, "line": line})
+            return position
+
+        profiles = []
+        for ident, samples in self.samples.items():
+            weights = [round(weight, 3) for _, weight in samples]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": f"{self.name} (thread {ident})",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": round(sum(weights), 3),
+                    "samples": [[frame_index(frame) for frame in stack] for stack, _ in samples],
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "finpulse",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+
+current_profile: ContextVar[Profile | None] = ContextVar("current_profile", default=None)
+
+
+def profiled(section: str):
+    """Time a function as ``section`` and include its thread in the active profile."""
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            ident = profile.attach() if profile is not None else None
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe_section(section, time.perf_counter() - started)
+                if profile is not None:
+                    profile.detach(ident)
+
+        return wrapper
+
+    return decorate
+
+
+class HotStacks:
+    """Collapsed stacks of sampled requests, summed per route.
+
+    Each route keeps at most ``max_stacks_per_route`` distinct stacks; when
+    it overflows, the least frequent half is discarded.
+    """
+
+    def __init__(self, max_stacks_per_route: int = 500):
+        self.max_stacks_per_route = max_stacks_per_route
+        self._routes: dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def add(self, route: str, stacks: Counter) -> None:
+        with self._lock:
+            counts = self._routes.setdefault(route, Counter())
+            counts.update(stacks)
+            if len(counts) > self.max_stacks_per_route:
+                self._routes[route] = Counter(dict(counts.most_common(self.max_stacks_per_route // 2)))
+
+    def collapsed(self, route: str | None = None) -> str:
+        """Collapsed-stack text with the route as the root frame."""
+        with self._lock:
+            routes = {r: Counter(c) for r, c in self._routes.items() if route is None or r == route}
+        lines = []
+        for name, counts in sorted(routes.items()):
+            for stack, count in counts.most_common():
+                lines.append(f"{name.replace(';', ',')};{stack} {count}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+hot_stacks = HotStacks(settings.profiling_hot_stacks_per_route)
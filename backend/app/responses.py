@@ -0,0 +1,44 @@
+"""JSON responses encoded with orjson.
+
+``ORJSONResponse`` is the app's default response class, so every route that
+returns a model or a dict is encoded by orjson instead of ``json.dumps``.
+FastAPI still validates and converts such return values through the route's
+``response_model`` first.
+
+Routes whose payload is built entirely by our own code (column values
+straight from the database, or the dicts of the financial engines) can skip
+that second pass by returning an ``ORJSONResponse`` themselves; the
+``response_model`` then only documents the shape. ``rows_response`` goes
+from ``Row`` tuples to the bytes the Pydantic model would have produced.
+"""
+
+from collections.abc import Iterable, Sequence
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+
+# OPT_UTC_Z writes UTC datetimes as "...Z", as Pydantic does.
+_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # Money columns are Numeric; the response schemas expose them as floats.
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+def rows_response(keys: Sequence[str], rows: Iterable[Sequence[Any]]) -> Response:
+    """A JSON array of objects keyed by ``keys``, one per row."""
+    return Response(dumps([dict(zip(keys, row)) for row in rows]), media_type="application/json")
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
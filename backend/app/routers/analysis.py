@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user
+from app.middleware.rate_limit import limiter, user_rate_limit_key
 from app.models.user import User
 from app.schemas.analysis import AnalysisResponse
 from app.services.analysis import generate_analysis
@@ -11,7 +13,9 @@ router = APIRouter(prefix="/analysis", tags=["analysis"])
 
 
 @router.get("/insights", response_model=AnalysisResponse)
+@limiter.limit(settings.rate_limit_expensive, key_func=user_rate_limit_key)
 def get_insights(
+    request: Request,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
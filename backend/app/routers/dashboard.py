@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.models.user import User
+from app.responses import ORJSONResponse
 from app.schemas.dashboard import DashboardSummary
 from app.services.financial import build_dashboard_summary
 
@@ -15,4 +16,5 @@ def get_dashboard_summary(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return build_dashboard_summary(db, current_user)
+    # The summary is built from plain floats, strings and lists; skip re-validation.
+    return ORJSONResponse(build_dashboard_summary(db, current_user))
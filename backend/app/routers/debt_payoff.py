@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.middleware.rate_limit import limiter, user_rate_limit_key
+from app.models.user import User
+from app.responses import ORJSONResponse
+from app.schemas.debt_payoff import PayoffPlan
+from app.services.debt_payoff import build_payoff_plan
+
+router = APIRouter(prefix="/debt-payoff", tags=["debt_payoff"])
+
+
+@router.get("/plan", response_model=PayoffPlan)
+@limiter.limit(settings.rate_limit_expensive, key_func=user_rate_limit_key)
+def get_payoff_plan(
+    request: Request,
+    monthly_budget: float = Query(..., gt=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Schedules run to thousands of plain floats; skip re-validating them.
+    return ORJSONResponse(build_payoff_plan(db, current_user, monthly_budget))
@@ -8,10 +8,32 @@ from app.dependencies import get_current_user
 from app.models.goal import Goal
 from app.models.user import User
 from app.schemas.goal import GoalCreate, GoalResponse, GoalUpdate
-from app.services.goals import calculate_goal_forecast
+from app.services.goals import (
+    calculate_goal_forecast,
+    list_goals_with_forecasts,
+    record_contribution,
+    record_opening_balance,
+)
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
+_FORECAST_FIELDS = (
+    "on_track",
+    "monthly_needed",
+    "days_remaining",
+    "monthly_rate",
+    "projected_completion",
+    "completion_earliest",
+    "completion_latest",
+)
+
+
+def _goal_response(goal: Goal, forecast: dict) -> GoalResponse:
+    resp = GoalResponse.model_validate(goal)
+    for field in _FORECAST_FIELDS:
+        setattr(resp, field, forecast.get(field))
+    return resp
+
 
 @router.post("/", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
 def create_goal(
@@ -28,14 +50,10 @@ def create_goal(
         target_date=payload.target_date,
     )
     db.add(goal)
+    record_opening_balance(db, goal)
     db.commit()
     db.refresh(goal)
-    forecast = calculate_goal_forecast(goal)
-    resp = GoalResponse.model_validate(goal)
-    resp.on_track = forecast.get("on_track")
-    resp.monthly_needed = forecast.get("monthly_needed")
-    resp.days_remaining = forecast.get("days_remaining")
-    return resp
+    return _goal_response(goal, calculate_goal_forecast(db, goal))
 
 
 @router.get("/", response_model=list[GoalResponse])
@@ -45,23 +63,10 @@ def list_goals(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    goals = (
-        db.query(Goal)
-        .filter(Goal.user_id == current_user.id)
-        .order_by(Goal.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
-    )
-    results = []
-    for g in goals:
-        forecast = calculate_goal_forecast(g)
-        resp = GoalResponse.model_validate(g)
-        resp.on_track = forecast.get("on_track")
-        resp.monthly_needed = forecast.get("monthly_needed")
-        resp.days_remaining = forecast.get("days_remaining")
-        results.append(resp)
-    return results
+    return [
+        _goal_response(goal, forecast)
+        for goal, forecast in list_goals_with_forecasts(db, current_user.id, limit, offset)
+    ]
 
 
 @router.patch("/{goal_id}", response_model=GoalResponse)
@@ -79,18 +84,15 @@ def update_goal(
     if not goal:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Goal not found")
 
+    previous_amount = goal.current_amount
     update_data = payload.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(goal, field, value)
+    record_contribution(db, goal, previous_amount)
 
     db.commit()
     db.refresh(goal)
-    forecast = calculate_goal_forecast(goal)
-    resp = GoalResponse.model_validate(goal)
-    resp.on_track = forecast.get("on_track")
-    resp.monthly_needed = forecast.get("monthly_needed")
-    resp.days_remaining = forecast.get("days_remaining")
-    return resp
+    return _goal_response(goal, calculate_goal_forecast(db, goal))
 
 
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -9,10 +9,10 @@ from app.schemas.notification import (
     NotificationPreferencesUpdate,
     NotificationTestResponse,
 )
+from app.services.email_outbox import queue_notification_email
 from app.services.notifications import (
-    WEEKDAY_LABELS,
+    build_weekly_summary_subject,
     build_weekly_summary_text,
-    send_notification_email,
     serialize_notification_preferences,
 )
 
@@ -59,15 +59,11 @@ def send_test_notification(
         )
 
     body = build_weekly_summary_text(db, current_user)
-    weekday = WEEKDAY_LABELS[int(current_user.weekly_summary_day) % 7]
-    subject = (
-        f"FinPulse Weekly Snapshot - {weekday} "
-        f"{int(current_user.weekly_summary_hour):02d}:00 {current_user.notification_timezone}"
-    )
-    delivered = send_notification_email(current_user.email, subject, body)
+    subject = build_weekly_summary_subject(current_user)
+    queued = queue_notification_email(db, current_user.email, subject, body)
 
-    if delivered:
-        return {"status": "sent", "detail": "Test email sent"}
+    if queued:
+        return {"status": "queued", "detail": "Test email queued for delivery"}
 
     return {
         "status": "logged_only",
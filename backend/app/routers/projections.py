@@ -0,0 +1,35 @@
+import anyio.to_thread
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.middleware.rate_limit import limiter, user_rate_limit_key
+from app.models.user import User
+from app.schemas.projection import ProjectionResponse
+from app.services.projections import MAX_YEARS, load_projection_inputs, project
+
+router = APIRouter(prefix="/projections", tags=["projections"])
+
+
+def _load_and_release(db: Session, user: User):
+    """Load the inputs and return the connection to the pool before the simulation starts."""
+    try:
+        return load_projection_inputs(db, user)
+    finally:
+        db.close()
+
+
+@router.get("/net-worth", response_model=ProjectionResponse)
+@limiter.limit(settings.rate_limit_expensive, key_func=user_rate_limit_key)
+async def get_net_worth_projection(
+    request: Request,
+    years: int = Query(10, ge=1, le=MAX_YEARS),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    # Loading is blocking ORM work, so it runs on the threadpool; the loop only
+    # awaits the simulation on the process pool.
+    inputs = await anyio.to_thread.run_sync(_load_and_release, db, current_user)
+    return await project(current_user.id, inputs, years)
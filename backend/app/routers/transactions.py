@@ -1,43 +1,65 @@
 import csv
 import io
+import time
 from datetime import date
 from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, UploadFile, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.dependencies import get_current_user
+from app.config import settings
+from app.database import get_async_db, get_db
+from app.dependencies import get_current_user, get_current_user_async
+from app.metrics import record_csv_import
+from app.middleware.rate_limit import limiter, user_rate_limit_key
 from app.models.account import Account
 from app.models.transaction import Transaction
 from app.models.user import User
+from app.responses import rows_response
 from app.schemas.transaction import TransactionCreate, TransactionResponse, TransactionUpdate
 from app.services.ingestion import bulk_insert_transactions, parse_csv_transactions
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
+# Column per TransactionResponse field, for listing without loading ORM objects.
+_RESPONSE_COLUMNS = tuple(getattr(Transaction, field) for field in TransactionResponse.model_fields)
 
-def _base_transactions_query(
-    db: Session,
+
+def _transaction_filters(
     current_user: User,
     account_id: UUID | None,
     category: str | None,
     date_from: date | None,
     date_to: date | None,
-):
-    query = db.query(Transaction).filter(Transaction.user_id == current_user.id)
+) -> list:
+    filters = [Transaction.user_id == current_user.id]
 
     if account_id:
-        query = query.filter(Transaction.account_id == account_id)
+        filters.append(Transaction.account_id == account_id)
     if category:
-        query = query.filter(Transaction.category == category)
+        filters.append(Transaction.category == category)
     if date_from:
-        query = query.filter(Transaction.date >= date_from)
+        filters.append(Transaction.date >= date_from)
     if date_to:
-        query = query.filter(Transaction.date <= date_to)
+        filters.append(Transaction.date <= date_to)
 
-    return query
+    return filters
+
+
+def _base_transactions_query(
+    db: Session,
+    current_user: User,
+    account_id: UUID | None,
+    category: str | None,
+    date_from: date | None,
+    date_to: date | None,
+):
+    return db.query(Transaction).filter(
+        *_transaction_filters(current_user, account_id, category, date_from, date_to)
+    )
 
 
 def _apply_transaction_sort(
@@ -93,7 +115,7 @@ def create_transaction(
 
 
 @router.get("/", response_model=list[TransactionResponse])
-def list_transactions(
+async def list_transactions(
     account_id: UUID | None = Query(None, description="Filter by account"),
     category: str | None = Query(None, description="Filter by category"),
     date_from: date | None = Query(None, description="Start date (inclusive)"),
@@ -105,20 +127,18 @@ def list_transactions(
     sort_order: Literal["asc", "desc"] = Query("desc", description="Sort direction"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
-    query = _base_transactions_query(
-        db=db,
-        current_user=current_user,
-        account_id=account_id,
-        category=category,
-        date_from=date_from,
-        date_to=date_to,
+    stmt = select(*_RESPONSE_COLUMNS).where(
+        *_transaction_filters(current_user, account_id, category, date_from, date_to)
     )
-    query = _apply_transaction_sort(query, sort_by, sort_order)
+    stmt = _apply_transaction_sort(stmt, sort_by, sort_order)
 
-    return query.offset(offset).limit(limit).all()
+    # Plain column values from our own table: encode them directly instead of
+    # building ORM objects and re-validating them through TransactionResponse.
+    result = await db.execute(stmt.offset(offset).limit(limit))
+    return rows_response(tuple(result.keys()), result)
 
 
 @router.get("/count")
@@ -268,7 +288,9 @@ def delete_transaction(
 
 
 @router.post("/upload-csv", status_code=status.HTTP_201_CREATED)
+@limiter.limit(settings.rate_limit_expensive, key_func=user_rate_limit_key)
 async def upload_csv_transactions(
+    request: Request,
     file: UploadFile,
     account_id: UUID = Query(..., description="Target account for imported transactions"),
     db: Session = Depends(get_db),
@@ -299,6 +321,7 @@ async def upload_csv_transactions(
             detail="File size exceeds 5 MB limit",
         )
 
+    started = time.perf_counter()
     transactions = parse_csv_transactions(content, account_id, current_user.id)
     if not transactions:
         raise HTTPException(
@@ -307,4 +330,5 @@ async def upload_csv_transactions(
         )
 
     count = bulk_insert_transactions(db, transactions)
+    record_csv_import(count, len(transactions) - count, time.perf_counter() - started)
     return {"imported": count, "account_id": str(account_id)}
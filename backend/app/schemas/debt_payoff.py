@@ -0,0 +1,37 @@
+from datetime import date
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class PayoffDebt(BaseModel):
+    name: str
+    kind: Literal["credit_card", "installment"]
+    balance: float
+    apr: float
+    minimum_payment: float
+
+
+class PayoffMonth(BaseModel):
+    date: date
+    payments: list[float]  # per debt, in the order of PayoffPlan.debts
+    interest: float
+    balance: float
+
+
+class PayoffStrategy(BaseModel):
+    strategy: Literal["avalanche", "snowball", "utilization"]
+    months_to_payoff: int | None = None
+    payoff_date: date | None = None
+    total_interest: float
+    total_paid: float
+    payoff_dates: list[date | None]
+    schedule: list[PayoffMonth]
+
+
+class PayoffPlan(BaseModel):
+    monthly_budget: float
+    minimum_payment: float
+    debts: list[PayoffDebt]
+    strategies: list[PayoffStrategy]
+    recommended: str | None = None
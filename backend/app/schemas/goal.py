@@ -30,6 +30,10 @@ class GoalResponse(BaseModel):
     on_track: bool | None = None
     monthly_needed: float | None = None
     days_remaining: int | None = None
+    monthly_rate: float | None = None
+    projected_completion: date | None = None
+    completion_earliest: date | None = None
+    completion_latest: date | None = None
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,28 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class NetWorthBand(BaseModel):
+    year: int
+    date: date
+    p10: float
+    p25: float
+    p50: float
+    p75: float
+    p90: float
+
+
+class GoalAttainment(BaseModel):
+    goal_id: str
+    title: str
+    evaluated_on: date
+    probability: float
+
+
+class ProjectionResponse(BaseModel):
+    start: date
+    years: int
+    paths: int
+    net_worth: list[NetWorthBand]
+    goals: list[GoalAttainment]
@@ -9,9 +9,13 @@ from app.models.credit_card import CreditCard
 from app.models.expense import Expense
 from app.models.goal import Goal
 from app.models.investment import Investment
-from app.models.transaction import Transaction, TransactionType
+from app.models.transaction import TransactionType
 from app.models.user import User
-from app.services.financial import _normalize_to_monthly
+from app.profiling import profiled
+from app.services.columnar import load_transactions
+from app.services.financial import _category_label, _normalize_to_monthly
+from app.services.money import from_cents, to_cents
+from app.services.queries import net_worth_before, rows_for_user
 
 logger = logging.getLogger("finpulse.analysis")
 
@@ -22,6 +26,7 @@ def _pct_change(current: float, previous: float) -> float | None:
     return round((current - previous) / abs(previous) * 100, 1)
 
 
+@profiled("generate_analysis")
 def generate_analysis(db: Session, user: User) -> dict:
     """
     Analyze user's financial snapshot and generate:
@@ -31,92 +36,58 @@ def generate_analysis(db: Session, user: User) -> dict:
     All rule-based, deterministic, explainable.
     """
     # Gather data
-    accounts = db.query(Account).filter(Account.user_id == user.id).all()
-    cards = db.query(CreditCard).filter(CreditCard.user_id == user.id).all()
-    expenses = db.query(Expense).filter(Expense.user_id == user.id).all()
-    investments = db.query(Investment).filter(Investment.user_id == user.id).all()
-    goals = db.query(Goal).filter(Goal.user_id == user.id).all()
+    accounts = rows_for_user(db, Account, user.id)
+    cards = rows_for_user(db, CreditCard, user.id)
+    expenses = rows_for_user(db, Expense, user.id)
+    investments = rows_for_user(db, Investment, user.id)
+    goals = rows_for_user(db, Goal, user.id)
     today = date.today()
     week_start = today - timedelta(days=today.weekday())
     prev_week_start = week_start - timedelta(days=7)
 
-    total_balance = sum(float(a.balance) for a in accounts)
-    total_cc_balance = sum(float(c.current_balance) for c in cards)
-    total_cc_limit = sum(float(c.credit_limit) for c in cards)
-    utilization = (total_cc_balance / total_cc_limit * 100) if total_cc_limit > 0 else 0
-    total_investments = sum(float(i.current_value) for i in investments)
-    total_monthly_expenses = sum(
-        _normalize_to_monthly(float(e.amount), e.frequency)
-        for e in expenses
-        if e.is_recurring
-    )
-    transactions = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= prev_week_start,
-            Transaction.date <= today,
+    # Sums are taken in integer cents; the dollar figures below are for the
+    # messages and the stored snapshot.
+    balance_cents = sum(to_cents(a.balance) for a in accounts)
+    cc_balance_cents = sum(to_cents(c.current_balance) for c in cards)
+    cc_limit_cents = sum(to_cents(c.credit_limit) for c in cards)
+    investments_cents = sum(to_cents(i.current_value) for i in investments)
+    utilization = (cc_balance_cents / cc_limit_cents * 100) if cc_limit_cents > 0 else 0
+    total_balance = from_cents(balance_cents)
+    total_cc_balance = from_cents(cc_balance_cents)
+    total_investments = from_cents(investments_cents)
+    total_monthly_expenses = from_cents(
+        sum(
+            _normalize_to_monthly(to_cents(e.amount), e.frequency)
+            for e in expenses
+            if e.is_recurring
         )
-        .all()
     )
+    transactions = load_transactions(db, user.id, prev_week_start, today)
 
     insights = []
     warnings = []
     recommendations = []
 
-    current_week_debits = [
-        t
-        for t in transactions
-        if t.transaction_type == TransactionType.DEBIT and t.date >= week_start
-    ]
-    previous_week_debits = [
-        t
-        for t in transactions
-        if t.transaction_type == TransactionType.DEBIT and prev_week_start <= t.date < week_start
-    ]
-    current_week_credits = [
-        t
-        for t in transactions
-        if t.transaction_type == TransactionType.CREDIT and t.date >= week_start
-    ]
-    previous_week_credits = [
-        t
-        for t in transactions
-        if t.transaction_type == TransactionType.CREDIT and prev_week_start <= t.date < week_start
-    ]
-    current_week_spending = sum(float(t.amount) for t in current_week_debits)
-    previous_week_spending = sum(float(t.amount) for t in previous_week_debits)
-    current_week_income = sum(float(t.amount) for t in current_week_credits)
-    previous_week_income = sum(float(t.amount) for t in previous_week_credits)
+    this_week = transactions.between(week_start, today)
+    last_week = transactions.between(prev_week_start, week_start - timedelta(days=1))
+    current_week_spending = from_cents(this_week.total(TransactionType.DEBIT))
+    previous_week_spending = from_cents(last_week.total(TransactionType.DEBIT))
+    current_week_income = from_cents(this_week.total(TransactionType.CREDIT))
+    previous_week_income = from_cents(last_week.total(TransactionType.CREDIT))
 
-    this_week_categories: dict[str, float] = {}
-    for txn in current_week_debits:
-        category = (txn.category or "Uncategorized").strip() or "Uncategorized"
-        this_week_categories[category] = this_week_categories.get(category, 0.0) + float(
-            txn.amount
-        )
+    this_week_categories = this_week.category_totals(TransactionType.DEBIT, _category_label)
     top_weekly_category = (
         max(this_week_categories, key=this_week_categories.get)
         if this_week_categories
         else "Spending"
     )
     top_weekly_category_amount = (
-        round(this_week_categories.get(top_weekly_category, 0.0), 2)
+        from_cents(this_week_categories.get(top_weekly_category, 0))
         if this_week_categories
         else 0.0
     )
 
-    previous_analysis = (
-        db.query(AnalysisResult)
-        .filter(AnalysisResult.user_id == user.id, AnalysisResult.snapshot_date < today)
-        .order_by(AnalysisResult.snapshot_date.desc())
-        .first()
-    )
-    previous_net_worth = None
-    if previous_analysis and previous_analysis.raw_data:
-        raw_prev_net_worth = previous_analysis.raw_data.get("net_worth")
-        if isinstance(raw_prev_net_worth, (int, float)):
-            previous_net_worth = float(raw_prev_net_worth)
+    previous_net_worth = net_worth_before(db, user.id, today)
 
     # INSIGHTS (generate top 3)
     # 1) Week-over-week spending insight
@@ -163,7 +134,7 @@ def generate_analysis(db: Session, user: User) -> dict:
         )
 
     # 2) Net worth insight
-    net_worth = total_balance + total_investments - total_cc_balance
+    net_worth = from_cents(balance_cents + investments_cents - cc_balance_cents)
     if previous_net_worth is not None:
         net_worth_delta = net_worth - previous_net_worth
         net_worth_delta_pct = _pct_change(net_worth, previous_net_worth)
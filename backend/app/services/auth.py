@@ -1,6 +1,5 @@
+import hmac
 import logging
-import time
-from collections import defaultdict
 from uuid import UUID
 
 from fastapi import HTTPException, status
@@ -10,7 +9,8 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.models.account import Account
 from app.models.user import User
-from app.services.notifications import send_notification_email
+from app.services.email_outbox import queue_notification_email
+from app.services.lockout import LockoutStore, get_lockout_store
 from app.services.supabase_auth import (
     SupabaseAuthError,
     send_recovery_email,
@@ -23,6 +23,7 @@ from app.utils.security import (
     decode_password_reset_token,
     fingerprint_password_hash,
     hash_password,
+    password_sync_fingerprint,
     verify_password,
 )
 
@@ -32,15 +33,9 @@ logger = logging.getLogger("finpulse.auth")
 MAX_FAILED_ATTEMPTS = 5
 LOCKOUT_SECONDS = 900  # 15 minutes
 
-# {email: [(timestamp, ...), ...]}
-_failed_attempts: dict[str, list[float]] = defaultdict(list)
 
-
-def _prune_old_attempts(email: str) -> list[float]:
-    cutoff = time.monotonic() - LOCKOUT_SECONDS
-    attempts = [t for t in _failed_attempts[email] if t > cutoff]
-    _failed_attempts[email] = attempts
-    return attempts
+def _lockout_store() -> LockoutStore:
+    return get_lockout_store(LOCKOUT_SECONDS)
 
 
 def _build_password_reset_redirect_url() -> str | None:
@@ -81,17 +76,40 @@ def _ensure_default_account(db: Session, user_id: UUID) -> None:
     db.add(default_account)
 
 
-def _sync_local_password_hash(db: Session, user: User, password: str) -> None:
+def _set_local_password_hash(user: User, password: str) -> None:
     user.hashed_password = hash_password(password)
+    # Only Supabase mode re-checks the local copy on login; local mode verifies with bcrypt anyway.
+    user.password_sync_fingerprint = (
+        password_sync_fingerprint(password, user.hashed_password) if settings.supabase_enabled else None
+    )
+
+
+def _sync_local_password_hash(db: Session, user: User, password: str) -> None:
+    _set_local_password_hash(user, password)
     db.add(user)
     db.commit()
+    db.refresh(user)
+
+
+def _refresh_local_password_hash(db: Session, user: User, password: str) -> None:
+    """Re-hash the local copy only when it is missing or no longer matches Supabase.
+
+    Supabase has already checked the password, so staleness is detected with
+    the stored HMAC fingerprint instead of a second bcrypt verify.
+    """
+    if user.hashed_password and user.password_sync_fingerprint and hmac.compare_digest(
+        user.password_sync_fingerprint, password_sync_fingerprint(password, user.hashed_password)
+    ):
+        return
+    _sync_local_password_hash(db, user, password)
 
 
 def authenticate_user(db: Session, email: str, password: str) -> User:
     """Validate credentials and return the user. Raises 401 on failure, 429 on lockout."""
-    recent = _prune_old_attempts(email)
-    if len(recent) >= MAX_FAILED_ATTEMPTS:
-        logger.warning("Account locked out: %s (%d failed attempts)", email, len(recent))
+    lockout = _lockout_store()
+    recent_failures = lockout.failure_count(email)
+    if recent_failures >= MAX_FAILED_ATTEMPTS:
+        logger.warning("Account locked out: %s (%.1f failed attempts)", email, recent_failures)
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Too many failed login attempts. Please try again in 15 minutes.",
@@ -109,12 +127,8 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
             user = db.query(User).filter(User.email == email).first()
             if not user:
                 full_name = (supabase_user.get("user_metadata") or {}).get("full_name") or email.split("@")[0]
-                user = User(
-                    id=supabase_uuid,
-                    email=email,
-                    hashed_password=hash_password(password),
-                    full_name=full_name,
-                )
+                user = User(id=supabase_uuid, email=email, full_name=full_name)
+                _set_local_password_hash(user, password)
                 db.add(user)
                 db.flush()
                 _ensure_default_account(db, user.id)
@@ -122,15 +136,14 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
                 db.refresh(user)
                 logger.info("Provisioned local user from Supabase auth: %s", user.id)
             else:
-                _sync_local_password_hash(db, user, password)
-                db.refresh(user)
+                _refresh_local_password_hash(db, user, password)
 
-            _failed_attempts.pop(email, None)
+            lockout.reset(email)
             return user
         except SupabaseAuthError as exc:
             detail_lower = exc.detail.lower()
             if exc.status_code in (400, 401):
-                _failed_attempts[email].append(time.monotonic())
+                lockout.record_failure(email)
                 logger.info("Failed Supabase login attempt for %s: %s", email, exc.detail)
                 if "confirm" in detail_lower or "not confirmed" in detail_lower:
                     raise HTTPException(
@@ -152,18 +165,16 @@ def authenticate_user(db: Session, email: str, password: str) -> User:
 
     user = db.query(User).filter(User.email == email).first()
     if user and verify_password(password, user.hashed_password):
-        _failed_attempts.pop(email, None)
+        lockout.reset(email)
         return user
 
-    if not user or not verify_password(password, user.hashed_password):
-        _failed_attempts[email].append(time.monotonic())
-        logger.info("Failed login attempt for %s", email)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    return user
+    lockout.record_failure(email)
+    logger.info("Failed login attempt for %s", email)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
 
 
 def register_user(db: Session, email: str, password: str, full_name: str) -> tuple[User, bool]:
@@ -199,13 +210,13 @@ def register_user(db: Session, email: str, password: str, full_name: str) -> tup
 
     user_kwargs = {
         "email": email,
-        "hashed_password": hash_password(password),
         "full_name": full_name,
     }
     if supabase_user_id:
         user_kwargs["id"] = supabase_user_id
 
     user = User(**user_kwargs)
+    _set_local_password_hash(user, password)
     db.add(user)
     db.flush()  # Flush to get the user.id before creating the account
 
@@ -246,13 +257,14 @@ def request_password_reset(db: Session, email: str) -> None:
         )
         return
 
-    delivered = send_notification_email(
+    queued = queue_notification_email(
+        db,
         user.email,
         "FinPulse password reset",
         _password_reset_email_body(user.full_name, reset_url),
     )
-    if delivered:
-        logger.info("Local password-reset email sent to %s", user.email)
+    if queued:
+        logger.info("Local password-reset email queued for %s", user.email)
         return
 
     logger.warning(
@@ -272,7 +284,7 @@ def reset_password(db: Session, token: str, new_password: str) -> None:
                 user = db.query(User).filter(User.email == email).first()
                 if user:
                     _sync_local_password_hash(db, user, new_password)
-                    _failed_attempts.pop(user.email, None)
+                    _lockout_store().reset(user.email)
                     logger.info("Password reset completed via Supabase for user: %s", user.id)
                     return
 
@@ -312,7 +324,7 @@ def reset_password(db: Session, token: str, new_password: str) -> None:
         )
 
     try:
-        user.hashed_password = hash_password(new_password)
+        _set_local_password_hash(user, new_password)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -321,5 +333,5 @@ def reset_password(db: Session, token: str, new_password: str) -> None:
 
     db.add(user)
     db.commit()
-    _failed_attempts.pop(user.email, None)
+    _lockout_store().reset(user.email)
     logger.info("Password reset completed for user: %s", user.id)
@@ -0,0 +1,134 @@
+"""Columnar transactions for the financial engines.
+
+A request's transactions are loaded once into NumPy arrays (day ordinals,
+integer cents, a debit flag and category codes) and every aggregation the
+engines need (period totals, weekly buckets, per-category sums) is a masked
+``sum`` or ``bincount`` over them instead of a Python loop per metric.
+
+``bincount`` accumulates its weights as float64, which is exact for integer
+cents up to 2**53 (about 90 trillion dollars), so totals come back as exact
+ints.
+
+Category totals are returned in order of first appearance, as the Python
+loops they replace produced them, so ties in ``max`` and ``sorted`` resolve
+the same way.
+"""
+
+from collections.abc import Callable
+from datetime import date
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.transaction import TransactionType
+from app.services.queries import transactions_between
+
+
+def _encode(values) -> tuple[np.ndarray, np.ndarray]:
+    """Codes of *values* and the distinct values, in order of first appearance."""
+    index = {value: i for i, value in enumerate(dict.fromkeys(values))}
+    distinct = np.empty(len(index), dtype=object)
+    distinct[:] = list(index)
+    return np.fromiter(map(index.__getitem__, values), np.int32, len(values)), distinct
+
+
+class TransactionColumns:
+    __slots__ = ("days", "cents", "debit", "category_codes", "description_codes", "categories", "descriptions")
+
+    def __init__(self, days, cents, debit, category_codes, description_codes, categories, descriptions):
+        self.days = days  # int32 date ordinals
+        self.cents = cents  # int64
+        self.debit = debit  # bool; False means credit
+        self.category_codes = category_codes  # int32 indexes into categories
+        self.description_codes = description_codes  # int32 indexes into descriptions
+        self.categories = categories  # object array of distinct raw values
+        self.descriptions = descriptions  # object array of distinct raw values
+
+    @classmethod
+    def from_rows(cls, rows) -> "TransactionColumns":
+        """Columns of ``transactions_between`` rows."""
+        if not rows:
+            codes, values = _encode(())
+            return cls(np.empty(0, np.int32), np.empty(0, np.int64), np.empty(0, bool), codes, codes, values, values)
+        kinds, categories, descriptions, days, cents = zip(*rows)
+        n = len(rows)
+        # Few distinct days: convert each once, then map.
+        ordinals = {day: day.toordinal() for day in set(days)}
+        category_codes, category_values = _encode(categories)
+        description_codes, description_values = _encode(descriptions)
+        return cls(
+            days=np.fromiter(map(ordinals.__getitem__, days), np.int32, n),
+            cents=np.fromiter(cents, np.int64, n),
+            debit=np.fromiter(map(TransactionType.DEBIT.__eq__, kinds), bool, n),
+            category_codes=category_codes,
+            description_codes=description_codes,
+            categories=category_values,
+            descriptions=description_values,
+        )
+
+    def __len__(self) -> int:
+        return len(self.cents)
+
+    def between(self, start: date, end: date) -> "TransactionColumns":
+        """The transactions dated from *start* to *end*, inclusive."""
+        mask = (self.days >= start.toordinal()) & (self.days <= end.toordinal())
+        return TransactionColumns(
+            self.days[mask],
+            self.cents[mask],
+            self.debit[mask],
+            self.category_codes[mask],
+            self.description_codes[mask],
+            self.categories,
+            self.descriptions,
+        )
+
+    def _of(self, kind: TransactionType) -> np.ndarray:
+        return self.debit if kind == TransactionType.DEBIT else ~self.debit
+
+    def total(self, kind: TransactionType) -> int:
+        return int(self.cents[self._of(kind)].sum())
+
+    def weekly_totals(self, kind: TransactionType, first_week_start: date, weeks: int) -> list[int]:
+        """Totals for *weeks* consecutive weeks from *first_week_start* (a Monday)."""
+        mask = self._of(kind)
+        offsets = self.days[mask] - first_week_start.toordinal()
+        buckets = offsets // 7
+        keep = (offsets >= 0) & (buckets < weeks)
+        totals = np.bincount(buckets[keep], weights=self.cents[mask][keep], minlength=weeks)
+        return totals.astype(np.int64).tolist()
+
+    def monthly_totals(self, kind: TransactionType, month_starts: list[date]) -> list[int]:
+        """Totals per calendar month; *month_starts* are consecutive firsts of the month plus the one after the last."""
+        mask = self._of(kind)
+        months = len(month_starts) - 1
+        bounds = np.array([month.toordinal() for month in month_starts], np.int32)
+        buckets = np.searchsorted(bounds, self.days[mask], side="right") - 1
+        keep = (buckets >= 0) & (buckets < months)
+        totals = np.bincount(buckets[keep], weights=self.cents[mask][keep], minlength=months)
+        return totals.astype(np.int64).tolist()
+
+    def category_totals(self, kind: TransactionType, label: Callable[[str | None], str]) -> dict[str, int]:
+        """Totals per ``label(category)``, in order of first appearance."""
+        mask = self._of(kind)
+        codes = self.category_codes[mask]
+        sums = np.bincount(codes, weights=self.cents[mask], minlength=len(self.categories))
+        first_seen = np.full(len(self.categories), len(codes))
+        np.minimum.at(first_seen, codes, np.arange(len(codes)))
+        present = np.flatnonzero(first_seen < len(codes))
+        totals: dict[str, int] = {}
+        for code in present[np.argsort(first_seen[present])].tolist():
+            name = label(self.categories[code])
+            totals[name] = totals.get(name, 0) + int(sums[code])
+        return totals
+
+    def labels(self, kind: TransactionType) -> set[tuple[str | None, str | None]]:
+        """Distinct raw ``(category, description)`` pairs."""
+        mask = self._of(kind)
+        width = len(self.descriptions)
+        pairs = np.unique(self.category_codes[mask].astype(np.int64) * width + self.description_codes[mask])
+        categories, descriptions = np.divmod(pairs, width)
+        return set(zip(self.categories[categories].tolist(), self.descriptions[descriptions].tolist()))
+
+
+def load_transactions(db: Session, user_id, start: date, end: date) -> TransactionColumns:
+    return TransactionColumns.from_rows(transactions_between(db, user_id, start, end))
@@ -0,0 +1,225 @@
+"""Debt payoff plans: avalanche, snowball and utilization-targeted.
+
+Every plan pays each debt's minimum and puts the rest of a monthly budget
+on one debt at a time, in the strategy's order:
+
+* avalanche: highest APR first, which pays the least interest;
+* snowball: smallest balance first, which closes accounts soonest;
+* utilization: every card down to 30% of its limit, highest utilization
+  first, then highest APR first.
+
+Credit cards accrue their APR monthly on the balance carried, and their
+minimum is ``min_payment_pct`` of the balance but at least $10. Cards
+without an APR are assumed to charge a typical ``DEFAULT_APR``. Installment
+plans are interest-free and their minimum is the plan payment.
+
+All strategies are simulated together. Balances are a (strategies × debts)
+array of cents, rounded to the cent each month, and a month is a handful of
+vectorised operations: the money left after minimums is spread over each
+strategy's priority order with a cumulative-sum waterfall rather than a loop
+over debts.
+"""
+
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.models.credit_card import CreditCard
+from app.models.installment_plan import InstallmentPlan
+from app.models.user import User
+from app.services.money import from_cents, to_cents
+from app.services.queries import rows_for_user
+from app.utils.dates import add_months, month_start
+
+STRATEGIES = ("avalanche", "snowball", "utilization")
+CREDIT_CARD = "credit_card"
+INSTALLMENT = "installment"
+DEFAULT_APR = 19.99
+MIN_PAYMENT_FLOOR = 1_000  # cents
+UTILIZATION_TARGET = 0.30
+MAX_MONTHS = 30 * 12
+
+
+class Debt(NamedTuple):
+    name: str
+    kind: str
+    balance: int  # cents
+    apr: float  # annual, percent
+    min_payment_pct: float
+    credit_limit: int | None  # cents; cards only
+    fixed_payment: int | None  # cents; installment plans only
+
+
+def load_debts(db: Session, user_id) -> list[Debt]:
+    """The user's cards and installment plans that still have a balance."""
+    debts = [
+        Debt(
+            name=card.name,
+            kind=CREDIT_CARD,
+            balance=to_cents(card.current_balance),
+            apr=float(card.apr) if card.apr is not None else DEFAULT_APR,
+            min_payment_pct=float(card.min_payment_pct or 0),
+            credit_limit=to_cents(card.credit_limit),
+            fixed_payment=None,
+        )
+        for card in rows_for_user(db, CreditCard, user_id)
+    ]
+    debts += [
+        Debt(
+            name=plan.description,
+            kind=INSTALLMENT,
+            balance=to_cents(plan.monthly_payment) * plan.remaining_payments,
+            apr=0.0,
+            min_payment_pct=0.0,
+            credit_limit=None,
+            fixed_payment=to_cents(plan.monthly_payment),
+        )
+        for plan in rows_for_user(db, InstallmentPlan, user_id)
+    ]
+    return [debt for debt in debts if debt.balance > 0]
+
+
+def _minimums(balance: np.ndarray, min_pct: np.ndarray, is_card: np.ndarray, fixed: np.ndarray) -> np.ndarray:
+    return np.minimum(balance, np.where(is_card, np.maximum(np.rint(balance * min_pct), MIN_PAYMENT_FLOOR), fixed))
+
+
+def minimum_payment(debts: list[Debt]) -> int:
+    """This month's minimum payments on *debts*, in cents, after a month of interest."""
+    balance = np.array([debt.balance for debt in debts], dtype=float)
+    balance += np.rint(balance * np.array([debt.apr for debt in debts]) / 100 / 12)
+    min_pct = np.array([debt.min_payment_pct for debt in debts]) / 100
+    is_card = np.array([debt.kind == CREDIT_CARD for debt in debts], dtype=bool)
+    fixed = np.array([debt.fixed_payment or 0 for debt in debts], dtype=float)
+    return int(_minimums(balance, min_pct, is_card, fixed).sum())
+
+
+def _waterfall(amounts: np.ndarray, order: np.ndarray, budget: np.ndarray) -> np.ndarray:
+    """Spend each row's *budget* on its *amounts* in priority *order* (flat indexes into *amounts*)."""
+    ordered = amounts.take(order).reshape(amounts.shape)
+    before = np.cumsum(ordered, axis=1) - ordered
+    paid = np.minimum(np.maximum(budget[:, None] - before, 0), ordered)
+    spent = np.empty_like(paid)
+    spent.put(order, paid)
+    return spent
+
+
+def _flat(orders: list[np.ndarray]) -> np.ndarray:
+    """Per-row orders as flat indexes into a (rows × debts) array."""
+    return np.concatenate([order + row * len(order) for row, order in enumerate(orders)])
+
+
+def plan_payoff(debts: list[Debt], monthly_budget: int, start: date | None = None) -> dict:
+    """Each strategy's schedule, interest and payoff dates for *monthly_budget* cents a month."""
+    start = month_start(start or date.today())
+    if not debts:
+        return {
+            "monthly_budget": from_cents(monthly_budget),
+            "minimum_payment": 0.0,
+            "debts": [],
+            "strategies": [],
+            "recommended": None,
+        }
+
+    count = len(debts)
+    initial = np.array([debt.balance for debt in debts], dtype=float)
+    apr = np.array([debt.apr for debt in debts])
+    rate = apr / 100 / 12
+    min_pct = np.array([debt.min_payment_pct for debt in debts]) / 100
+    is_card = np.array([debt.kind == CREDIT_CARD for debt in debts])
+    fixed = np.array([debt.fixed_payment or 0 for debt in debts], dtype=float)
+    limit = np.array([debt.credit_limit or 0 for debt in debts], dtype=float)
+
+    # Stable sorts keep ties in the order the debts were given.
+    avalanche = np.argsort(-apr, kind="stable")
+    snowball = np.argsort(initial, kind="stable")
+    utilization = np.where(limit > 0, initial / np.where(limit > 0, limit, 1), 0)
+    order = _flat([avalanche, snowball, avalanche])
+    target_order = _flat([avalanche, avalanche, np.argsort(-utilization, kind="stable")])
+    # Only the utilization strategy pays cards down to a target before its main order.
+    target = np.full((len(STRATEGIES), count), np.inf)
+    target[2, is_card & (limit > 0)] = np.rint(UTILIZATION_TARGET * limit[is_card & (limit > 0)])
+
+    balance = np.tile(initial, (len(STRATEGIES), 1))
+    payments = np.zeros((MAX_MONTHS, len(STRATEGIES), count))
+    interest = np.zeros((MAX_MONTHS, len(STRATEGIES), count))
+    paid_off = np.full((len(STRATEGIES), count), -1)
+    first_minimum = None
+    months = 0
+    while months < MAX_MONTHS and (balance > 0).any():
+        interest[months] = np.rint(balance * rate)
+        balance += interest[months]
+        minimum = _minimums(balance, min_pct, is_card, fixed)
+        if first_minimum is None:
+            first_minimum = minimum[0].copy()
+        extra = np.maximum(monthly_budget - minimum.sum(axis=1), 0)
+        left = balance - minimum
+        to_target = _waterfall(np.maximum(left - target, 0), target_order, extra)
+        rest = _waterfall(left - to_target, order, extra - to_target.sum(axis=1))
+        payments[months] = minimum + to_target + rest
+        balance -= payments[months]
+        paid_off[(balance <= 0) & (paid_off < 0)] = months
+        months += 1
+
+    strategies = []
+    for s, name in enumerate(STRATEGIES):
+        done = (paid_off[s] >= 0).all()
+        last = int(paid_off[s].max()) + 1 if done else months
+        monthly_interest = interest[:last, s].sum(axis=1)
+        remaining = initial.sum() + np.cumsum(monthly_interest) - np.cumsum(payments[:last, s].sum(axis=1))
+        strategies.append(
+            {
+                "strategy": name,
+                "months_to_payoff": last if done else None,
+                "payoff_date": add_months(start, last) if done else None,
+                "total_interest": from_cents(int(monthly_interest.sum())),
+                "total_paid": from_cents(int(payments[:last, s].sum())),
+                "payoff_dates": [add_months(start, int(m) + 1) if m >= 0 else None for m in paid_off[s]],
+                "schedule": [
+                    {
+                        "date": add_months(start, m + 1),
+                        "payments": month_payments,
+                        "interest": month_interest,
+                        "balance": month_balance,
+                    }
+                    for m, (month_payments, month_interest, month_balance) in enumerate(
+                        zip(
+                            (payments[:last, s] / 100).round(2).tolist(),
+                            (monthly_interest / 100).round(2).tolist(),
+                            (remaining / 100).round(2).tolist(),
+                        )
+                    )
+                ],
+            }
+        )
+
+    payable = [plan for plan in strategies if plan["months_to_payoff"] is not None] or strategies
+    recommended = min(payable, key=lambda plan: (plan["total_interest"], plan["months_to_payoff"] or MAX_MONTHS))
+    return {
+        "monthly_budget": from_cents(monthly_budget),
+        "minimum_payment": from_cents(int(first_minimum.sum())),
+        "debts": [
+            {
+                "name": debt.name,
+                "kind": debt.kind,
+                "balance": from_cents(debt.balance),
+                "apr": debt.apr,
+                "minimum_payment": from_cents(int(minimum_due)),
+            }
+            for debt, minimum_due in zip(debts, first_minimum)
+        ],
+        "strategies": strategies,
+        "recommended": recommended["strategy"],
+    }
+
+
+def build_payoff_plan(db: Session, user: User, monthly_budget: float) -> dict:
+    plan = plan_payoff(load_debts(db, user.id), to_cents(monthly_budget))
+    if plan["minimum_payment"] > plan["monthly_budget"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Monthly budget is below the minimum payments of ${plan['minimum_payment']:,.2f}",
+        )
+    return plan
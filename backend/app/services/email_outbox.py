@@ -0,0 +1,323 @@
+"""Durable outgoing email queue.
+
+Request handlers call ``queue_notification_email`` which only inserts an
+``email_outbox`` row. The outbox worker claims due rows in batches with
+``FOR UPDATE SKIP LOCKED`` (so any number of API processes can run a worker),
+sends them over the pooled SMTP sessions, and records the outcome: sent,
+rescheduled with exponential backoff, or failed for good.
+
+A claimed row is leased until ``now + email_outbox_lease_seconds``; if the
+worker dies mid-batch the row becomes due again when the lease runs out.
+
+Bodies can carry password reset links, so a sent row's body is cleared as
+soon as it is delivered, and the worker deletes sent and failed rows
+``email_outbox_retention_days`` after they were queued.
+
+Drain the queue once with ``python -m app.services.email_outbox``.
+"""
+
+import logging
+import random
+import smtplib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import NamedTuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.services.notifications import SMTPConnectionPool, build_email_message, get_smtp_pool, smtp_configured
+
+logger = logging.getLogger("finpulse.email_outbox")
+
+
+class ClaimedEmail(NamedTuple):
+    id: uuid.UUID
+    to_email: str
+    subject: str
+    body: str
+    attempts: int
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, body: str) -> EmailOutbox:
+    entry = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(entry)
+    db.commit()
+    outbox_worker.notify()
+    return entry
+
+
+def queue_notification_email(db: Session, to_email: str, subject: str, body: str) -> bool:
+    """Queue an email for background delivery. Returns False if SMTP is not configured."""
+    if not smtp_configured():
+        logger.info("SMTP not configured; not queueing email to %s", to_email)
+        logger.info("Email subject: %s", subject)
+        logger.info("Email body preview: %s", body[:300])
+        return False
+
+    enqueue_email(db, to_email, subject, body)
+    return True
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter for a message that has failed *attempts* times."""
+    cap = min(
+        settings.email_outbox_backoff_base_seconds * (2 ** max(attempts - 1, 0)),
+        settings.email_outbox_backoff_max_seconds,
+    )
+    return timedelta(seconds=random.uniform(cap / 2, cap))
+
+
+def is_permanent_failure(exc: Exception) -> bool:
+    """5xx replies (bad mailbox, rejected content) will not succeed on retry."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
+
+
+def failure_values(attempts: int, exc: Exception, now: datetime) -> dict:
+    """Column updates for a message whose delivery attempt raised *exc*."""
+    values = {"last_error": f"{type(exc).__name__}: {exc}"[:2000]}
+    if is_permanent_failure(exc) or attempts >= settings.email_outbox_max_attempts:
+        values["status"] = OutboxStatus.FAILED
+    else:
+        values["status"] = OutboxStatus.PENDING
+        values["next_attempt_at"] = now + retry_delay(attempts)
+    return values
+
+
+def claim_batch(db: Session, now: datetime, batch_size: int) -> list[ClaimedEmail]:
+    due = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status.in_([OutboxStatus.PENDING, OutboxStatus.SENDING]),
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    rows = db.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(due))
+        .values(
+            status=OutboxStatus.SENDING,
+            attempts=EmailOutbox.attempts + 1,
+            next_attempt_at=now + timedelta(seconds=settings.email_outbox_lease_seconds),
+        )
+        .returning(
+            EmailOutbox.id,
+            EmailOutbox.to_email,
+            EmailOutbox.subject,
+            EmailOutbox.body,
+            EmailOutbox.attempts,
+        )
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return [ClaimedEmail(*row) for row in rows]
+
+
+def send_claimed(
+    emails: list[ClaimedEmail], pool: SMTPConnectionPool, max_workers: int
+) -> list[tuple[ClaimedEmail, Exception | None]]:
+    """Send each email, returning it with the exception it raised (None on success)."""
+
+    def send(email: ClaimedEmail) -> tuple[ClaimedEmail, Exception | None]:
+        try:
+            pool.send(build_email_message(email.to_email, email.subject, email.body))
+        except Exception as exc:
+            return email, exc
+        return email, None
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1), thread_name_prefix="email-outbox") as executor:
+        return list(executor.map(send, emails))
+
+
+def record_outcomes(db: Session, outcomes: list[tuple[ClaimedEmail, Exception | None]], now: datetime) -> None:
+    sent_ids = [email.id for email, exc in outcomes if exc is None]
+    if sent_ids:
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id.in_(sent_ids))
+            .values(status=OutboxStatus.SENT, sent_at=now, last_error=None, body="")
+            .execution_options(synchronize_session=False)
+        )
+    for email, exc in outcomes:
+        if exc is None:
+            continue
+        values = failure_values(email.attempts, exc, now)
+        logger.warning(
+            "Email %s to %s failed (attempt %d, now %s): %s",
+            email.id,
+            email.to_email,
+            email.attempts,
+            values["status"].value,
+            exc,
+        )
+        db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == email.id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+
+
+def deliver_pending_emails(batch_size: int | None = None) -> dict:
+    """Claim and send one batch of due emails and return delivery stats."""
+    stats = {"claimed": 0, "sent": 0, "failed": 0}
+    if not smtp_configured():
+        return stats
+
+    db = SessionLocal()
+    try:
+        emails = claim_batch(db, datetime.now(timezone.utc), batch_size or settings.email_outbox_batch_size)
+        if not emails:
+            return stats
+        outcomes = send_claimed(emails, get_smtp_pool(), settings.smtp_pool_size)
+        record_outcomes(db, outcomes, datetime.now(timezone.utc))
+    finally:
+        db.close()
+
+    stats["claimed"] = len(emails)
+    stats["failed"] = sum(1 for _, exc in outcomes if exc is not None)
+    stats["sent"] = stats["claimed"] - stats["failed"]
+    return stats
+
+
+def purge_finished_emails(db: Session, now: datetime, batch_size: int) -> int:
+    """Delete up to *batch_size* sent or failed rows past the retention window."""
+    cutoff = now - timedelta(days=settings.email_outbox_retention_days)
+    expired = (
+        select(EmailOutbox.id)
+        .where(
+            EmailOutbox.status.in_([OutboxStatus.SENT, OutboxStatus.FAILED]),
+            EmailOutbox.created_at < cutoff,
+        )
+        .limit(batch_size)
+    )
+    deleted = db.execute(
+        delete(EmailOutbox).where(EmailOutbox.id.in_(expired)).execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def purge_expired_emails(batch_size: int | None = None) -> int:
+    """Delete every sent or failed row past the retention window and return how many."""
+    batch_size = batch_size or settings.email_outbox_batch_size
+    total = 0
+    db = SessionLocal()
+    try:
+        while True:
+            deleted = purge_finished_emails(db, datetime.now(timezone.utc), batch_size)
+            total += deleted
+            if deleted < batch_size:
+                return total
+    finally:
+        db.close()
+
+
+class EmailOutboxWorker:
+    """Background thread that drains the outbox, waking early when mail is queued.
+
+    Every ``purge_interval_seconds`` it also purges rows past the retention window.
+    """
+
+    def __init__(
+        self,
+        poll_seconds: float,
+        deliver=deliver_pending_emails,
+        purge=purge_expired_emails,
+        purge_interval_seconds: float = 3600.0,
+        clock=time.monotonic,
+    ):
+        self.poll_seconds = poll_seconds
+        self.purge_interval_seconds = purge_interval_seconds
+        self._deliver = deliver
+        self._purge = purge
+        self._clock = clock
+        self._next_purge = 0.0
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    def _purge_if_due(self) -> None:
+        if self._clock() < self._next_purge:
+            return
+        self._next_purge = self._clock() + self.purge_interval_seconds
+        try:
+            purged = self._purge()
+        except Exception:
+            logger.exception("Email outbox purge failed")
+            return
+        if purged:
+            logger.info("Purged %d delivered or failed email(s) from the outbox", purged)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                stats = self._deliver()
+            except Exception:
+                logger.exception("Email outbox delivery failed")
+                stats = {"claimed": 0}
+            self._purge_if_due()
+            if stats["claimed"] >= settings.email_outbox_batch_size:
+                continue  # more is probably waiting
+            self._wake.wait(self.poll_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="email-outbox-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+
+outbox_worker = EmailOutboxWorker(
+    settings.email_outbox_poll_seconds, purge_interval_seconds=settings.email_outbox_purge_interval_seconds
+)
+
+
+def start_email_outbox_worker() -> None:
+    if settings.email_outbox_worker_enabled and smtp_configured():
+        outbox_worker.start()
+
+
+def stop_email_outbox_worker() -> None:
+    outbox_worker.stop()
+
+
+if __name__ == "__main__":
+    from app.logging_config import setup_logging
+
+    setup_logging()
+    total = {"claimed": 0, "sent": 0, "failed": 0}
+    while True:
+        batch = deliver_pending_emails()
+        for key in total:
+            total[key] += batch[key]
+        if batch["claimed"] == 0:
+            break
+    total["purged"] = purge_expired_emails()
+    print(total)
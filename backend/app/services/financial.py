@@ -8,8 +8,12 @@ from app.models.expense import Expense
 from app.models.goal import Goal
 from app.models.installment_plan import InstallmentPlan
 from app.models.investment import Investment
-from app.models.transaction import Transaction, TransactionType
+from app.models.transaction import TransactionType
 from app.models.user import User
+from app.profiling import profiled
+from app.services.columnar import TransactionColumns, load_transactions
+from app.services.money import from_cents, to_cents
+from app.services.queries import latest_transactions, rows_for_user
 
 UPCOMING_BILLS_WINDOW_DAYS = 30
 RECENT_TRANSACTIONS_LIMIT = 10
@@ -17,63 +21,64 @@ DASHBOARD_TREND_WEEKS = 8
 CATEGORY_TREND_LIMIT = 6
 
 
-def _normalize_to_monthly(amount: float, frequency: str | None) -> float:
-    """Convert a recurring expense amount to its monthly equivalent."""
+def _normalize_to_monthly(amount: int, frequency: str | None) -> int:
+    """Convert a recurring expense amount in cents to its monthly equivalent, to the nearest cent."""
     if not frequency:
         return amount
     freq = frequency.lower()
     if freq == "weekly":
-        return amount * 52 / 12
+        return (amount * 52 + 6) // 12
     elif freq == "biweekly":
-        return amount * 26 / 12
+        return (amount * 26 + 6) // 12
     elif freq == "monthly":
         return amount
     elif freq == "yearly":
-        return amount / 12
+        return (amount + 6) // 12
     return amount
 
 
-def _matches_recurring_expense(expense: Expense, txn: Transaction) -> bool:
+def _matches_recurring_expense(
+    expense: Expense, debit_categories: set[str], debit_descriptions: set[tuple[str, str]]
+) -> bool:
     """
     Return True when a debit transaction likely represents a recurring expense entry.
 
     Matching requires category alignment. If the recurring expense has a description,
-    description must also match exactly.
+    description must also match exactly. The debits are given as the sets of their
+    normalised categories and ``(category, description)`` pairs.
     """
-    if txn.transaction_type != TransactionType.DEBIT:
-        return False
-
     expense_category = (expense.category or "").strip().lower()
-    txn_category = (txn.category or "").strip().lower()
-    if not expense_category or expense_category != txn_category:
+    if not expense_category:
         return False
 
     expense_description = (expense.description or "").strip().lower()
     if not expense_description:
-        return True
-
-    txn_description = (txn.description or "").strip().lower()
-    return bool(txn_description) and txn_description == expense_description
+        return expense_category in debit_categories
+    return (expense_category, expense_description) in debit_descriptions
 
 
-def _compute_monthly_expenses(expenses: list[Expense], month_transactions: list[Transaction]) -> float:
+def _compute_monthly_expenses(expenses: list[Expense], month_transactions: TransactionColumns) -> int:
     """
-    Compute monthly expenses without double-counting recurring bills already logged
-    as debit transactions in the same month.
+    Compute monthly expenses in cents without double-counting recurring bills
+    already logged as debit transactions in the same month.
     """
-    debit_transactions = [
-        t for t in month_transactions if t.transaction_type == TransactionType.DEBIT
-    ]
-    debit_total = sum(float(t.amount) for t in debit_transactions)
+    debit_total = month_transactions.total(TransactionType.DEBIT)
 
-    uncovered_recurring_monthly = 0.0
+    # Normalise each distinct label once rather than once per transaction.
+    debit_descriptions = {
+        ((category or "").strip().lower(), (description or "").strip().lower())
+        for category, description in month_transactions.labels(TransactionType.DEBIT)
+    }
+    debit_categories = {category for category, _ in debit_descriptions}
+
+    uncovered_recurring_monthly = 0
     for expense in expenses:
         if not expense.is_recurring:
             continue
-        if any(_matches_recurring_expense(expense, txn) for txn in debit_transactions):
+        if _matches_recurring_expense(expense, debit_categories, debit_descriptions):
             continue
         uncovered_recurring_monthly += _normalize_to_monthly(
-            float(expense.amount), expense.frequency
+            to_cents(expense.amount), expense.frequency
         )
 
     return debit_total + uncovered_recurring_monthly
@@ -83,23 +88,21 @@ def _week_start(d: date) -> date:
     return d - timedelta(days=d.weekday())
 
 
-def _build_spending_trend(transactions: list[Transaction], today: date) -> list[dict]:
+def _category_label(category: str | None) -> str:
+    return (category or "Uncategorized").strip() or "Uncategorized"
+
+
+def _build_spending_trend(transactions: TransactionColumns, today: date) -> list[dict]:
     current_week_start = _week_start(today)
     trend_start = current_week_start - timedelta(days=7 * (DASHBOARD_TREND_WEEKS - 1))
 
-    totals_by_week: dict[date, float] = {}
-    for txn in transactions:
-        if txn.transaction_type != TransactionType.DEBIT:
-            continue
-        ws = _week_start(txn.date)
-        totals_by_week[ws] = totals_by_week.get(ws, 0.0) + float(txn.amount)
+    weekly_totals = transactions.weekly_totals(TransactionType.DEBIT, trend_start, DASHBOARD_TREND_WEEKS)
 
     points: list[dict] = []
     prev_amount = None
-    for idx in range(DASHBOARD_TREND_WEEKS):
+    for idx, amount in enumerate(weekly_totals):
         ws = trend_start + timedelta(days=idx * 7)
         we = ws + timedelta(days=6)
-        amount = round(totals_by_week.get(ws, 0.0), 2)
         change_pct = None
         if prev_amount is not None and prev_amount > 0:
             change_pct = round((amount - prev_amount) / prev_amount * 100, 1)
@@ -108,7 +111,7 @@ def _build_spending_trend(transactions: list[Transaction], today: date) -> list[
                 "week_start": ws.isoformat(),
                 "week_end": we.isoformat(),
                 "label": ws.strftime("%b %d"),
-                "spending": amount,
+                "spending": from_cents(amount),
                 "wow_change_pct": change_pct,
             }
         )
@@ -117,13 +120,8 @@ def _build_spending_trend(transactions: list[Transaction], today: date) -> list[
     return points
 
 
-def _build_category_spending(transactions: list[Transaction]) -> list[dict]:
-    category_totals: dict[str, float] = {}
-    for txn in transactions:
-        if txn.transaction_type != TransactionType.DEBIT:
-            continue
-        category = (txn.category or "Uncategorized").strip() or "Uncategorized"
-        category_totals[category] = category_totals.get(category, 0.0) + float(txn.amount)
+def _build_category_spending(transactions: TransactionColumns) -> list[dict]:
+    category_totals = transactions.category_totals(TransactionType.DEBIT, _category_label)
 
     if not category_totals:
         return []
@@ -136,75 +134,56 @@ def _build_category_spending(transactions: list[Transaction]) -> list[dict]:
     return [
         {
             "category": category,
-            "amount": round(amount, 2),
+            "amount": from_cents(amount),
             "share_pct": round((amount / total_spending) * 100, 1) if total_spending > 0 else 0,
         }
         for category, amount in top_categories
     ]
 
 
+@profiled("dashboard_summary")
 def build_dashboard_summary(db: Session, user: User) -> dict:
     """Aggregate all user financial data into a single dashboard payload."""
     # Fetch all user data
-    accounts = db.query(Account).filter(Account.user_id == user.id).all()
-    cards = db.query(CreditCard).filter(CreditCard.user_id == user.id).all()
-    investments = db.query(Investment).filter(Investment.user_id == user.id).all()
-    expenses = db.query(Expense).filter(Expense.user_id == user.id).all()
-    goals = db.query(Goal).filter(Goal.user_id == user.id).all()
-    installments = db.query(InstallmentPlan).filter(InstallmentPlan.user_id == user.id).all()
+    accounts = rows_for_user(db, Account, user.id)
+    cards = rows_for_user(db, CreditCard, user.id)
+    investments = rows_for_user(db, Investment, user.id)
+    expenses = rows_for_user(db, Expense, user.id)
+    goals = rows_for_user(db, Goal, user.id)
+    installments = rows_for_user(db, InstallmentPlan, user.id)
 
     today = date.today()
     first_of_month = today.replace(day=1)
 
-    # Current month transactions
-    month_transactions = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= first_of_month,
-            Transaction.date <= today,
-        )
-        .all()
-    )
-
-    # Last N weeks of transactions for week-over-week trends.
+    # Transactions for the current month and the last N weeks (week-over-week
+    # trends), loaded once.
     trend_start = _week_start(today) - timedelta(days=7 * (DASHBOARD_TREND_WEEKS - 1))
-    trend_transactions = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= trend_start,
-            Transaction.date <= today,
-        )
-        .all()
-    )
+    transactions = load_transactions(db, user.id, min(first_of_month, trend_start), today)
+    month_transactions = transactions.between(first_of_month, today)
+    trend_transactions = transactions.between(trend_start, today)
 
-    # --- Compute aggregates ---
+    # --- Compute aggregates (in integer cents until the payload is built) ---
 
     # Assets: chequing + savings balances + investment values
     account_balance = sum(
-        float(a.balance)
+        to_cents(a.balance)
         for a in accounts
         if a.account_type in ("chequing", "savings")
     )
-    investment_total = sum(float(i.current_value) for i in investments)
+    investment_total = sum(to_cents(i.current_value) for i in investments)
     total_assets = account_balance + investment_total
 
     # Liabilities: credit card balances + remaining installment amounts
-    cc_balance = sum(float(c.current_balance) for c in cards)
+    cc_balance = sum(to_cents(c.current_balance) for c in cards)
     installment_remaining = sum(
-        float(ip.monthly_payment) * ip.remaining_payments for ip in installments
+        to_cents(ip.monthly_payment) * ip.remaining_payments for ip in installments
     )
     total_liabilities = cc_balance + installment_remaining
 
     net_worth = total_assets - total_liabilities
 
     # Monthly income: sum of credit-type transactions this month
-    monthly_income = sum(
-        float(t.amount)
-        for t in month_transactions
-        if t.transaction_type == TransactionType.CREDIT
-    )
+    monthly_income = month_transactions.total(TransactionType.CREDIT)
 
     # Monthly expenses: avoid double-counting recurring expenses already represented
     # by debit transactions in this month.
@@ -213,7 +192,7 @@ def build_dashboard_summary(db: Session, user: User) -> dict:
     cash_flow = monthly_income - monthly_expenses
 
     # Credit utilization
-    total_cc_limit = sum(float(c.credit_limit) for c in cards)
+    total_cc_limit = sum(to_cents(c.credit_limit) for c in cards)
     credit_utilization_pct = (cc_balance / total_cc_limit * 100) if total_cc_limit > 0 else 0
 
     # Upcoming bills: recurring expenses with next_due_date in the window
@@ -247,13 +226,7 @@ def build_dashboard_summary(db: Session, user: User) -> dict:
     ]
 
     # Recent transactions
-    recent_txns = (
-        db.query(Transaction)
-        .filter(Transaction.user_id == user.id)
-        .order_by(Transaction.date.desc(), Transaction.created_at.desc())
-        .limit(RECENT_TRANSACTIONS_LIMIT)
-        .all()
-    )
+    recent_txns = latest_transactions(db, user.id, RECENT_TRANSACTIONS_LIMIT)
     recent_transactions = [
         {
             "id": str(t.id),
@@ -272,12 +245,12 @@ def build_dashboard_summary(db: Session, user: User) -> dict:
     category_spending = _build_category_spending(month_transactions)
 
     return {
-        "net_worth": round(net_worth, 2),
-        "total_assets": round(total_assets, 2),
-        "total_liabilities": round(total_liabilities, 2),
-        "monthly_income": round(monthly_income, 2),
-        "monthly_expenses": round(monthly_expenses, 2),
-        "cash_flow": round(cash_flow, 2),
+        "net_worth": from_cents(net_worth),
+        "total_assets": from_cents(total_assets),
+        "total_liabilities": from_cents(total_liabilities),
+        "monthly_income": from_cents(monthly_income),
+        "monthly_expenses": from_cents(monthly_expenses),
+        "cash_flow": from_cents(cash_flow),
         "credit_utilization_pct": round(credit_utilization_pct, 2),
         "upcoming_bills": upcoming_bills,
         "goals_summary": goals_summary,
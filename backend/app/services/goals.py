@@ -1,39 +1,189 @@
-from datetime import date
+"""Goal forecasts fitted to each goal's contribution history.
 
+A goal's opening balance and every later change to its ``current_amount``
+are recorded in ``goal_contributions`` by ``record_opening_balance`` and
+``record_contribution``. A forecast fits a least-squares line to the goal's
+balance over time, with today's balance as the latest point, and projects the
+day the line reaches the target. The standard error of the slope gives a 90%
+band on the rate, and so on the completion date.
+
+The fit needs only per-goal sums (count, Σt, Σy, Σt², Σty, Σy²), which the
+database aggregates in the same query that loads the goals; ``forecast_goals``
+then fits all of them at once with NumPy. Listing goals is one query and
+O(goals) work however long their histories are.
+
+A goal with fewer than two recorded balances, or whose history spans less
+than a day, has no rate yet: one balance carried forward to today is a flat
+line, not a pace. It is judged by comparing progress with the time elapsed
+since it was created, as before.
+"""
+
+import math
+from datetime import date, datetime, timedelta, timezone
+
+import numpy as np
+from sqlalchemy import Float, Integer, bindparam, cast, func, select
 from sqlalchemy.orm import Session
 
 from app.models.goal import Goal
+from app.models.goal_contribution import GoalContribution
+from app.services.money import from_cents, to_cents
+
+AVERAGE_MONTH_DAYS = 365.25 / 12
+Z_90 = 1.645  # two-sided 90% band, normal approximation
+MIN_HISTORY_DAYS = 1.0
+MAX_FORECAST_DAYS = 100 * 365
+
+_user_id = bindparam("user_id")
+# Times are in days relative to now, which keeps the sums small and exact
+# enough for the regression.
+_days = (cast(func.extract("epoch", GoalContribution.recorded_at), Float) - bindparam("now", type_=Float)) / 86400
+_balance = cast(GoalContribution.balance, Float)
+
+_CONTRIBUTION_SUMS = (
+    select(
+        GoalContribution.goal_id,
+        func.count().label("n"),
+        func.min(_days).label("first"),
+        func.sum(_days).label("t"),
+        func.sum(_balance).label("y"),
+        func.sum(_days * _days).label("tt"),
+        func.sum(_days * _balance).label("ty"),
+        func.sum(_balance * _balance).label("yy"),
+    )
+    .where(GoalContribution.user_id == _user_id)
+    .group_by(GoalContribution.goal_id)
+    .subquery()
+)
+SUM_COLUMNS = ("n", "first", "t", "y", "tt", "ty", "yy")
+
+_GOALS_WITH_SUMS = (
+    select(Goal, *(_CONTRIBUTION_SUMS.c[name] for name in SUM_COLUMNS))
+    .outerjoin(_CONTRIBUTION_SUMS, _CONTRIBUTION_SUMS.c.goal_id == Goal.id)
+    .where(Goal.user_id == _user_id)
+    .order_by(Goal.created_at.desc())
+)
+_GOALS_PAGE = _GOALS_WITH_SUMS.offset(bindparam("offset", type_=Integer)).limit(bindparam("limit", type_=Integer))
+_GOAL_SUMS = select(*(_CONTRIBUTION_SUMS.c[name] for name in SUM_COLUMNS)).where(
+    _CONTRIBUTION_SUMS.c.goal_id == bindparam("goal_id")
+)
+
+
+def _params(user_id, **extra) -> dict:
+    return {"user_id": user_id, "now": datetime.now(timezone.utc).timestamp(), **extra}
+
+
+def record_opening_balance(db: Session, goal: Goal) -> None:
+    """Add the ledger entry for a new goal's starting balance, even when it is zero.
 
+    Like the opening row migration 009 backfills, it gives the first real
+    contribution a starting point to fit a pace from.
+    """
+    db.add(GoalContribution(goal=goal, user_id=goal.user_id, amount=goal.current_amount, balance=goal.current_amount))
 
-def calculate_goal_forecast(goal: Goal) -> dict:
-    """Calculate if a goal is on track based on current progress and time remaining."""
-    if not goal.target_date or float(goal.target_amount) == 0:
-        return {"on_track": None, "monthly_needed": None, "projected_completion": None}
 
-    progress_pct = float(goal.current_amount) / float(goal.target_amount) * 100
-    days_left = (goal.target_date - date.today()).days
-    months_left = max(days_left / 30, 1)
-    remaining = float(goal.target_amount) - float(goal.current_amount)
-    monthly_needed = remaining / months_left if months_left > 0 else remaining
+def record_contribution(db: Session, goal: Goal, previous_amount) -> None:
+    """Add a ledger entry when *goal*'s ``current_amount`` differs from *previous_amount*."""
+    delta = to_cents(goal.current_amount) - to_cents(previous_amount)
+    if delta:
+        db.add(
+            GoalContribution(
+                goal=goal, user_id=goal.user_id, amount=from_cents(delta), balance=goal.current_amount
+            )
+        )
 
-    # Time-based progress check: are we on pace?
+
+def _days_until(today: date, days: float) -> date | None:
+    if not math.isfinite(days) or days > MAX_FORECAST_DAYS:
+        return None
+    return today + timedelta(days=max(round(days), 0))
+
+
+def _pace_on_track(goal: Goal, progress_pct: float, days_left: int) -> bool:
+    """Progress against the share of time elapsed since the goal was created."""
     total_days = (goal.target_date - goal.created_at.date()).days if goal.created_at else days_left
     expected_progress = ((total_days - days_left) / total_days * 100) if total_days > 0 else 0
-    on_track = progress_pct >= expected_progress * 0.8  # 80% of expected pace
+    return progress_pct >= expected_progress * 0.8  # 80% of expected pace
+
+
+def forecast_goals(goals: list[Goal], sums: list, today: date | None = None) -> list[dict]:
+    """Forecasts for *goals*, given each goal's contribution sums (``SUM_COLUMNS``, or Nones)."""
+    today = today or date.today()
+    if not goals:
+        return []
+    stats = np.array([[value or 0 for value in row] for row in sums], dtype=float).reshape(len(goals), len(SUM_COLUMNS))
+    n, first, st, sy, stt, sty, syy = stats.T
+    target = np.array([float(g.target_amount) for g in goals])
+    current = np.array([float(g.current_amount or 0) for g in goals])
+
+    fitted = (n >= 2) & (-first >= MIN_HISTORY_DAYS)
+    # Today's balance is one more point, at t = 0.
+    n = n + 1
+    sy = sy + current
+    syy = syy + current * current
+    sxx = stt - st * st / n
+    sxy = sty - st * sy / n
+    residual_ss = syy - sy * sy / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(fitted, sxy / sxx, np.nan)
+        slope_se = np.where(fitted & (n > 2), np.sqrt(np.maximum(residual_ss - rate * sxy, 0) / (n - 2) / sxx), np.nan)
+        remaining = target - current
+        done = remaining <= 0
+        projected = np.where(done, 0, np.where(rate > 0, remaining / rate, np.inf))
+        low_rate, high_rate = rate - Z_90 * slope_se, rate + Z_90 * slope_se
+        earliest = np.where(done, 0, np.where(high_rate > 0, remaining / high_rate, np.inf))
+        latest = np.where(done, 0, np.where(low_rate > 0, remaining / low_rate, np.inf))
+        progress = np.where(target > 0, current / target * 100, 0)
+
+    results = []
+    for i, goal in enumerate(goals):
+        if target[i] <= 0:
+            results.append({"on_track": None, "monthly_needed": None, "projected_completion": None})
+            continue
+        forecast = {
+            "progress_pct": round(float(progress[i]), 1),
+            "monthly_rate": round(float(rate[i]) * AVERAGE_MONTH_DAYS, 2) if fitted[i] else None,
+            "projected_completion": _days_until(today, projected[i]) if fitted[i] or done[i] else None,
+            "completion_earliest": _days_until(today, earliest[i]) if np.isfinite(slope_se[i]) or done[i] else None,
+            "completion_latest": _days_until(today, latest[i]) if np.isfinite(slope_se[i]) or done[i] else None,
+            "on_track": None,
+            "monthly_needed": None,
+            "days_remaining": None,
+        }
+        if goal.target_date:
+            days_left = (goal.target_date - today).days
+            months_left = max(days_left / AVERAGE_MONTH_DAYS, 1)
+            forecast["days_remaining"] = days_left
+            forecast["monthly_needed"] = round(max(float(remaining[i]), 0) / months_left, 2)
+            if done[i]:
+                forecast["on_track"] = True
+            elif fitted[i]:
+                projected_date = forecast["projected_completion"]
+                forecast["on_track"] = projected_date is not None and projected_date <= goal.target_date
+            else:
+                forecast["on_track"] = _pace_on_track(goal, forecast["progress_pct"], days_left)
+        results.append(forecast)
+    return results
+
+
+def calculate_goal_forecast(db: Session, goal: Goal) -> dict:
+    """The forecast of a single goal."""
+    sums = db.execute(_GOAL_SUMS, _params(goal.user_id, goal_id=goal.id)).first()
+    return forecast_goals([goal], [sums or (None,) * len(SUM_COLUMNS)])[0]
+
 
-    return {
-        "on_track": on_track,
-        "progress_pct": round(progress_pct, 1),
-        "monthly_needed": round(monthly_needed, 2),
-        "days_remaining": days_left,
-    }
+def list_goals_with_forecasts(db: Session, user_id, limit: int, offset: int) -> list[tuple[Goal, dict]]:
+    """A page of the user's goals, newest first, each with its forecast; one query."""
+    rows = db.execute(_GOALS_PAGE, _params(user_id, limit=limit, offset=offset)).all()
+    goals = [row[0] for row in rows]
+    return list(zip(goals, forecast_goals(goals, [row[1:] for row in rows])))
 
 
 def get_goals_with_forecasts(db: Session, user_id) -> list[dict]:
-    goals = db.query(Goal).filter(Goal.user_id == user_id).all()
+    rows = db.execute(_GOALS_WITH_SUMS, _params(user_id)).all()
+    goals = [row[0] for row in rows]
     results = []
-    for g in goals:
-        forecast = calculate_goal_forecast(g)
+    for g, forecast in zip(goals, forecast_goals(goals, [row[1:] for row in rows])):
         results.append({
             "id": str(g.id),
             "title": g.title,
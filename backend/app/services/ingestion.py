@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.models.transaction import Transaction, TransactionType
+from app.profiling import profiled
 
 logger = logging.getLogger("finpulse.ingestion")
 
@@ -83,6 +84,7 @@ def parse_csv_transactions(file_content: bytes, account_id: UUID, user_id: UUID)
     return transactions
 
 
+@profiled("bulk_insert_transactions")
 def bulk_insert_transactions(db: Session, transactions: list[dict]) -> int:
     """Insert parsed transactions into the database, skipping duplicates. Returns count inserted."""
     if not transactions:
@@ -92,12 +94,17 @@ def bulk_insert_transactions(db: Session, transactions: list[dict]) -> int:
     user_id = transactions[0]["user_id"]
     account_id = transactions[0]["account_id"]
 
-    # Find existing transactions to detect duplicates
+    # Find existing transactions to detect duplicates. The hash includes the
+    # date, so only the file's date range can match (and only those monthly
+    # partitions are scanned).
+    dates = [t["date"] for t in transactions]
     existing = (
         db.query(Transaction)
         .filter(
             Transaction.user_id == user_id,
             Transaction.account_id == account_id,
+            Transaction.date >= min(dates),
+            Transaction.date <= max(dates),
         )
         .all()
     )
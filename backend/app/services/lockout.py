@@ -0,0 +1,266 @@
+"""Failed-login lockout stores.
+
+Failures are tracked with a sliding-window counter: each key keeps the count
+for the current fixed window and the previous one, and the effective count is
+the previous window weighted by how much of it still overlaps the sliding
+window. That is O(1) memory per key regardless of how many attempts are made.
+"""
+
+import hashlib
+import logging
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.config import settings
+from app.models.login_failure import LoginFailure
+
+logger = logging.getLogger("finpulse.lockout")
+
+
+def _normalize_key(email: str) -> str:
+    return (email or "").strip().lower()
+
+
+def _estimate(window_index: int, prev_count: int, curr_count: int, now: float, window_seconds: int) -> float:
+    """Weighted sliding-window estimate for a counter last written in *window_index*."""
+    current_index = int(now // window_seconds)
+    if window_index == current_index:
+        prev, curr = prev_count, curr_count
+    elif window_index == current_index - 1:
+        prev, curr = curr_count, 0
+    else:
+        return 0.0
+    elapsed_fraction = (now % window_seconds) / window_seconds
+    return prev * (1 - elapsed_fraction) + curr
+
+
+class LockoutStore(ABC):
+    def __init__(self, window_seconds: int):
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    def failure_count(self, email: str) -> float:
+        """Return the sliding-window failure count for *email*."""
+
+    @abstractmethod
+    def record_failure(self, email: str) -> float:
+        """Record one failed attempt and return the updated count."""
+
+    @abstractmethod
+    def reset(self, email: str) -> None:
+        """Forget all failures for *email* (e.g. after a successful login)."""
+
+
+def _advance(entry: tuple[int, int, int] | None, current_index: int) -> tuple[int, int, int]:
+    """*entry* with one more failure recorded in window *current_index*."""
+    prev, curr = 0, 0
+    if entry is not None:
+        window_index, prev, curr = entry
+        if window_index == current_index - 1:
+            prev, curr = curr, 0
+        elif window_index != current_index:
+            prev, curr = 0, 0
+    return (current_index, prev, curr + 1)
+
+
+class InMemoryLockoutStore(LockoutStore):
+    """Per-process store with time-based eviction and a hard cap on tracked keys.
+
+    Live counters are never evicted to make room: that would let an attacker
+    flush a victim's counter by spraying throwaway addresses. Once the cap is
+    reached, failures for untracked keys go to a small count-min sketch of
+    ``OVERFLOW_DEPTH`` rows of ``OVERFLOW_WIDTH`` windowed counters, indexed by
+    a per-process keyed hash. An untracked key reads the smallest of its own
+    buckets, so a spray only inflates the keys that collide with it in every
+    row rather than locking out everyone.
+    """
+
+    OVERFLOW_WIDTH = 4096
+    OVERFLOW_DEPTH = 2
+
+    def __init__(self, window_seconds: int, max_entries: int, clock=time.monotonic):
+        super().__init__(window_seconds)
+        self.max_entries = max(max_entries, 1)
+        self._clock = clock
+        self._lock = threading.Lock()
+        # key -> (window_index, prev_count, curr_count), oldest write first
+        self._entries: OrderedDict[str, tuple[int, int, int]] = OrderedDict()
+        # Random per process, so addresses cannot be chosen to hit a victim's buckets.
+        self._overflow_salt = secrets.token_bytes(16)
+        self._overflow: list[list[tuple[int, int, int] | None]] = [
+            [None] * self.OVERFLOW_WIDTH for _ in range(self.OVERFLOW_DEPTH)
+        ]
+        self._overflow_warned_window = -1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict_expired(self, now: float) -> None:
+        # Entries are ordered by last write, so expired ones sit at the front.
+        expired_before = int(now // self.window_seconds) - 1
+        while self._entries:
+            key, (window_index, _, _) = next(iter(self._entries.items()))
+            if window_index >= expired_before:
+                break
+            self._entries.popitem(last=False)
+
+    def _buckets(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), key=self._overflow_salt, digest_size=8 * self.OVERFLOW_DEPTH).digest()
+        return [int.from_bytes(digest[8 * row : 8 * row + 8], "big") % self.OVERFLOW_WIDTH for row in range(self.OVERFLOW_DEPTH)]
+
+    def _overflow_estimate(self, key: str, now: float) -> float:
+        return min(
+            _estimate(*entry, now, self.window_seconds) if entry is not None else 0.0
+            for entry in (row[bucket] for row, bucket in zip(self._overflow, self._buckets(key)))
+        )
+
+    def failure_count(self, email: str) -> float:
+        key = _normalize_key(email)
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._overflow_estimate(key, now)
+        return _estimate(*entry, now, self.window_seconds)
+
+    def record_failure(self, email: str) -> float:
+        key = _normalize_key(email)
+        now = self._clock()
+        current_index = int(now // self.window_seconds)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                self._evict_expired(now)
+                if len(self._entries) >= self.max_entries:
+                    if self._overflow_warned_window != current_index:
+                        self._overflow_warned_window = current_index
+                        logger.warning("Lockout store full (%d keys); counting new keys in shared buckets", self.max_entries)
+                    for row, bucket in zip(self._overflow, self._buckets(key)):
+                        row[bucket] = _advance(row[bucket], current_index)
+                    return self._overflow_estimate(key, now)
+            entry = _advance(entry, current_index)
+            self._entries[key] = entry
+        return _estimate(*entry, now, self.window_seconds)
+
+    def reset(self, email: str) -> None:
+        with self._lock:
+            self._entries.pop(_normalize_key(email), None)
+
+
+class DatabaseLockoutStore(LockoutStore):
+    """Store shared by every worker via the ``login_failures`` table.
+
+    Keys are SHA-256 hashes so sprayed addresses are never persisted. Each
+    operation uses its own short-lived session so it never interferes with the
+    caller's unit of work.
+    """
+
+    SWEEP_INTERVAL_SECONDS = 300
+
+    def __init__(self, window_seconds: int, session_factory=None, clock=time.time):
+        super().__init__(window_seconds)
+        if session_factory is None:
+            from app.database import SessionLocal
+
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+        self._clock = clock
+        self._last_sweep = 0.0
+        self._sweep_lock = threading.Lock()
+
+    @staticmethod
+    def _key_hash(email: str) -> str:
+        return hashlib.sha256(_normalize_key(email).encode("utf-8")).hexdigest()
+
+    def failure_count(self, email: str) -> float:
+        with self._session_factory() as db:
+            row = db.execute(
+                select(LoginFailure.window_index, LoginFailure.prev_count, LoginFailure.curr_count)
+                .where(LoginFailure.key_hash == self._key_hash(email))
+            ).first()
+        if row is None:
+            return 0.0
+        return _estimate(row.window_index, row.prev_count, row.curr_count, self._clock(), self.window_seconds)
+
+    def record_failure(self, email: str) -> float:
+        now = self._clock()
+        current_index = int(now // self.window_seconds)
+        table = LoginFailure.__table__
+        stmt = insert(table).values(
+            key_hash=self._key_hash(email),
+            window_index=current_index,
+            prev_count=0,
+            curr_count=1,
+            updated_at=datetime.now(timezone.utc),
+        )
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key_hash],
+            set_={
+                "prev_count": case(
+                    (table.c.window_index == excluded.window_index, table.c.prev_count),
+                    (table.c.window_index == excluded.window_index - 1, table.c.curr_count),
+                    else_=0,
+                ),
+                "curr_count": case(
+                    (table.c.window_index == excluded.window_index, table.c.curr_count + 1),
+                    else_=1,
+                ),
+                "window_index": excluded.window_index,
+                "updated_at": excluded.updated_at,
+            },
+        ).returning(table.c.window_index, table.c.prev_count, table.c.curr_count)
+
+        with self._session_factory() as db:
+            row = db.execute(stmt).one()
+            db.commit()
+        self._maybe_sweep(now)
+        return _estimate(row.window_index, row.prev_count, row.curr_count, now, self.window_seconds)
+
+    def reset(self, email: str) -> None:
+        with self._session_factory() as db:
+            db.execute(delete(LoginFailure).where(LoginFailure.key_hash == self._key_hash(email)))
+            db.commit()
+
+    def _maybe_sweep(self, now: float) -> None:
+        # Claim the sweep under the lock so concurrent failures run it once.
+        with self._sweep_lock:
+            if now - self._last_sweep < self.SWEEP_INTERVAL_SECONDS:
+                return
+            self._last_sweep = now
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.window_seconds * 2)
+        try:
+            with self._session_factory() as db:
+                db.execute(delete(LoginFailure).where(LoginFailure.updated_at < cutoff))
+                db.commit()
+        except Exception:
+            logger.exception("Failed to sweep expired login failure counters")
+
+
+_store: LockoutStore | None = None
+_store_lock = threading.Lock()
+
+
+def build_lockout_store(window_seconds: int) -> LockoutStore:
+    backend = (settings.lockout_backend or "memory").strip().lower()
+    if backend == "database":
+        return DatabaseLockoutStore(window_seconds)
+    if backend != "memory":
+        logger.warning("Unknown LOCKOUT_BACKEND %r; falling back to in-memory store", backend)
+    return InMemoryLockoutStore(window_seconds, settings.lockout_max_entries)
+
+
+def get_lockout_store(window_seconds: int) -> LockoutStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = build_lockout_store(window_seconds)
+    return _store
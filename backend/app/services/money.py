@@ -0,0 +1,39 @@
+"""Money as integer cents.
+
+Amounts are stored as ``Numeric(12, 2)``. Summing them as floats accumulates
+binary rounding error, and summing them as ``Decimal`` is slow, so the
+financial engines work in integer cents: each amount is converted once when
+it is loaded and all arithmetic after that is exact ``int`` arithmetic.
+Dollars come back out with ``from_cents`` only when a payload is built.
+
+Transaction amounts, which are the bulk of the work, are converted by the
+database: ``cents(Transaction.amount)`` selects ``round(amount * 100)`` as a
+``BIGINT``, which the driver returns as a plain ``int``.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import BigInteger, cast, func
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def cents(column) -> ColumnElement[int]:
+    """A money column as whole cents, computed in SQL."""
+    # round() first: SQLite keeps Numeric as REAL and a bare cast truncates.
+    return cast(func.round(column * 100), BigInteger)
+
+
+def to_cents(value) -> int:
+    """Whole cents of a dollar amount loaded as ``Decimal``, float or int."""
+    if value is None:
+        return 0
+    if isinstance(value, int):
+        return value * 100
+    if isinstance(value, Decimal):
+        return int(value.scaleb(2).to_integral_value())
+    return round(value * 100)
+
+
+def from_cents(amount: int) -> float:
+    """Dollars for a payload; the nearest float to the exact cent value."""
+    return amount / 100
@@ -1,12 +1,15 @@
 import logging
 import smtplib
 import ssl
+import threading
+import time
 from datetime import date
 from email.message import EmailMessage
 
 from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.metrics import observe_email_send
 from app.models.user import User
 from app.services.financial import build_dashboard_summary
 
@@ -53,7 +56,7 @@ def build_weekly_summary_text(db: Session, user: User) -> str:
         lines.append("Upcoming bills:")
         for bill in upcoming_bills[:3]:
             lines.append(
-                f"- {bill['description']} ({bill['due_date']}): ${float(bill['amount']):,.2f}"
+                f"- {bill['description'] or bill['category']} ({bill['next_due_date']}): ${float(bill['amount']):,.2f}"
             )
         lines.append("")
 
@@ -71,26 +74,168 @@ def build_weekly_summary_text(db: Session, user: User) -> str:
     return "\n".join(lines)
 
 
-def send_notification_email(to_email: str, subject: str, body: str) -> bool:
-    if not settings.smtp_host or not settings.smtp_from_email:
-        logger.info("SMTP not configured; skipping email send to %s", to_email)
-        logger.info("Email subject: %s", subject)
-        logger.info("Email body preview: %s", body[:300])
-        return False
+def build_weekly_summary_subject(user: User) -> str:
+    weekday = WEEKDAY_LABELS[int(user.weekly_summary_day) % 7]
+    return (
+        f"FinPulse Weekly Snapshot - {weekday} "
+        f"{int(user.weekly_summary_hour):02d}:00 {user.notification_timezone}"
+    )
 
+
+class _PooledSMTPConnection:
+    def __init__(self, server: smtplib.SMTP, now: float):
+        self.server = server
+        self.messages_sent = 0
+        self.last_used = now
+
+
+def _open_smtp_connection() -> smtplib.SMTP:
+    server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=settings.smtp_timeout_seconds)
+    try:
+        if settings.smtp_use_tls:
+            server.starttls(context=ssl.create_default_context())
+        if settings.smtp_username and settings.smtp_password:
+            server.login(settings.smtp_username, settings.smtp_password)
+    except Exception:
+        server.close()
+        raise
+    return server
+
+
+class SMTPConnectionPool:
+    """Reuse authenticated SMTP sessions across messages.
+
+    Opening a session costs a TCP connect, STARTTLS and AUTH; a pooled session
+    sends up to ``max_messages_per_connection`` messages before it is recycled.
+    Idle sessions older than ``idle_seconds`` are closed rather than reused,
+    since servers drop quiet clients.
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        max_messages_per_connection: int,
+        idle_seconds: float,
+        connect=_open_smtp_connection,
+        clock=time.monotonic,
+    ):
+        self.max_messages_per_connection = max(max_messages_per_connection, 1)
+        self.idle_seconds = idle_seconds
+        self._connect = connect
+        self._clock = clock
+        self._slots = threading.BoundedSemaphore(max(max_connections, 1))
+        self._idle: list[_PooledSMTPConnection] = []
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.messages_sent = 0
+
+    def _checkout(self) -> _PooledSMTPConnection:
+        now = self._clock()
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if now - conn.last_used < self.idle_seconds:
+                    return conn
+                self._close(conn)
+            self.connections_opened += 1
+        return _PooledSMTPConnection(self._connect(), now)
+
+    def _checkin(self, conn: _PooledSMTPConnection) -> None:
+        conn.last_used = self._clock()
+        if conn.messages_sent >= self.max_messages_per_connection:
+            self._close(conn)
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    @staticmethod
+    def _close(conn: _PooledSMTPConnection) -> None:
+        try:
+            conn.server.quit()
+        except Exception:
+            conn.server.close()
+
+    def send(self, message: EmailMessage) -> None:
+        """Send *message* on a pooled session, retrying once if the session went stale."""
+        started = time.perf_counter()
+        sent = False
+        try:
+            self._send(message)
+            sent = True
+        finally:
+            observe_email_send(time.perf_counter() - started, sent)
+
+    def _send(self, message: EmailMessage) -> None:
+        with self._slots:
+            for attempt in range(2):
+                conn = self._checkout()
+                try:
+                    conn.server.send_message(message)
+                except smtplib.SMTPServerDisconnected:
+                    conn.server.close()
+                    if attempt == 0:
+                        continue
+                    raise
+                except Exception:
+                    self._close(conn)
+                    raise
+                conn.messages_sent += 1
+                with self._lock:
+                    self.messages_sent += 1
+                self._checkin(conn)
+                return
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self._close(conn)
+
+
+_smtp_pool: SMTPConnectionPool | None = None
+_smtp_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    global _smtp_pool
+    if _smtp_pool is None:
+        with _smtp_pool_lock:
+            if _smtp_pool is None:
+                _smtp_pool = SMTPConnectionPool(
+                    max_connections=settings.smtp_pool_size,
+                    max_messages_per_connection=settings.smtp_max_messages_per_connection,
+                    idle_seconds=settings.smtp_idle_seconds,
+                )
+    return _smtp_pool
+
+
+def close_smtp_pool() -> None:
+    if _smtp_pool is not None:
+        _smtp_pool.close_all()
+
+
+def smtp_configured() -> bool:
+    return bool(settings.smtp_host and settings.smtp_from_email)
+
+
+def build_email_message(to_email: str, subject: str, body: str) -> EmailMessage:
     message = EmailMessage()
     message["From"] = settings.smtp_from_email
     message["To"] = to_email
     message["Subject"] = subject
     message.set_content(body)
+    return message
+
+
+def send_notification_email(to_email: str, subject: str, body: str) -> bool:
+    if not smtp_configured():
+        logger.info("SMTP not configured; skipping email send to %s", to_email)
+        logger.info("Email subject: %s", subject)
+        logger.info("Email body preview: %s", body[:300])
+        return False
 
     try:
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=20) as server:
-            if settings.smtp_use_tls:
-                server.starttls(context=ssl.create_default_context())
-            if settings.smtp_username and settings.smtp_password:
-                server.login(settings.smtp_username, settings.smtp_password)
-            server.send_message(message)
+        get_smtp_pool().send(build_email_message(to_email, subject, body))
         logger.info("Notification email sent to %s", to_email)
         return True
     except Exception:
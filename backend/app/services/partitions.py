@@ -0,0 +1,207 @@
+"""Maintenance of the monthly ``transactions`` partitions.
+
+``transactions`` is range-partitioned on ``date``, one partition per calendar
+month, with a ``transactions_default`` partition catching anything outside the
+existing ranges. With ``TRANSACTION_HASH_PARTITIONS`` set, each new month is
+further split by ``hash(user_id)`` so a single month of a large tenant base
+stays vacuum- and index-friendly. Queries that bound ``date`` (the dashboard,
+weekly review and ranged transaction lists) only touch the matching months.
+
+``ensure_transaction_partitions`` keeps partitions created
+``TRANSACTION_PARTITION_MONTHS_AHEAD`` months in advance and moves any rows
+that landed in the default partition (back-dated CSV imports) into a
+partition of their own, within ``MAX_MONTHS_BACK`` months back and the
+months-ahead horizon. It takes an advisory lock so several processes can run
+it concurrently.
+
+Moving default-partition rows runs without a statement timeout and holds
+table locks while it does, so the supported way to run maintenance is
+``python -m app.services.partitions``, on a schedule (cron or a release step
+after ``alembic upgrade head``) rather than inside the API. The in-process
+thread, ``TRANSACTION_PARTITION_MAINTENANCE_ENABLED``, is off by default.
+"""
+
+import logging
+import threading
+from datetime import date
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.utils.dates import add_months, month_start
+
+logger = logging.getLogger("finpulse.partitions")
+
+TABLE = "transactions"
+
+# pg_advisory_xact_lock key shared by every process maintaining partitions.
+_LOCK_KEY = 7_310_420_038
+
+# Months before this are left to the default partition; a stray 1970 date in
+# an import should not create fifty years of empty partitions.
+MAX_MONTHS_BACK = 120
+
+_preparer = postgresql.dialect().identifier_preparer
+
+
+def partition_name(month: date, table: str = TABLE) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def _quote(name: str) -> str:
+    """*name*, optionally schema-qualified, quoted for DDL where Postgres requires it."""
+    return ".".join(_preparer.quote(part) for part in name.split("."))
+
+
+def partition_statements(month: date, hash_partitions: int = 0, table: str = TABLE) -> list[str]:
+    """DDL that adds *month*'s partition to *table*, taking over its rows from the default.
+
+    The partition is built detached, filled from ``<table>_default`` and then
+    attached, so it also works when the default already holds rows for that
+    month (a plain ``CREATE TABLE ... PARTITION OF`` would fail).
+    """
+    name = partition_name(month, table)
+    partition, parent, default = _quote(name), _quote(table), _quote(f"{table}_default")
+    start, end = month.isoformat(), add_months(month, 1).isoformat()
+    create = f"CREATE TABLE {partition} (LIKE {parent} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    statements = [create + (" PARTITION BY HASH (user_id)" if hash_partitions > 0 else "")]
+    statements += [
+        f"CREATE TABLE {_quote(f'{name}_h{remainder}')} PARTITION OF {partition} "
+        f"FOR VALUES WITH (MODULUS {hash_partitions}, REMAINDER {remainder})"
+        for remainder in range(hash_partitions)
+    ]
+    statements += [
+        f"WITH moved AS (DELETE FROM {default} WHERE date >= '{start}' AND date < '{end}' RETURNING *) "
+        f"INSERT INTO {partition} SELECT * FROM moved",
+        f"ALTER TABLE {parent} ATTACH PARTITION {partition} FOR VALUES FROM ('{start}') TO ('{end}')",
+    ]
+    return statements
+
+
+def _existing_partitions(db: Session, table: str) -> set[str]:
+    return set(
+        db.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        )
+    )
+
+
+def _months_in_default(db: Session, table: str) -> set[date]:
+    return set(db.scalars(text(f"SELECT DISTINCT CAST(date_trunc('month', date) AS date) FROM {_quote(f'{table}_default')}")))
+
+
+def wanted_months(today: date, months_ahead: int, default_months: set[date]) -> set[date]:
+    """The next *months_ahead* months plus those default-partition months worth a partition.
+
+    Default rows only get a partition inside the window migration 008 created
+    (``MAX_MONTHS_BACK`` back to *months_ahead* ahead); a date like 9999-12-31
+    stays in the default rather than failing every run.
+    """
+    first = add_months(month_start(today), -MAX_MONTHS_BACK)
+    last = add_months(month_start(today), months_ahead)
+    wanted = {add_months(month_start(today), n) for n in range(months_ahead + 1)}
+    return wanted | {month for month in default_months if first <= month <= last}
+
+
+def ensure_transaction_partitions(
+    db: Session,
+    today: date | None = None,
+    months_ahead: int | None = None,
+    hash_partitions: int | None = None,
+) -> list[str]:
+    """Create missing monthly partitions and return their names."""
+    if db.get_bind().dialect.name != "postgresql":
+        return []
+    today = today or date.today()
+    months_ahead = settings.transaction_partition_months_ahead if months_ahead is None else months_ahead
+    hash_partitions = settings.transaction_hash_partitions if hash_partitions is None else hash_partitions
+
+    if db.scalar(text("SELECT to_regclass(:name)"), {"name": f"{TABLE}_default"}) is None:
+        return []  # not partitioned yet (migration 008 pending)
+    # Moving rows may outlast the API statement timeout. lock_timeout is set
+    # after taking the advisory lock: it bounds how long the DDL can stall
+    # queries queued behind its table locks, not how long we wait our turn.
+    db.execute(text("SET LOCAL statement_timeout = 0"))
+    db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _LOCK_KEY})
+    db.execute(text("SET LOCAL lock_timeout = '5s'"))
+    existing = _existing_partitions(db, TABLE)
+    wanted = wanted_months(today, months_ahead, _months_in_default(db, TABLE))
+
+    created = []
+    for month in sorted(wanted):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        for statement in partition_statements(month, hash_partitions):
+            db.execute(text(statement))
+        created.append(name)
+    db.commit()
+    if created:
+        logger.info("Created transaction partitions: %s", ", ".join(created))
+    return created
+
+
+def maintain_partitions() -> list[str]:
+    db = SessionLocal()
+    try:
+        return ensure_transaction_partitions(db)
+    finally:
+        db.close()
+
+
+class PartitionMaintenance:
+    """Background thread that runs ``maintain_partitions`` on an interval."""
+
+    def __init__(self, interval_seconds: float, maintain=maintain_partitions):
+        self.interval_seconds = interval_seconds
+        self._maintain = maintain
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._maintain()
+            except Exception:
+                logger.exception("Transaction partition maintenance failed")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="partition-maintenance", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+
+maintenance = PartitionMaintenance(settings.transaction_partition_maintenance_interval_seconds)
+
+
+def start_partition_maintenance() -> None:
+    if settings.transaction_partition_maintenance_enabled and settings.effective_database_url.startswith("postgresql"):
+        maintenance.start()
+
+
+def stop_partition_maintenance() -> None:
+    maintenance.stop()
+
+
+if __name__ == "__main__":
+    from app.logging_config import setup_logging
+
+    setup_logging()
+    print(maintain_partitions())
@@ -0,0 +1,281 @@
+"""Monte Carlo projections of net worth and goal attainment.
+
+``load_projection_inputs`` gathers everything a projection depends on into a
+``ProjectionInputs`` of plain ints, strings and dates: account balances,
+investment values and monthly contributions, the recurring expense schedule,
+installment payments and the last twelve complete months of income and
+spending. ``simulate`` then advances every path one calendar month at a time:
+
+* income is drawn each month from a normal fit to the income history, floored
+  at zero, so an irregular income widens the bands;
+* investments earn lognormal monthly returns and receive the contributions;
+* spending is the average of the history, but never less than the recurring
+  expense schedule, and installments are paid until they run out;
+* whatever is left over accumulates as cash.
+
+Net worth is cash plus investments less card balances and the installments
+still owed. All paths advance together as rows of NumPy arrays, and
+investment values use the closed form of the contribution recurrence over
+cumulative returns instead of a loop over months.
+
+A goal is attained on a path when the growth of cash plus investments by its
+target date covers what is still needed. Goals without a target date, or with
+one beyond the horizon, are judged at the end of the horizon. Each goal is
+judged on its own, as if all savings went to it.
+
+Simulating is CPU-bound and would hold the GIL on a thread, so requests run
+it on a process pool. Results are cached per user and hash of the inputs, so
+the same data on the same day is simulated once; the seed comes from the same
+hash, so a result does not change when its cache entry is evicted.
+"""
+
+import asyncio
+import hashlib
+import math
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.account import Account
+from app.models.credit_card import CreditCard
+from app.models.expense import Expense
+from app.models.goal import Goal
+from app.models.installment_plan import InstallmentPlan
+from app.models.investment import Investment
+from app.models.transaction import TransactionType
+from app.models.user import User
+from app.services.columnar import load_transactions
+from app.services.financial import _normalize_to_monthly
+from app.services.money import from_cents, to_cents
+from app.services.queries import rows_for_user
+from app.utils.dates import add_months, month_start
+
+HISTORY_MONTHS = 12
+MAX_YEARS = 30
+EXPECTED_ANNUAL_RETURN = 0.06
+ANNUAL_VOLATILITY = 0.15
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class ProjectionGoal(NamedTuple):
+    id: str
+    title: str
+    needed: int  # cents still to save
+    target_date: date | None
+
+
+class ProjectionInputs(NamedTuple):
+    start: date
+    cash: int
+    invested: int
+    card_debt: int
+    monthly_contribution: int
+    recurring_monthly: int
+    installments: tuple[tuple[int, int], ...]  # (monthly payment, payments left)
+    income_history: tuple[int, ...]  # monthly totals, oldest first
+    spending_history: tuple[int, ...]
+    goals: tuple[ProjectionGoal, ...]
+
+
+def load_projection_inputs(db: Session, user: User, today: date | None = None) -> ProjectionInputs:
+    """Everything a projection of *user*'s finances depends on, in cents."""
+    today = today or date.today()
+    first_month = add_months(month_start(today), -HISTORY_MONTHS)
+    month_starts = [add_months(first_month, n) for n in range(HISTORY_MONTHS + 1)]
+    transactions = load_transactions(db, user.id, first_month, month_starts[-1] - timedelta(days=1))
+    income = transactions.monthly_totals(TransactionType.CREDIT, month_starts)
+    spending = transactions.monthly_totals(TransactionType.DEBIT, month_starts)
+    # Months before the user's first transaction are not months without income.
+    while income and not income[0] and not spending[0]:
+        income.pop(0)
+        spending.pop(0)
+
+    accounts = rows_for_user(db, Account, user.id)
+    investments = rows_for_user(db, Investment, user.id)
+    return ProjectionInputs(
+        start=today,
+        cash=sum(to_cents(a.balance) for a in accounts if a.account_type in ("chequing", "savings")),
+        invested=sum(to_cents(i.current_value) for i in investments),
+        card_debt=sum(to_cents(c.current_balance) for c in rows_for_user(db, CreditCard, user.id)),
+        monthly_contribution=sum(to_cents(i.monthly_contribution) for i in investments),
+        recurring_monthly=sum(
+            _normalize_to_monthly(to_cents(e.amount), e.frequency)
+            for e in rows_for_user(db, Expense, user.id)
+            if e.is_recurring
+        ),
+        installments=tuple(
+            (to_cents(ip.monthly_payment), ip.remaining_payments)
+            for ip in rows_for_user(db, InstallmentPlan, user.id)
+            if ip.remaining_payments > 0
+        ),
+        income_history=tuple(income),
+        spending_history=tuple(spending),
+        goals=tuple(
+            ProjectionGoal(
+                id=str(g.id),
+                title=g.title,
+                needed=max(to_cents(g.target_amount) - to_cents(g.current_amount), 0),
+                target_date=g.target_date,
+            )
+            for g in rows_for_user(db, Goal, user.id)
+        ),
+    )
+
+
+def _months_until(start: date, target: date) -> int:
+    """Month ends (firsts of the month) after *start* up to and including *target*."""
+    return max((target.year - start.year) * 12 + target.month - start.month, 0)
+
+
+def simulate(inputs: ProjectionInputs, years: int, paths: int, seed: int) -> dict:
+    """Percentile bands of net worth per year, and each goal's chance of being attained."""
+    rng = np.random.default_rng(seed)
+    months = years * 12
+    month_number = np.arange(1, months + 1)
+
+    income_history = np.array(inputs.income_history, dtype=float)
+    income_mean = income_history.mean() if len(income_history) else 0.0
+    income_sd = income_history.std(ddof=1) if len(income_history) > 1 else 0.0
+    income = np.maximum(rng.normal(income_mean, income_sd, (paths, months)), 0)
+    spending = max(np.mean(inputs.spending_history) if inputs.spending_history else 0.0, inputs.recurring_monthly)
+
+    installments_paid = np.zeros(months)
+    installments_owed = np.zeros(months)
+    for payment, remaining in inputs.installments:
+        installments_paid += np.where(month_number <= remaining, payment, 0)
+        installments_owed += payment * np.maximum(remaining - month_number, 0)
+
+    contribution = inputs.monthly_contribution
+    outgoings = spending + installments_paid + contribution
+    cash = inputs.cash + np.cumsum(income - outgoings, axis=1)
+
+    # V[m] = V[m-1] * g[m] + c, so V[m] = G[m] * (V[0] + c * sum(1 / G[1..m])) with G the cumulative growth.
+    monthly_sd = ANNUAL_VOLATILITY / math.sqrt(12)
+    log_mean = math.log1p(EXPECTED_ANNUAL_RETURN) / 12 - monthly_sd**2 / 2
+    growth = np.exp(np.cumsum(rng.normal(log_mean, monthly_sd, (paths, months)), axis=1))
+    invested = growth * (inputs.invested + contribution * np.cumsum(1 / growth, axis=1))
+
+    year_ends = np.arange(11, months, 12)
+    net_worth = cash[:, year_ends] + invested[:, year_ends] - inputs.card_debt - installments_owed[year_ends]
+    bands = np.percentile(net_worth, PERCENTILES, axis=0)
+
+    first_month = month_start(inputs.start)
+    savings = cash + invested - (inputs.cash + inputs.invested)
+    goals = []
+    for goal in inputs.goals:
+        month = months
+        if goal.target_date is not None:
+            month = min(_months_until(inputs.start, goal.target_date), months)
+        if goal.needed <= 0:
+            probability = 1.0
+        elif month == 0:
+            probability = 0.0
+        else:
+            probability = float(np.mean(savings[:, month - 1] >= goal.needed))
+        goals.append(
+            {
+                "goal_id": goal.id,
+                "title": goal.title,
+                "evaluated_on": add_months(first_month, month),
+                "probability": round(probability, 3),
+            }
+        )
+
+    return {
+        "start": inputs.start,
+        "years": years,
+        "paths": paths,
+        "net_worth": [
+            {
+                "year": year + 1,
+                "date": add_months(first_month, 12 * (year + 1)),
+                **{f"p{pct}": round(from_cents(float(bands[i, year])), 2) for i, pct in enumerate(PERCENTILES)},
+            }
+            for year in range(years)
+        ],
+        "goals": goals,
+    }
+
+
+class ProjectionCache:
+    """Finished projections keyed by ``(user id, input digest)``, least recently used evicted first."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str]) -> dict | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: tuple[str, str], value: dict) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+cache = ProjectionCache(settings.projection_cache_size)
+
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # Spawned rather than forked: the API process runs threads
+                # (log queue, schedulers) that a fork would copy mid-operation.
+                _executor = ProcessPoolExecutor(
+                    max_workers=max(settings.projection_workers, 1),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def start_projection_pool() -> None:
+    _get_executor()
+
+
+def stop_projection_pool() -> None:
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _digest(inputs: ProjectionInputs, years: int, paths: int) -> bytes:
+    return hashlib.sha256(repr((inputs, years, paths)).encode()).digest()
+
+
+async def project(user_id, inputs: ProjectionInputs, years: int) -> dict:
+    """The projection of *inputs* over *years*, from the cache or simulated on the process pool."""
+    paths = settings.projection_paths
+    digest = _digest(inputs, years, paths)
+    key = (str(user_id), digest.hex())
+    result = cache.get(key)
+    if result is None:
+        seed = int.from_bytes(digest[:8], "big")
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_executor(), simulate, inputs, years, paths, seed)
+        cache.put(key, result)
+    return result
@@ -0,0 +1,179 @@
+"""Prebuilt statements for the per-request hot queries.
+
+The dashboard, analysis and weekly-review builders issue the same handful of
+user-scoped queries on every call. Building them once at import with bound
+parameters means a request neither reconstructs the expression tree nor
+recompiles the SQL: SQLAlchemy's compiled cache is keyed on the statement's
+structure and every execution reuses the same entry. On asyncpg the compiled
+SQL is then also a server-side prepared statement (see
+``db_prepared_statement_cache_size``).
+
+Reads of the JSONB documents (review snapshots, analysis ``raw_data``) select
+just the keys they use with ``->>`` so Postgres extracts them server-side and
+the whole document is never shipped or deserialized.
+"""
+
+import uuid
+from datetime import date
+
+from sqlalchemy import Integer, bindparam, select
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.analysis_result import AnalysisResult
+from app.models.credit_card import CreditCard
+from app.models.expense import Expense
+from app.models.goal import Goal
+from app.models.installment_plan import InstallmentPlan
+from app.models.investment import Investment
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.models.weekly_review import WeeklyReview
+from app.services.money import cents
+
+_user_id = bindparam("user_id")
+_limit = bindparam("limit", type_=Integer)
+
+_ROWS_FOR_USER = {
+    model: select(model).where(model.user_id == _user_id)
+    for model in (Account, CreditCard, Expense, Goal, InstallmentPlan, Investment)
+}
+
+_USER_BY_ID = select(User).where(User.id == _user_id)
+
+# Only what the engines aggregate, with the amount already in integer cents
+# (see app.services.money); no ORM objects are built for these rows.
+_TRANSACTIONS_BETWEEN = select(
+    Transaction.transaction_type,
+    Transaction.category,
+    Transaction.description,
+    Transaction.date,
+    cents(Transaction.amount).label("amount_cents"),
+).where(
+    Transaction.user_id == _user_id,
+    Transaction.date >= bindparam("start"),
+    Transaction.date <= bindparam("end"),
+)
+
+_DEBITS_BETWEEN = _TRANSACTIONS_BETWEEN.where(Transaction.transaction_type == TransactionType.DEBIT)
+
+_LATEST_TRANSACTIONS = (
+    select(Transaction)
+    .where(Transaction.user_id == _user_id)
+    .order_by(Transaction.date.desc(), Transaction.created_at.desc())
+    .limit(_limit)
+)
+
+# Keys of a weekly review snapshot, as built by ``_build_weekly_snapshot``.
+WEEKLY_SNAPSHOT_KEYS = (
+    "net_worth",
+    "total_assets",
+    "total_liabilities",
+    "monthly_income",
+    "monthly_expenses",
+    "cash_flow",
+    "credit_utilization_pct",
+    "savings_balance",
+    "weekly_spending",
+    "weekly_income",
+)
+
+_PREVIOUS_NET_WORTH = (
+    select(AnalysisResult.raw_data["net_worth"].as_float().label("net_worth"))
+    .where(AnalysisResult.user_id == _user_id, AnalysisResult.snapshot_date < bindparam("before"))
+    .order_by(AnalysisResult.snapshot_date.desc())
+    .limit(1)
+)
+
+_REVIEW_FOR_WEEK = select(WeeklyReview).where(
+    WeeklyReview.user_id == _user_id, WeeklyReview.week_start == bindparam("week_start")
+)
+
+_REVIEW_BY_ID = select(WeeklyReview).where(
+    WeeklyReview.id == bindparam("review_id"), WeeklyReview.user_id == _user_id
+)
+
+_PREVIOUS_SNAPSHOT = (
+    select(WeeklyReview.snapshot)
+    .where(WeeklyReview.user_id == _user_id, WeeklyReview.week_start < bindparam("before"))
+    .order_by(WeeklyReview.week_start.desc())
+    .limit(1)
+)
+
+_RECENT_ACTIONS = (
+    select(
+        WeeklyReview.action_type,
+        WeeklyReview.snapshot["weekly_spending"].as_float().label("weekly_spending"),
+    )
+    .where(WeeklyReview.user_id == _user_id, WeeklyReview.week_start < bindparam("before"))
+    .order_by(WeeklyReview.week_start.desc())
+    .limit(_limit)
+)
+
+_REVIEW_HISTORY = (
+    select(
+        WeeklyReview.id,
+        WeeklyReview.week_start,
+        WeeklyReview.week_end,
+        WeeklyReview.changes,
+        WeeklyReview.action_type,
+        WeeklyReview.action_title,
+        WeeklyReview.action_detail,
+        WeeklyReview.action_target_amount,
+        WeeklyReview.action_target_name,
+        WeeklyReview.action_status,
+        WeeklyReview.action_completed_at,
+        WeeklyReview.created_at,
+        *(WeeklyReview.snapshot[key].as_float().label(key) for key in WEEKLY_SNAPSHOT_KEYS),
+    )
+    .where(WeeklyReview.user_id == _user_id)
+    .order_by(WeeklyReview.week_start.desc())
+    .limit(_limit)
+)
+
+
+def rows_for_user(db: Session, model, user_id) -> list:
+    """All rows of a user-owned model (accounts, cards, expenses, goals, ...)."""
+    return list(db.scalars(_ROWS_FOR_USER[model], {"user_id": user_id}))
+
+
+def get_user(db: Session, user_id: uuid.UUID) -> User | None:
+    return db.scalars(_USER_BY_ID, {"user_id": user_id}).first()
+
+
+def transactions_between(db: Session, user_id, start: date, end: date, debits_only: bool = False) -> list:
+    """Rows of ``(transaction_type, category, description, date, amount_cents)``."""
+    stmt = _DEBITS_BETWEEN if debits_only else _TRANSACTIONS_BETWEEN
+    return db.execute(stmt, {"user_id": user_id, "start": start, "end": end}).all()
+
+
+def latest_transactions(db: Session, user_id, limit: int) -> list:
+    return list(db.scalars(_LATEST_TRANSACTIONS, {"user_id": user_id, "limit": limit}))
+
+
+def net_worth_before(db: Session, user_id, before: date) -> float | None:
+    """Net worth recorded by the user's latest analysis before *before*."""
+    row = db.execute(_PREVIOUS_NET_WORTH, {"user_id": user_id, "before": before}).first()
+    return row.net_worth if row else None
+
+
+def review_for_week(db: Session, user_id, week_start: date) -> WeeklyReview | None:
+    return db.scalars(_REVIEW_FOR_WEEK, {"user_id": user_id, "week_start": week_start}).first()
+
+
+def review_by_id(db: Session, user_id, review_id) -> WeeklyReview | None:
+    return db.scalars(_REVIEW_BY_ID, {"user_id": user_id, "review_id": review_id}).first()
+
+
+def previous_snapshot(db: Session, user_id, before: date) -> dict | None:
+    return db.scalars(_PREVIOUS_SNAPSHOT, {"user_id": user_id, "before": before}).first()
+
+
+def recent_actions(db: Session, user_id, before: date, limit: int) -> list:
+    """``(action_type, weekly_spending)`` of the latest reviews before *before*, newest first."""
+    return db.execute(_RECENT_ACTIONS, {"user_id": user_id, "before": before, "limit": limit}).all()
+
+
+def review_history(db: Session, user_id, limit: int) -> list:
+    """History rows: review columns plus one labelled column per snapshot key."""
+    return db.execute(_REVIEW_HISTORY, {"user_id": user_id, "limit": limit}).all()
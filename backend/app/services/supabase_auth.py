@@ -1,14 +1,21 @@
-import json
+import asyncio
 import logging
-import urllib.error
-import urllib.parse
-import urllib.request
+import random
+import threading
+import time
 from typing import Any
 
+import httpx
+
 from app.config import settings
 
 logger = logging.getLogger("finpulse.supabase")
 
+# Statuses worth retrying: the request reached Supabase but it (or its proxy) failed.
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+RETRY_BACKOFF_BASE_SECONDS = 0.1
+RETRY_BACKOFF_MAX_SECONDS = 1.0
+
 
 class SupabaseAuthError(Exception):
     def __init__(self, detail: str, status_code: int = 502):
@@ -17,29 +24,151 @@ class SupabaseAuthError(Exception):
         self.status_code = status_code
 
 
+class CircuitBreaker:
+    """Fail fast after repeated upstream failures instead of queueing on timeouts.
+
+    Opens after ``failure_threshold`` consecutive failures, rejects calls for
+    ``reset_seconds``, then lets a single trial request through (half-open).
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock=time.monotonic):
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_seconds:
+                return "half_open"
+            return "open"
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_seconds or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = self._clock()
+
+
+_client: httpx.Client | None = None
+_async_client: httpx.AsyncClient | None = None
+_client_lock = threading.Lock()
+_breaker = CircuitBreaker(
+    settings.supabase_circuit_failure_threshold,
+    settings.supabase_circuit_reset_seconds,
+)
+_metrics_lock = threading.Lock()
+_metrics = {
+    "requests": 0,
+    "new_connections": 0,
+    "retries": 0,
+    "failures": 0,
+    "circuit_rejections": 0,
+}
+
+
+def _incr(key: str, amount: int = 1) -> None:
+    with _metrics_lock:
+        _metrics[key] += amount
+
+
+def supabase_http_metrics() -> dict:
+    """Return request/connection counters for the pooled Supabase clients."""
+    with _metrics_lock:
+        snapshot = dict(_metrics)
+    snapshot["reused_connections"] = max(snapshot["requests"] - snapshot["new_connections"], 0)
+    snapshot["circuit_state"] = _breaker.state
+    return snapshot
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.supabase_pool_size,
+        max_keepalive_connections=settings.supabase_pool_size,
+        keepalive_expiry=settings.supabase_keepalive_seconds,
+    )
+
+
+def _get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(limits=_limits(), timeout=settings.supabase_timeout_seconds)
+    return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    # AsyncClient is bound to the running event loop, which is single-threaded.
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(limits=_limits(), timeout=settings.supabase_timeout_seconds)
+    return _async_client
+
+
+def close_supabase_clients() -> None:
+    """Close the pooled sync client (the async one is closed by aclose_supabase_clients)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose_supabase_clients() -> None:
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    close_supabase_clients()
+
+
+def _trace(event_name: str, info: dict) -> None:
+    if event_name == "connection.connect_tcp.complete":
+        _incr("new_connections")
+
+
+async def _atrace(event_name: str, info: dict) -> None:
+    _trace(event_name, info)
+
+
 def _supabase_base() -> str:
     if not settings.supabase_enabled:
         raise SupabaseAuthError("Supabase auth is not configured", status_code=500)
     return settings.supabase_url.rstrip("/")
 
 
-def _request(
-    method: str,
+def _build_request_args(
     path: str,
     *,
-    body: dict[str, Any] | None = None,
-    use_service_role: bool = False,
-    bearer_token: str | None = None,
-    query: dict[str, str] | None = None,
+    body: dict[str, Any] | None,
+    use_service_role: bool,
+    bearer_token: str | None,
+    query: dict[str, str] | None,
 ) -> dict[str, Any]:
     base = _supabase_base()
-    url = f"{base}{path}"
-    if query:
-        url += f"?{urllib.parse.urlencode(query)}"
-
-    payload = None
-    if body is not None:
-        payload = json.dumps(body).encode("utf-8")
 
     headers = {
         "Content-Type": "application/json",
@@ -54,56 +183,188 @@ def _request(
     elif use_service_role:
         headers["Authorization"] = f"Bearer {settings.supabase_service_role_key}"
 
-    req = urllib.request.Request(url=url, data=payload, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req, timeout=20) as response:
-            raw = response.read().decode("utf-8")
-            return json.loads(raw) if raw else {}
-    except urllib.error.HTTPError as exc:
-        raw = exc.read().decode("utf-8") if exc.fp else ""
-        detail = "Supabase auth request failed"
-        if raw:
+    return {"url": f"{base}{path}", "headers": headers, "json": body, "params": query or None}
+
+
+def _parse_response(response: httpx.Response) -> dict[str, Any]:
+    raw = response.text
+    if response.is_success:
+        return response.json() if raw else {}
+
+    detail = "Supabase auth request failed"
+    if raw:
+        try:
+            body = response.json()
+            detail = body.get("msg") or body.get("message") or body.get("error_description") or body.get("error") or detail
+        except Exception:
+            detail = raw
+    raise SupabaseAuthError(detail=detail, status_code=response.status_code)
+
+
+def _retry_delay(attempt: int) -> float:
+    # Full jitter keeps retries from synchronising across workers.
+    cap = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(0, cap)
+
+
+def _check_circuit() -> None:
+    if not _breaker.allow_request():
+        _incr("circuit_rejections")
+        raise SupabaseAuthError("Supabase auth temporarily unavailable", status_code=503)
+
+
+def _should_retry(response: httpx.Response | None, attempt: int, retries: int) -> bool:
+    if attempt >= retries:
+        return False
+    return response is None or response.status_code in RETRYABLE_STATUS_CODES
+
+
+def _record_attempt(response: httpx.Response | None, attempt: int, retries: int) -> float | None:
+    """Record one attempt with the breaker and metrics; return the delay before retrying, or None.
+
+    *response* is None when the request raised ``httpx.HTTPError``.
+    """
+    if response is not None and response.status_code < 500:
+        _breaker.record_success()
+        return None
+    _breaker.record_failure()
+    _incr("failures")
+    if not _should_retry(response, attempt, retries):
+        return None
+    _incr("retries")
+    return _retry_delay(attempt + 1)
+
+
+def _result(response: httpx.Response | None, error: httpx.HTTPError | None) -> dict[str, Any]:
+    if error is not None:
+        raise SupabaseAuthError(detail=f"Supabase auth unreachable: {error}", status_code=502) from error
+    return _parse_response(response)
+
+
+def _request(
+    method: str,
+    path: str,
+    *,
+    body: dict[str, Any] | None = None,
+    use_service_role: bool = False,
+    bearer_token: str | None = None,
+    query: dict[str, str] | None = None,
+    timeout: float | None = None,
+    retries: int | None = None,
+) -> dict[str, Any]:
+    request_args = _build_request_args(
+        path, body=body, use_service_role=use_service_role, bearer_token=bearer_token, query=query
+    )
+    retries = settings.supabase_max_retries if retries is None else retries
+    client = _get_client()
+
+    attempt = 0
+    while True:
+        _check_circuit()
+        _incr("requests")
+        response, error, recorded = None, None, False
+        try:
+            try:
+                response = client.request(
+                    method,
+                    timeout=timeout or settings.supabase_timeout_seconds,
+                    extensions={"trace": _trace},
+                    **request_args,
+                )
+            except httpx.HTTPError as exc:
+                error = exc
+            delay = _record_attempt(response, attempt, retries)
+            recorded = True
+        finally:
+            # Any other exception still counts, so a half-open trial is never left in flight.
+            if not recorded:
+                _breaker.record_failure()
+        if delay is None:
+            return _result(response, error)
+        attempt += 1
+        time.sleep(delay)
+
+
+async def _arequest(
+    method: str,
+    path: str,
+    *,
+    body: dict[str, Any] | None = None,
+    use_service_role: bool = False,
+    bearer_token: str | None = None,
+    query: dict[str, str] | None = None,
+    timeout: float | None = None,
+    retries: int | None = None,
+) -> dict[str, Any]:
+    """Async counterpart of ``_request`` for use from async routes."""
+    request_args = _build_request_args(
+        path, body=body, use_service_role=use_service_role, bearer_token=bearer_token, query=query
+    )
+    retries = settings.supabase_max_retries if retries is None else retries
+    client = _get_async_client()
+
+    attempt = 0
+    while True:
+        _check_circuit()
+        _incr("requests")
+        response, error, recorded = None, None, False
+        try:
             try:
-                body = json.loads(raw)
-                detail = body.get("msg") or body.get("message") or body.get("error_description") or body.get("error") or detail
-            except Exception:
-                detail = raw
-        raise SupabaseAuthError(detail=detail, status_code=exc.code) from exc
-    except urllib.error.URLError as exc:
-        raise SupabaseAuthError(
-            detail=f"Supabase auth unreachable: {exc.reason}",
-            status_code=502,
-        ) from exc
+                response = await client.request(
+                    method,
+                    timeout=timeout or settings.supabase_timeout_seconds,
+                    extensions={"trace": _atrace},
+                    **request_args,
+                )
+            except httpx.HTTPError as exc:
+                error = exc
+            delay = _record_attempt(response, attempt, retries)
+            recorded = True
+        finally:
+            if not recorded:
+                _breaker.record_failure()
+        if delay is None:
+            return _result(response, error)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+def _sign_up_args(email: str, password: str, full_name: str) -> dict[str, Any]:
+    # Signup is not idempotent, so it is never retried.
+    return {
+        "body": {"email": email, "password": password, "data": {"full_name": full_name}},
+        "retries": 0,
+    }
+
+
+def _sign_in_args(email: str, password: str) -> dict[str, Any]:
+    return {
+        "query": {"grant_type": "password"},
+        "body": {"email": email, "password": password},
+        "timeout": settings.supabase_login_timeout_seconds,
+    }
+
+
+def _recovery_args(email: str, redirect_to: str | None) -> dict[str, Any]:
+    # A retried recovery request can send the user a second email.
+    query: dict[str, str] = {}
+    if redirect_to:
+        query["redirect_to"] = redirect_to
+    return {"body": {"email": email}, "query": query, "retries": 0}
 
 
 def sign_up_user(email: str, password: str, full_name: str) -> dict[str, Any]:
     """Create a Supabase auth user via public signup flow."""
-    return _request(
-        "POST",
-        "/auth/v1/signup",
-        body={
-            "email": email,
-            "password": password,
-            "data": {"full_name": full_name},
-        },
-    )
+    return _request("POST", "/auth/v1/signup", **_sign_up_args(email, password, full_name))
 
 
 def sign_in_with_password(email: str, password: str) -> dict[str, Any]:
     """Validate credentials against Supabase."""
-    return _request(
-        "POST",
-        "/auth/v1/token",
-        query={"grant_type": "password"},
-        body={"email": email, "password": password},
-    )
+    return _request("POST", "/auth/v1/token", **_sign_in_args(email, password))
 
 
 def send_recovery_email(email: str, redirect_to: str | None) -> None:
-    query: dict[str, str] = {}
-    if redirect_to:
-        query["redirect_to"] = redirect_to
-    _request("POST", "/auth/v1/recover", body={"email": email}, query=query)
+    _request("POST", "/auth/v1/recover", **_recovery_args(email, redirect_to))
 
 
 def update_password_with_access_token(access_token: str, new_password: str) -> dict[str, Any]:
@@ -113,3 +374,29 @@ def update_password_with_access_token(access_token: str, new_password: str) -> d
         bearer_token=access_token,
         body={"password": new_password},
     )
+
+
+def fetch_jwks() -> dict[str, Any]:
+    """Fetch the project's public signing keys (used for local JWT verification)."""
+    return _request("GET", "/auth/v1/.well-known/jwks.json", retries=0)
+
+
+async def sign_up_user_async(email: str, password: str, full_name: str) -> dict[str, Any]:
+    return await _arequest("POST", "/auth/v1/signup", **_sign_up_args(email, password, full_name))
+
+
+async def sign_in_with_password_async(email: str, password: str) -> dict[str, Any]:
+    return await _arequest("POST", "/auth/v1/token", **_sign_in_args(email, password))
+
+
+async def send_recovery_email_async(email: str, redirect_to: str | None) -> None:
+    await _arequest("POST", "/auth/v1/recover", **_recovery_args(email, redirect_to))
+
+
+async def update_password_with_access_token_async(access_token: str, new_password: str) -> dict[str, Any]:
+    return await _arequest(
+        "PUT",
+        "/auth/v1/user",
+        bearer_token=access_token,
+        body={"password": new_password},
+    )
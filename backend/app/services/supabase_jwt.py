@@ -0,0 +1,144 @@
+"""Local verification of Supabase-issued access tokens.
+
+Supabase signs access tokens either with the project's shared HS256 secret
+(legacy projects) or with asymmetric keys published at the project's JWKS
+endpoint. Both are verified in-process so authenticated requests never need a
+network round trip. JWKS keys are refreshed periodically in the background,
+and a token that references an unknown ``kid`` (key rotation) wakes the
+background thread early; that token is rejected rather than waiting on the
+fetch, since verification can run on the event loop.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from jose import JWTError, jwt
+
+from app.config import settings
+from app.metrics import record_cache_lookup
+from app.services.supabase_auth import fetch_jwks
+
+logger = logging.getLogger("finpulse.supabase")
+
+ASYMMETRIC_ALGORITHMS = {"RS256", "ES256"}
+# Minimum spacing between on-demand refreshes triggered by unknown key ids,
+# so garbage tokens cannot turn into a flood of JWKS requests.
+MIN_ON_DEMAND_REFRESH_SECONDS = 30
+
+
+class SupabaseJWKSCache:
+    def __init__(
+        self,
+        fetch: Callable[[], dict[str, Any]] = fetch_jwks,
+        refresh_seconds: float = 600,
+        clock=time.monotonic,
+    ):
+        self._fetch = fetch
+        self.refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._keys: dict[str, dict] = {}
+        self._last_refresh: float | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def refresh(self) -> bool:
+        """Replace the cached key set. Keeps the previous keys if the fetch fails."""
+        with self._lock:
+            self._last_refresh = self._clock()
+        try:
+            payload = self._fetch()
+        except Exception as exc:
+            logger.warning("Supabase JWKS refresh failed: %s", exc)
+            return False
+
+        keys = {k["kid"]: k for k in payload.get("keys", []) if isinstance(k, dict) and k.get("kid")}
+        with self._lock:
+            self._keys = keys
+        logger.info("Loaded %d Supabase signing key(s)", len(keys))
+        return True
+
+    def get_key(self, kid: str | None) -> dict | None:
+        if not kid:
+            return None
+        with self._lock:
+            key = self._keys.get(kid)
+            last_refresh = self._last_refresh
+        record_cache_lookup("supabase_jwks", key is not None)
+        if key is not None:
+            return key
+
+        if last_refresh is None or self._clock() - last_refresh >= MIN_ON_DEMAND_REFRESH_SECONDS:
+            self.request_refresh()
+        return None
+
+    def request_refresh(self) -> None:
+        """Refresh soon without blocking the caller."""
+        with self._lock:
+            self._last_refresh = self._clock()
+        if self._thread is not None and self._thread.is_alive():
+            self._wake.set()
+        else:
+            threading.Thread(target=self.refresh, name="supabase-jwks-refresh-once", daemon=True).start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._wake.wait(self.refresh_seconds)
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="supabase-jwks-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+jwks_cache = SupabaseJWKSCache(refresh_seconds=settings.supabase_jwks_refresh_seconds)
+
+
+def start_supabase_key_refresh() -> None:
+    if settings.supabase_enabled:
+        jwks_cache.start()
+
+
+def stop_supabase_key_refresh() -> None:
+    jwks_cache.stop()
+
+
+def verify_supabase_access_token(token: str) -> dict:
+    """Verify a Supabase access token locally and return its claims. Raises JWTError."""
+    if not settings.supabase_enabled:
+        raise JWTError("Supabase auth is not configured")
+
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    if algorithm == "HS256":
+        if not settings.supabase_jwt_secret:
+            raise JWTError("Supabase JWT secret is not configured")
+        key: str | dict = settings.supabase_jwt_secret
+    elif algorithm in ASYMMETRIC_ALGORITHMS:
+        key = jwks_cache.get_key(header.get("kid"))
+        if key is None:
+            raise JWTError("Unknown Supabase signing key")
+    else:
+        raise JWTError(f"Unsupported Supabase token algorithm: {algorithm}")
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=[algorithm],
+        audience=settings.supabase_jwt_audience,
+        issuer=f"{settings.supabase_url.rstrip('/')}/auth/v1",
+    )
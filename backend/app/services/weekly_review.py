@@ -1,6 +1,7 @@
 from datetime import date, datetime, timedelta, timezone
 
 from fastapi import HTTPException, status
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.models.account import Account
@@ -9,10 +10,23 @@ from app.models.expense import Expense
 from app.models.goal import Goal
 from app.models.installment_plan import InstallmentPlan
 from app.models.investment import Investment
-from app.models.transaction import Transaction, TransactionType
+from app.models.transaction import TransactionType
 from app.models.user import User
 from app.models.weekly_review import ActionStatus, WeeklyReview
+from app.services.columnar import load_transactions
+from app.services.debt_payoff import CREDIT_CARD, load_debts, minimum_payment, plan_payoff
 from app.services.financial import _compute_monthly_expenses
+from app.services.money import from_cents, to_cents
+from app.services.queries import (
+    WEEKLY_SNAPSHOT_KEYS,
+    previous_snapshot,
+    recent_actions,
+    review_by_id,
+    review_for_week,
+    review_history,
+    rows_for_user,
+    transactions_between,
+)
 
 
 def _iso_week_bounds(d: date) -> tuple[date, date]:
@@ -33,53 +47,45 @@ def get_or_create_weekly_review(db: Session, user: User) -> dict:
     today = date.today()
     week_start, week_end = _iso_week_bounds(today)
 
-    existing = (
-        db.query(WeeklyReview)
-        .filter(WeeklyReview.user_id == user.id, WeeklyReview.week_start == week_start)
-        .first()
-    )
+    existing = review_for_week(db, user.id, week_start)
     if existing:
         return _review_to_dict(existing)
 
     snapshot = _build_weekly_snapshot(db, user, week_start, week_end)
 
-    prev_review = (
-        db.query(WeeklyReview)
-        .filter(WeeklyReview.user_id == user.id, WeeklyReview.week_start < week_start)
-        .order_by(WeeklyReview.week_start.desc())
-        .first()
-    )
-    prev_snapshot = prev_review.snapshot if prev_review else None
+    prev_snapshot = previous_snapshot(db, user.id, week_start)
     changes = _compute_changes(snapshot, prev_snapshot) if prev_snapshot else None
 
     action = _generate_action(db, user, snapshot, week_start)
 
-    review = WeeklyReview(
-        user_id=user.id,
-        week_start=week_start,
-        week_end=week_end,
-        snapshot=snapshot,
-        prev_snapshot=prev_snapshot,
-        changes=changes,
-        action_type=action["type"],
-        action_title=action["title"],
-        action_detail=action.get("detail"),
-        action_target_amount=action.get("target_amount"),
-        action_target_name=action.get("target_name"),
-        action_status=ActionStatus.PENDING,
+    # The replica may just be lagging behind a review that already exists, or
+    # another request may be creating it now. Insert on the primary, keep the
+    # existing row if there is one, and read the result back from the primary.
+    db.info["use_primary"] = True
+    db.execute(
+        insert(WeeklyReview)
+        .values(
+            user_id=user.id,
+            week_start=week_start,
+            week_end=week_end,
+            snapshot=snapshot,
+            prev_snapshot=prev_snapshot,
+            changes=changes,
+            action_type=action["type"],
+            action_title=action["title"],
+            action_detail=action.get("detail"),
+            action_target_amount=action.get("target_amount"),
+            action_target_name=action.get("target_name"),
+            action_status=ActionStatus.PENDING,
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "week_start"])
     )
-    db.add(review)
     db.commit()
-    db.refresh(review)
-    return _review_to_dict(review)
+    return _review_to_dict(review_for_week(db, user.id, week_start))
 
 
 def complete_action(db: Session, user: User, review_id: str, new_status: str) -> dict:
-    review = (
-        db.query(WeeklyReview)
-        .filter(WeeklyReview.id == review_id, WeeklyReview.user_id == user.id)
-        .first()
-    )
+    review = review_by_id(db, user.id, review_id)
     if not review:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Review not found")
 
@@ -97,13 +103,7 @@ def complete_action(db: Session, user: User, review_id: str, new_status: str) ->
 
 
 def get_review_history(db: Session, user: User, limit: int = 12) -> dict:
-    reviews = (
-        db.query(WeeklyReview)
-        .filter(WeeklyReview.user_id == user.id)
-        .order_by(WeeklyReview.week_start.desc())
-        .limit(limit)
-        .all()
-    )
+    reviews = review_history(db, user.id, limit)
 
     non_pending = [r for r in reviews if r.action_status != ActionStatus.PENDING.value and r.action_status != ActionStatus.PENDING]
     completed = [r for r in non_pending if r.action_status == ActionStatus.COMPLETED.value or r.action_status == ActionStatus.COMPLETED]
@@ -118,7 +118,7 @@ def get_review_history(db: Session, user: User, limit: int = 12) -> dict:
             break
 
     return {
-        "reviews": [_review_to_dict(r) for r in reviews],
+        "reviews": [_history_row_to_dict(r) for r in reviews],
         "wacr": round(wacr, 1),
         "current_streak": streak,
         "total_completed": len(completed),
@@ -130,69 +130,56 @@ def get_review_history(db: Session, user: User, limit: int = 12) -> dict:
 
 
 def _build_weekly_snapshot(db: Session, user: User, week_start: date, week_end: date) -> dict:
-    accounts = db.query(Account).filter(Account.user_id == user.id).all()
-    cards = db.query(CreditCard).filter(CreditCard.user_id == user.id).all()
-    investments = db.query(Investment).filter(Investment.user_id == user.id).all()
-    expenses = db.query(Expense).filter(Expense.user_id == user.id).all()
-    installments = db.query(InstallmentPlan).filter(InstallmentPlan.user_id == user.id).all()
+    accounts = rows_for_user(db, Account, user.id)
+    cards = rows_for_user(db, CreditCard, user.id)
+    investments = rows_for_user(db, Investment, user.id)
+    expenses = rows_for_user(db, Expense, user.id)
+    installments = rows_for_user(db, InstallmentPlan, user.id)
 
+    # Money is summed in integer cents and converted back for the snapshot.
     account_balance = sum(
-        float(a.balance) for a in accounts if a.account_type in ("chequing", "savings")
+        to_cents(a.balance) for a in accounts if a.account_type in ("chequing", "savings")
     )
     savings_balance = sum(
-        float(a.balance) for a in accounts if a.account_type == "savings"
+        to_cents(a.balance) for a in accounts if a.account_type == "savings"
     )
-    investment_total = sum(float(i.current_value) for i in investments)
+    investment_total = sum(to_cents(i.current_value) for i in investments)
     total_assets = account_balance + investment_total
 
-    cc_balance = sum(float(c.current_balance) for c in cards)
+    cc_balance = sum(to_cents(c.current_balance) for c in cards)
     installment_remaining = sum(
-        float(ip.monthly_payment) * ip.remaining_payments for ip in installments
+        to_cents(ip.monthly_payment) * ip.remaining_payments for ip in installments
     )
     total_liabilities = cc_balance + installment_remaining
     net_worth = total_assets - total_liabilities
 
     today = date.today()
     first_of_month = today.replace(day=1)
-    month_txns = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= first_of_month,
-            Transaction.date <= today,
-        )
-        .all()
-    )
-    monthly_income = sum(float(t.amount) for t in month_txns if t.transaction_type == TransactionType.CREDIT)
+    # The month so far and the review week, loaded once.
+    transactions = load_transactions(db, user.id, min(first_of_month, week_start), max(today, week_end))
+    month_txns = transactions.between(first_of_month, today)
+    monthly_income = month_txns.total(TransactionType.CREDIT)
     monthly_expenses = _compute_monthly_expenses(expenses, month_txns)
     cash_flow = monthly_income - monthly_expenses
 
-    total_cc_limit = sum(float(c.credit_limit) for c in cards)
+    total_cc_limit = sum(to_cents(c.credit_limit) for c in cards)
     credit_utilization_pct = (cc_balance / total_cc_limit * 100) if total_cc_limit > 0 else 0
 
-    week_txns = (
-        db.query(Transaction)
-        .filter(
-            Transaction.user_id == user.id,
-            Transaction.date >= week_start,
-            Transaction.date <= week_end,
-        )
-        .all()
-    )
-    weekly_spending = sum(float(t.amount) for t in week_txns if t.transaction_type == TransactionType.DEBIT)
-    weekly_income = sum(float(t.amount) for t in week_txns if t.transaction_type == TransactionType.CREDIT)
+    week_txns = transactions.between(week_start, week_end)
+    weekly_spending = week_txns.total(TransactionType.DEBIT)
+    weekly_income = week_txns.total(TransactionType.CREDIT)
 
     return {
-        "net_worth": round(net_worth, 2),
-        "total_assets": round(total_assets, 2),
-        "total_liabilities": round(total_liabilities, 2),
-        "monthly_income": round(monthly_income, 2),
-        "monthly_expenses": round(monthly_expenses, 2),
-        "cash_flow": round(cash_flow, 2),
+        "net_worth": from_cents(net_worth),
+        "total_assets": from_cents(total_assets),
+        "total_liabilities": from_cents(total_liabilities),
+        "monthly_income": from_cents(monthly_income),
+        "monthly_expenses": from_cents(monthly_expenses),
+        "cash_flow": from_cents(cash_flow),
         "credit_utilization_pct": round(credit_utilization_pct, 2),
-        "savings_balance": round(savings_balance, 2),
-        "weekly_spending": round(weekly_spending, 2),
-        "weekly_income": round(weekly_income, 2),
+        "savings_balance": from_cents(savings_balance),
+        "weekly_spending": from_cents(weekly_spending),
+        "weekly_income": from_cents(weekly_income),
     }
 
 
@@ -232,40 +219,57 @@ def _compute_changes(current: dict, previous: dict) -> dict:
 def _generate_action(db: Session, user: User, snapshot: dict, week_start: date) -> dict:
     candidates: list[tuple[int, dict]] = []
 
-    cards = db.query(CreditCard).filter(CreditCard.user_id == user.id).all()
-    goals = db.query(Goal).filter(Goal.user_id == user.id).all()
+    debts = load_debts(db, user.id)
+    goals = rows_for_user(db, Goal, user.id)
     today = date.today()
 
     util = snapshot["credit_utilization_pct"]
 
     # --- Credit utilization rules ---
-    if cards:
-        worst = max(cards, key=lambda c: float(c.current_balance) / float(c.credit_limit) if float(c.credit_limit) > 0 else 0)
-        pay_amount = round(float(worst.current_balance) * 0.5, 2) if float(worst.current_balance) > 0 else 0
+    card_indexes = [i for i, debt in enumerate(debts) if debt.kind == CREDIT_CARD]
+    if card_indexes and util > 30:
+        # Minimums plus half of this month's surplus so far, spread by the
+        # payoff plan with the least interest; target the card it funds most.
+        budget = minimum_payment(debts) + max(to_cents(snapshot["cash_flow"]), 0) // 2
+        plan = plan_payoff(debts, budget, today)
+        best = next(p for p in plan["strategies"] if p["strategy"] == plan["recommended"])
+        first_month = best["schedule"][0]["payments"]
+        focus = max(
+            card_indexes,
+            key=lambda i: (first_month[i] - plan["debts"][i]["minimum_payment"], first_month[i]),
+        )
+        card = debts[focus]
+        pay_amount = first_month[focus]
+        plan_note = ""
+        if best["payoff_date"]:
+            plan_note = (
+                f" At ${from_cents(budget):,.0f}/month the {best['strategy']} plan clears your debts by "
+                f"{best['payoff_date']:%b %Y} with ${best['total_interest']:,.0f} in interest."
+            )
 
         if util > 75:
             candidates.append((95, {
                 "type": "pay_credit_card",
-                "title": f"Pay down ${pay_amount:,.0f} on {worst.name}",
-                "detail": f"Your credit utilization is {util:.0f}%, well above the recommended 30%. Paying down this card will improve your credit score.",
+                "title": f"Pay down ${pay_amount:,.0f} on {card.name}",
+                "detail": f"Your credit utilization is {util:.0f}%, well above the recommended 30%. Paying down this card will improve your credit score.{plan_note}",
                 "target_amount": pay_amount,
-                "target_name": worst.name,
+                "target_name": card.name,
             }))
         elif util > 50:
             candidates.append((85, {
                 "type": "pay_credit_card",
-                "title": f"Pay down ${pay_amount:,.0f} on {worst.name}",
-                "detail": f"Your credit utilization is {util:.0f}%. Getting below 30% will boost your credit score.",
+                "title": f"Pay down ${pay_amount:,.0f} on {card.name}",
+                "detail": f"Your credit utilization is {util:.0f}%. Getting below 30% will boost your credit score.{plan_note}",
                 "target_amount": pay_amount,
-                "target_name": worst.name,
+                "target_name": card.name,
             }))
         elif util > 30:
             candidates.append((75, {
                 "type": "pay_credit_card",
-                "title": f"Pay down ${pay_amount:,.0f} on {worst.name}",
-                "detail": f"Your utilization is {util:.0f}%. Reducing it further strengthens your credit profile.",
+                "title": f"Pay down ${pay_amount:,.0f} on {card.name}",
+                "detail": f"Your utilization is {util:.0f}%. Reducing it further strengthens your credit profile.{plan_note}",
                 "target_amount": pay_amount,
-                "target_name": worst.name,
+                "target_name": card.name,
             }))
 
     # --- Off-track goal rules ---
@@ -345,34 +349,22 @@ def _generate_action(db: Session, user: User, snapshot: dict, week_start: date)
             }))
 
     # --- Overspending rules ---
-    prev_review = (
-        db.query(WeeklyReview)
-        .filter(WeeklyReview.user_id == user.id, WeeklyReview.week_start < week_start)
-        .order_by(WeeklyReview.week_start.desc())
-        .first()
-    )
-    if prev_review and prev_review.snapshot:
-        prev_spending = prev_review.snapshot.get("weekly_spending", 0)
+    recent_reviews = recent_actions(db, user.id, week_start, 2)
+    if recent_reviews:
+        prev_spending = recent_reviews[0].weekly_spending or 0
         spending_diff = snapshot["weekly_spending"] - prev_spending
 
         # Find top spending category this week
-        week_txns = (
-            db.query(Transaction)
-            .filter(
-                Transaction.user_id == user.id,
-                Transaction.date >= week_start,
-                Transaction.date <= week_start + timedelta(days=6),
-                Transaction.transaction_type == TransactionType.DEBIT,
-            )
-            .all()
+        week_txns = transactions_between(
+            db, user.id, week_start, week_start + timedelta(days=6), debits_only=True
         )
-        category_totals: dict[str, float] = {}
-        for t in week_txns:
-            cat = t.category or "Uncategorized"
-            category_totals[cat] = category_totals.get(cat, 0) + float(t.amount)
+        category_totals: dict[str, int] = {}
+        for _, category, _, _, amount in week_txns:
+            cat = category or "Uncategorized"
+            category_totals[cat] = category_totals.get(cat, 0) + amount
 
         top_category = max(category_totals, key=category_totals.get) if category_totals else "spending"
-        top_amount = round(category_totals.get(top_category, 0), 2)
+        top_amount = from_cents(category_totals.get(top_category, 0))
 
         if spending_diff > 200:
             candidates.append((65, {
@@ -403,13 +395,6 @@ def _generate_action(db: Session, user: User, snapshot: dict, week_start: date)
     candidates.sort(key=lambda x: x[0], reverse=True)
 
     # Anti-repeat: check last 2 reviews
-    recent_reviews = (
-        db.query(WeeklyReview)
-        .filter(WeeklyReview.user_id == user.id, WeeklyReview.week_start < week_start)
-        .order_by(WeeklyReview.week_start.desc())
-        .limit(2)
-        .all()
-    )
     recent_types = [r.action_type for r in recent_reviews]
 
     _, winner = candidates[0]
@@ -425,13 +410,13 @@ def _generate_action(db: Session, user: User, snapshot: dict, week_start: date)
 # ── serialization ───────────────────────────────────────────────────────
 
 
-def _review_to_dict(review: WeeklyReview) -> dict:
+def _review_to_dict(review: WeeklyReview, snapshot: dict | None = None) -> dict:
     action_status = review.action_status.value if hasattr(review.action_status, "value") else review.action_status
     return {
         "id": str(review.id),
         "week_start": review.week_start.isoformat(),
         "week_end": review.week_end.isoformat(),
-        "snapshot": review.snapshot,
+        "snapshot": review.snapshot if snapshot is None else snapshot,
         "changes": review.changes,
         "action": {
             "type": review.action_type,
@@ -444,3 +429,8 @@ def _review_to_dict(review: WeeklyReview) -> dict:
         },
         "created_at": review.created_at.isoformat() if review.created_at else None,
     }
+
+
+def _history_row_to_dict(row) -> dict:
+    # History rows carry the snapshot as one column per key (see queries.review_history).
+    return _review_to_dict(row, snapshot={key: getattr(row, key) for key in WEEKLY_SNAPSHOT_KEYS})
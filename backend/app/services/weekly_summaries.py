@@ -0,0 +1,210 @@
+"""Scheduled delivery of weekly summary emails.
+
+Users pick a local weekday and hour for their summary. Each dispatch works out
+which ``(timezone, day, hour)`` slots are currently due, claims matching users
+in batches (``FOR UPDATE SKIP LOCKED`` so concurrent dispatchers never pick the
+same user), and builds and sends the emails on a worker pool that shares the
+pooled SMTP sessions from ``app.services.notifications``.
+
+Run once from cron with ``python -m app.services.weekly_summaries`` or enable
+the in-process scheduler with ``WEEKLY_SUMMARY_SCHEDULER_ENABLED=true``.
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.user import User
+from app.services.notifications import (
+    build_weekly_summary_subject,
+    build_weekly_summary_text,
+    send_notification_email,
+    smtp_configured,
+)
+
+logger = logging.getLogger("finpulse.weekly_summaries")
+
+# A user is due again once their last summary is this old; anything shorter
+# than a week but longer than the dispatch window works.
+RESEND_AFTER = timedelta(days=6)
+
+Slot = tuple[str, int, int]
+
+
+def due_schedule_slots(timezones: list[str], now: datetime) -> list[Slot]:
+    """Return the (timezone, weekday, hour) slots whose local time is *now*."""
+    slots = []
+    for name in timezones:
+        try:
+            local = now.astimezone(ZoneInfo(name))
+        except (ZoneInfoNotFoundError, ValueError):
+            logger.warning("Skipping unknown notification timezone %r", name)
+            continue
+        slots.append((name, local.weekday(), local.hour))
+    return slots
+
+
+def _eligible():
+    # Bare boolean columns so the planner matches the partial index predicate.
+    return (User.weekly_summary_enabled, User.email_notifications_enabled)
+
+
+def _eligible_timezones(db: Session) -> list[str]:
+    return list(db.scalars(select(User.notification_timezone).where(*_eligible()).distinct()))
+
+
+def _claim_batch(
+    db: Session, slots: list[Slot], now: datetime, batch_size: int, after_id: uuid.UUID | None
+) -> list[uuid.UUID]:
+    # Walking ids upwards gives each dispatch a single pass, so users released
+    # after a failed send wait for the next tick instead of looping here.
+    id_filter = (User.id > after_id,) if after_id is not None else ()
+    candidates = (
+        select(User.id)
+        .where(
+            *_eligible(),
+            *id_filter,
+            tuple_(User.notification_timezone, User.weekly_summary_day, User.weekly_summary_hour).in_(slots),
+            or_(
+                User.weekly_summary_last_sent_at.is_(None),
+                User.weekly_summary_last_sent_at < now - RESEND_AFTER,
+            ),
+        )
+        .order_by(User.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    claimed = db.scalars(
+        update(User)
+        .where(User.id.in_(candidates))
+        .values(weekly_summary_last_sent_at=now)
+        .returning(User.id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return sorted(claimed)
+
+
+def _release(db: Session, user_id: uuid.UUID) -> None:
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(weekly_summary_last_sent_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _deliver(user_id: uuid.UUID) -> bool:
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if user is None:
+            return False
+        delivered = False
+        try:
+            body = build_weekly_summary_text(db, user)
+            delivered = send_notification_email(user.email, build_weekly_summary_subject(user), body)
+        except Exception:
+            logger.exception("Failed to build weekly summary for user %s", user_id)
+            db.rollback()
+        if not delivered:
+            # Unclaim the user so the next dispatch in this hour retries.
+            _release(db, user_id)
+        return delivered
+    finally:
+        db.close()
+
+
+def dispatch_weekly_summaries(now: datetime | None = None) -> dict:
+    """Send every weekly summary that is due at *now* and return delivery stats."""
+    now = now or datetime.now(timezone.utc)
+    stats = {"slots": 0, "claimed": 0, "sent": 0, "failed": 0}
+    if not smtp_configured():
+        logger.info("SMTP not configured; skipping weekly summary dispatch")
+        return stats
+
+    db = SessionLocal()
+    try:
+        slots = due_schedule_slots(_eligible_timezones(db), now)
+        stats["slots"] = len(slots)
+        if not slots:
+            return stats
+
+        with ThreadPoolExecutor(
+            max_workers=settings.weekly_summary_workers, thread_name_prefix="weekly-summary"
+        ) as pool:
+            after_id = None
+            while True:
+                user_ids = _claim_batch(db, slots, now, settings.weekly_summary_batch_size, after_id)
+                if not user_ids:
+                    break
+                stats["claimed"] += len(user_ids)
+                after_id = user_ids[-1]
+                for delivered in pool.map(_deliver, user_ids):
+                    stats["sent" if delivered else "failed"] += 1
+    finally:
+        db.close()
+
+    logger.info(
+        "Weekly summaries dispatched: %(sent)d sent, %(failed)d failed across %(slots)d slot(s)", stats
+    )
+    return stats
+
+
+class WeeklySummaryScheduler:
+    """Background thread that runs ``dispatch_weekly_summaries`` on an interval."""
+
+    def __init__(self, interval_seconds: float, dispatch=dispatch_weekly_summaries):
+        self.interval_seconds = interval_seconds
+        self._dispatch = dispatch
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._dispatch()
+            except Exception:
+                logger.exception("Weekly summary dispatch failed")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weekly-summary-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+
+scheduler = WeeklySummaryScheduler(settings.weekly_summary_dispatch_interval_seconds)
+
+
+def start_weekly_summary_scheduler() -> None:
+    if settings.weekly_summary_scheduler_enabled:
+        scheduler.start()
+
+
+def stop_weekly_summary_scheduler() -> None:
+    scheduler.stop()
+
+
+if __name__ == "__main__":
+    from app.logging_config import setup_logging
+
+    setup_logging()
+    print(dispatch_weekly_summaries())
@@ -1,5 +1,9 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 import hashlib
+import hmac
+import threading
+import time
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -10,6 +14,68 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 MAX_BCRYPT_PASSWORD_BYTES = 72
 PASSWORD_RESET_TOKEN_TYPE = "password_reset"
 
+# Bcrypt is pure CPU work. Run it on a small dedicated pool so a login burst
+# cannot occupy every request thread at once.
+_bcrypt_executor: ThreadPoolExecutor | None = None
+_bcrypt_executor_lock = threading.Lock()
+_bcrypt_metrics_lock = threading.Lock()
+_bcrypt_metrics = {
+    "calls": 0,
+    "in_flight": 0,
+    "total_wait_seconds": 0.0,
+    "total_run_seconds": 0.0,
+    "max_run_seconds": 0.0,
+}
+
+
+def _get_bcrypt_executor() -> ThreadPoolExecutor:
+    global _bcrypt_executor
+    if _bcrypt_executor is None:
+        with _bcrypt_executor_lock:
+            if _bcrypt_executor is None:
+                _bcrypt_executor = ThreadPoolExecutor(
+                    max_workers=max(settings.bcrypt_max_workers, 1),
+                    thread_name_prefix="bcrypt",
+                )
+    return _bcrypt_executor
+
+
+def _run_bcrypt(fn, *args):
+    """Run a bcrypt operation on the dedicated pool and record its latency."""
+    submitted_at = time.perf_counter()
+    with _bcrypt_metrics_lock:
+        _bcrypt_metrics["in_flight"] += 1
+
+    def _timed():
+        started_at = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished_at = time.perf_counter()
+            run_seconds = finished_at - started_at
+            with _bcrypt_metrics_lock:
+                _bcrypt_metrics["calls"] += 1
+                _bcrypt_metrics["total_wait_seconds"] += started_at - submitted_at
+                _bcrypt_metrics["total_run_seconds"] += run_seconds
+                _bcrypt_metrics["max_run_seconds"] = max(_bcrypt_metrics["max_run_seconds"], run_seconds)
+
+    try:
+        return _get_bcrypt_executor().submit(_timed).result()
+    finally:
+        with _bcrypt_metrics_lock:
+            _bcrypt_metrics["in_flight"] -= 1
+
+
+def bcrypt_metrics() -> dict:
+    """Return a snapshot of bcrypt executor counters and latencies."""
+    with _bcrypt_metrics_lock:
+        snapshot = dict(_bcrypt_metrics)
+    calls = snapshot["calls"]
+    snapshot["avg_wait_ms"] = round(snapshot["total_wait_seconds"] / calls * 1000, 2) if calls else 0.0
+    snapshot["avg_run_ms"] = round(snapshot["total_run_seconds"] / calls * 1000, 2) if calls else 0.0
+    snapshot["max_workers"] = max(settings.bcrypt_max_workers, 1)
+    return snapshot
+
 
 def _password_too_long(password: str) -> bool:
     return len(password.encode("utf-8")) > MAX_BCRYPT_PASSWORD_BYTES
@@ -18,14 +84,14 @@ def _password_too_long(password: str) -> bool:
 def hash_password(password: str) -> str:
     if _password_too_long(password):
         raise ValueError(f"Password must be {MAX_BCRYPT_PASSWORD_BYTES} bytes or fewer")
-    return pwd_context.hash(password)
+    return _run_bcrypt(pwd_context.hash, password)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
-    if _password_too_long(plain):
+def verify_password(plain: str, hashed: str | None) -> bool:
+    if not hashed or _password_too_long(plain):
         return False
     try:
-        return pwd_context.verify(plain, hashed)
+        return _run_bcrypt(pwd_context.verify, plain, hashed)
     except ValueError:
         return False
 
@@ -46,6 +112,20 @@ def fingerprint_password_hash(password_hash: str) -> str:
     return hashlib.sha256(password_hash.encode("utf-8")).hexdigest()
 
 
+_PASSWORD_SYNC_KEY = hashlib.sha256(b"finpulse-password-sync\0" + settings.encryption_key.encode("utf-8")).digest()
+
+
+def password_sync_fingerprint(password: str, password_hash: str) -> str:
+    """Keyed HMAC of a password, bound to the bcrypt hash it was stored with.
+
+    Lets a Supabase login confirm the local hash is current without running
+    bcrypt. Binding it to the hash means any other write of the hash (a local
+    reset) invalidates it without further bookkeeping.
+    """
+    message = password_hash.encode("utf-8") + b"\0" + password.encode("utf-8")
+    return hmac.new(_PASSWORD_SYNC_KEY, message, hashlib.sha256).hexdigest()
+
+
 def create_password_reset_token(email: str, password_hash: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.password_reset_expiration_minutes)
     payload = {
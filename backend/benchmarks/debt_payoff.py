@@ -0,0 +1,76 @@
+"""Debt payoff planning cost by number of debts.
+
+For each count in ``--debts``, plans payoff of that many cards (random
+balances, APRs and minimums, plus two installment plans) on a budget of the
+first month's minimum payments plus ``--extra`` cents, and times
+``plan_payoff`` (all three strategies and their schedules) after a warm-up
+call. With no extra, the cards with low minimums never clear, so every
+strategy runs the full 30 years.
+
+    python -m benchmarks.debt_payoff --debts 5,20,50 --repeat 20
+"""
+
+import argparse
+import random
+import statistics
+import time
+from datetime import date
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services.debt_payoff import CREDIT_CARD, INSTALLMENT, Debt, minimum_payment, plan_payoff
+
+
+def _debts(cards: int, seed: int = 0) -> list[Debt]:
+    rng = random.Random(seed)
+    debts = []
+    for i in range(cards):
+        limit = rng.randrange(100_000, 2_000_000)
+        debts.append(
+            Debt(
+                name=f"Card {i}",
+                kind=CREDIT_CARD,
+                balance=rng.randrange(limit // 10, limit),
+                apr=rng.choice([12.99, 19.99, 22.99, 24.99, 29.99]),
+                min_payment_pct=rng.choice([1.0, 2.0, 3.0]),
+                credit_limit=limit,
+                fixed_payment=None,
+            )
+        )
+    debts.append(Debt("Phone", INSTALLMENT, 4_500 * 18, 0.0, 0.0, None, 4_500))
+    debts.append(Debt("Laptop", INSTALLMENT, 12_000 * 7, 0.0, 0.0, None, 12_000))
+    return debts
+
+
+def _ints(value: str) -> list[int]:
+    return [int(part) for part in value.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--debts", type=_ints, default=[5, 20, 50])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--extra", type=int, default=0, help="cents a month above the minimum payments")
+    args = parser.parse_args()
+
+    today = date.today()
+    for cards in args.debts:
+        debts = _debts(cards)
+        budget = minimum_payment(debts) + args.extra
+        plan = plan_payoff(debts, budget, today)  # warm up
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            plan_payoff(debts, budget, today)
+            timings.append(time.perf_counter() - started)
+        print(
+            {
+                "debts": len(debts),
+                "months": max(len(s["schedule"]) for s in plan["strategies"]),
+                "median_ms": round(statistics.median(timings) * 1e3, 2),
+            }
+        )
+
+
+if __name__ == "__main__":
+    main()
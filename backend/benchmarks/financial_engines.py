@@ -0,0 +1,199 @@
+"""Latency, query count and peak memory of the financial engines by data size.
+
+For each size in ``--sizes`` a synthetic user (``benchmarks.synthetic``) with
+that many transactions is generated, then each engine runs ``--repeat`` times
+after a warm-up call:
+
+* ``build_dashboard_summary``
+* ``generate_analysis`` (its snapshot insert is rolled back after each run)
+* ``_build_weekly_snapshot`` for the current week
+* ``_generate_action`` from that snapshot
+* ``_compute_monthly_expenses`` over the month's transactions (no queries;
+  its columnar inputs are loaded once, outside the timing)
+
+The session is cleared before every run, like a fresh request. Query counts
+come from the same hooks as the ``Server-Timing`` header. Peak memory is
+measured with ``tracemalloc`` in one extra run, since tracing slows the code
+down too much to time it at the same time.
+
+Results are written as JSON (``--output``, by default
+``benchmarks/results/financial_engines-<commit>.json``) so runs can be
+compared across commits:
+
+    python -m benchmarks.financial_engines --sizes 1000,10000,100000,1000000
+    python -m benchmarks.financial_engines --compare benchmarks/results/financial_engines-<base>.json
+
+With ``--compare``, the exit status is 1 when any engine's median latency
+grew by more than ``--tolerance`` over the baseline at the same size.
+In-memory SQLite is the default; pass ``--database-url`` for a scratch Postgres
+database to include real round trips.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+import benchmarks  # noqa: F401  (sets env defaults)
+import sqlalchemy
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base, QueryStats, current_query_stats, instrument_queries
+from app.models.expense import Expense
+from app.services.analysis import generate_analysis
+from app.services.columnar import load_transactions
+from app.services.financial import _compute_monthly_expenses, build_dashboard_summary
+from app.services.queries import rows_for_user
+from app.services.weekly_review import _build_weekly_snapshot, _generate_action
+from benchmarks.synthetic import generate_user
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+KEYS = ("engine", "transactions")
+
+
+def _git(*args: str) -> str | None:
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _engines(db: Session, user) -> dict:
+    today = date.today()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+    snapshot = _build_weekly_snapshot(db, user, week_start, week_end)
+    expenses = rows_for_user(db, Expense, user.id)
+    month_txns = load_transactions(db, user.id, today.replace(day=1), today)
+
+    def analysis():
+        generate_analysis(db, user)
+        db.rollback()
+
+    return {
+        "build_dashboard_summary": lambda: build_dashboard_summary(db, user),
+        "generate_analysis": analysis,
+        "_build_weekly_snapshot": lambda: _build_weekly_snapshot(db, user, week_start, week_end),
+        "_generate_action": lambda: _generate_action(db, user, snapshot, week_start),
+        "_compute_monthly_expenses": lambda: _compute_monthly_expenses(expenses, month_txns),
+    }
+
+
+def _measure(db: Session, fn, repeat: int) -> dict:
+    fn()  # warm-up: compiled-statement cache, imports
+    timings = []
+    stats = QueryStats()
+    for _ in range(repeat):
+        db.expunge_all()
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            fn()
+        finally:
+            timings.append(time.perf_counter() - started)
+            current_query_stats.reset(token)
+
+    db.expunge_all()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "ms_median": round(statistics.median(timings) * 1000, 3),
+        "ms_p95": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+        "ms_min": round(timings[0] * 1000, 3),
+        "queries": stats.count,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _compare(results: list[dict], baseline_path: str, tolerance: float) -> bool:
+    baseline = {tuple(row[k] for k in KEYS): row for row in json.loads(Path(baseline_path).read_text())["results"]}
+    regressed = False
+    for row in results:
+        before = baseline.get(tuple(row[k] for k in KEYS))
+        if before is None or not before["ms_median"]:
+            continue
+        ratio = row["ms_median"] / before["ms_median"]
+        slower = ratio > 1 + tolerance
+        regressed |= slower
+        print(
+            {
+                "engine": row["engine"],
+                "transactions": row["transactions"],
+                "ms_median": f"{before['ms_median']} -> {row['ms_median']}",
+                "ratio": round(ratio, 2),
+                "queries": f"{before['queries']} -> {row['queries']}",
+                "regressed": slower,
+            }
+        )
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000", help="comma-separated transaction counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--days", type=int, default=365, help="history the transactions are spread over")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--database-url", default="sqlite://", help="in-memory SQLite, or a scratch database")
+    parser.add_argument("--output", help="where to write the JSON results")
+    parser.add_argument("--compare", help="a previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed median slowdown with --compare")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    engine = instrument_queries(create_engine(args.database_url))
+    Base.metadata.create_all(engine)
+
+    results = []
+    with Session(engine, expire_on_commit=False) as db:
+        for n, size in enumerate(sizes):
+            started = time.perf_counter()
+            user = generate_user(db, seed=args.seed + n, transactions=size, days=args.days)
+            print(f"generated {size:,} transactions in {time.perf_counter() - started:.1f}s", flush=True)
+            for name, fn in _engines(db, user).items():
+                row = {"engine": name, "transactions": size, **_measure(db, fn, args.repeat)}
+                results.append(row)
+                print(row, flush=True)
+
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    document = {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "dialect": engine.dialect.name,
+            "machine": platform.machine(),
+            "seed": args.seed,
+            "days": args.days,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / f"financial_engines-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(document, indent=2) + "\n")
+    print(f"wrote {output}")
+
+    if args.compare and _compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
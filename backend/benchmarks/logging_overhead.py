@@ -0,0 +1,97 @@
+"""Per-call cost of ``logger.info`` on the request thread, by logging setup.
+
+Compares the previous synchronous text ``StreamHandler`` with a synchronous
+JSON handler and with the queue handler from ``app.logging_config`` (JSON
+formatting and I/O on the listener thread). The sink simulates a stdout pipe
+that takes ``--sink-latency-us`` per write, as a busy log collector does; with
+``--sink-latency-us 0`` it is ``/dev/null``.
+
+The last case logs a burst into a deliberately small queue to show the
+bounded behaviour: the caller keeps its cost and the overflow is dropped and
+counted instead of stalling requests.
+
+    python -m benchmarks.logging_overhead --iterations 20000 --sink-latency-us 50
+"""
+
+import argparse
+import logging
+import os
+import queue
+import time
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.logging_config import (
+    TEXT_FORMAT,
+    BoundedQueueHandler,
+    DrainingQueueListener,
+    JSONFormatter,
+    RequestContextFilter,
+)
+
+
+class SlowSink:
+    def __init__(self, latency_seconds: float):
+        self.latency_seconds = latency_seconds
+        self._devnull = open(os.devnull, "w")
+
+    def write(self, text: str) -> int:
+        if self.latency_seconds:
+            # Sleep rather than spin: a blocked pipe write releases the GIL.
+            time.sleep(self.latency_seconds)
+        return self._devnull.write(text)
+
+    def flush(self) -> None:
+        self._devnull.flush()
+
+
+def _logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(f"benchmark.{name}")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+def _time_calls(logger: logging.Logger, iterations: int) -> float:
+    started = time.perf_counter()
+    for n in range(iterations):
+        logger.info("Imported %d transactions for account %s", n, "acct-42")
+    return (time.perf_counter() - started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--sink-latency-us", type=float, default=50.0)
+    parser.add_argument("--burst-queue-size", type=int, default=1_000)
+    args = parser.parse_args()
+    sink = SlowSink(args.sink_latency_us / 1e6)
+
+    def stream(formatter: logging.Formatter) -> logging.Handler:
+        handler = logging.StreamHandler(sink)
+        handler.setFormatter(formatter)
+        return handler
+
+    results = []
+    for label, formatter in (("sync text", logging.Formatter(TEXT_FORMAT)), ("sync json", JSONFormatter())):
+        handler = stream(formatter)
+        handler.addFilter(RequestContextFilter())
+        per_call = _time_calls(_logger(label, handler), args.iterations)
+        results.append({"case": label, "us_per_call": round(per_call * 1e6, 2), "dropped": 0})
+
+    for label, queue_size in (("queue json", args.iterations), ("queue json, burst", args.burst_queue_size)):
+        handler = BoundedQueueHandler(queue.Queue(queue_size), block_seconds=0.1)
+        handler.addFilter(RequestContextFilter())
+        listener = DrainingQueueListener(handler.queue, stream(JSONFormatter()))
+        listener.start()
+        per_call = _time_calls(_logger(label, handler), args.iterations)
+        listener.stop()  # drains the queue; not part of the caller's cost
+        results.append({"case": label, "us_per_call": round(per_call * 1e6, 2), "dropped": handler.dropped})
+
+    for row in results:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Login throughput benchmark for the Supabase password-sync path.
+
+Compares the legacy behaviour (re-hash the local password on every login)
+with the current one (check the HMAC fingerprint, and only re-hash when the
+copy is stale).
+Supabase itself is stubbed out, so the numbers isolate local bcrypt + DB work.
+
+    python -m benchmarks.login_throughput --logins 64 --concurrency 8
+"""
+
+import argparse
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from app.config import settings
+from app.services import auth as auth_service
+from app.utils.security import bcrypt_metrics, hash_password
+
+PASSWORD = "Benchmark-Passw0rd!"
+
+
+class _Query:
+    def __init__(self, user):
+        self._user = user
+
+    def filter(self, *args, **kwargs):
+        return self
+
+    def first(self):
+        return self._user
+
+
+class _Session:
+    def __init__(self, user):
+        self._user = user
+        self.commits = 0
+
+    def query(self, model):
+        return _Query(self._user)
+
+    def add(self, obj):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+    def refresh(self, obj):
+        pass
+
+
+def _run(mode: str, logins: int, concurrency: int) -> dict:
+    user_id = uuid.uuid4()
+    email = "bench@example.com"
+    users = [
+        SimpleNamespace(
+            id=user_id,
+            email=f"{i}-{email}",
+            hashed_password=hash_password(PASSWORD),
+            password_sync_fingerprint=None,
+        )
+        for i in range(concurrency)
+    ]
+
+    def fake_sign_in(email: str, password: str) -> dict:
+        return {"user": {"id": str(user_id)}}
+
+    auth_service.sign_in_with_password = fake_sign_in
+    if mode == "legacy":
+        auth_service._refresh_local_password_hash = auth_service._sync_local_password_hash
+
+    sessions = [_Session(u) for u in users]
+
+    def login(i: int) -> None:
+        session = sessions[i % concurrency]
+        auth_service.authenticate_user(session, session._user.email, PASSWORD)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "logins": logins,
+        "seconds": round(elapsed, 3),
+        "logins_per_sec": round(logins / elapsed, 1),
+        "commits": sum(s.commits for s in sessions),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mode", choices=["legacy", "current", "both"], default="both")
+    args = parser.parse_args()
+
+    settings.supabase_url = "http://supabase.invalid"
+    settings.supabase_anon_key = "anon"
+
+    original_refresh = auth_service._refresh_local_password_hash
+    modes = ["legacy", "current"] if args.mode == "both" else [args.mode]
+    for mode in modes:
+        auth_service._refresh_local_password_hash = original_refresh
+        print(_run(mode, args.logins, args.concurrency))
+    print("bcrypt:", bcrypt_metrics())
+
+
+if __name__ == "__main__":
+    main()
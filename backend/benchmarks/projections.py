@@ -0,0 +1,68 @@
+"""Monte Carlo projection cost by horizon and path count.
+
+Times ``simulate`` for each ``--years`` and ``--paths`` combination on fixed
+inputs with a volatile income, investments and an installment plan, after a
+warm-up call. One line per case, with the median time and the size of the
+largest per-path array the simulation allocates.
+
+    python -m benchmarks.projections --years 1,10,30 --paths 1000,2000,10000
+"""
+
+import argparse
+import statistics
+import time
+from datetime import date
+
+import benchmarks  # noqa: F401  (sets env defaults)
+
+from app.services.projections import ProjectionGoal, ProjectionInputs, simulate
+
+INPUTS = ProjectionInputs(
+    start=date(2026, 10, 19),
+    cash=1_500_000,
+    invested=4_000_000,
+    card_debt=250_000,
+    monthly_contribution=50_000,
+    recurring_monthly=210_000,
+    installments=((12_500, 20), (4_000, 7)),
+    income_history=(520_000, 480_000, 610_000, 505_000, 0, 530_000, 515_000, 700_000, 490_000, 500_000),
+    spending_history=(410_000, 380_000, 455_000, 400_000, 320_000, 430_000, 415_000, 470_000, 395_000, 405_000),
+    goals=(
+        ProjectionGoal("house", "House", 6_000_000, date(2031, 6, 1)),
+        ProjectionGoal("trip", "Trip", 400_000, date(2027, 5, 1)),
+        ProjectionGoal("fund", "Emergency fund", 1_200_000, None),
+    ),
+)
+
+
+def _ints(value: str) -> list[int]:
+    return [int(part) for part in value.split(",")]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=_ints, default=[1, 10, 30])
+    parser.add_argument("--paths", type=_ints, default=[1_000, 2_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for years in args.years:
+        for paths in args.paths:
+            simulate(INPUTS, years, paths, seed=0)  # warm up
+            timings = []
+            for seed in range(args.repeat):
+                started = time.perf_counter()
+                simulate(INPUTS, years, paths, seed)
+                timings.append(time.perf_counter() - started)
+            print(
+                {
+                    "years": years,
+                    "paths": paths,
+                    "median_ms": round(statistics.median(timings) * 1e3, 2),
+                    "array_mb": round(paths * years * 12 * 8 / 1e6, 1),
+                }
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Per-request SQL construction/compilation overhead benchmark.
+
+Runs the dashboard's queries against an in-memory SQLite copy of the schema
+three ways:
+
+* legacy: ``db.query(Model).filter(...)`` rebuilt on every call (the previous
+  code), with the compiled cache available;
+* legacy, no cache: the same, compiling every statement from scratch;
+* prebuilt: the ``app.services.queries`` statements with bound parameters.
+
+and then times the whole ``build_dashboard_summary`` with the compiled cache
+on and off. SQLite keeps the database round trip near zero, so the numbers
+are almost entirely Python-side statement overhead.
+
+    python -m benchmarks.query_compile --iterations 2000
+"""
+
+import argparse
+import time
+import uuid
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base
+from app.models.account import Account
+from app.models.credit_card import CreditCard
+from app.models.expense import Expense
+from app.models.goal import Goal
+from app.models.installment_plan import InstallmentPlan
+from app.models.investment import Investment
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.services.financial import build_dashboard_summary
+from app.services.queries import latest_transactions, rows_for_user, transactions_between
+
+USER_MODELS = (Account, CreditCard, Investment, Expense, Goal, InstallmentPlan)
+
+
+def _seed(db: Session) -> User:
+    user = User(email="bench@example.com", hashed_password="x", full_name="Bench")
+    db.add(user)
+    db.flush()
+    account = Account(user_id=user.id, name="Chequing", account_type="chequing", balance=2500)
+    db.add(account)
+    db.add(CreditCard(user_id=user.id, name="Visa", credit_limit=5000, current_balance=1200, statement_day=1, due_day=20))
+    db.add(Expense(user_id=user.id, category="Housing", amount=1800, is_recurring=True, frequency="monthly"))
+    db.flush()
+    today = date.today()
+    for n in range(60):
+        db.add(
+            Transaction(
+                id=uuid.uuid4(),
+                user_id=user.id,
+                account_id=account.id,
+                amount=10 + n,
+                transaction_type=TransactionType.DEBIT if n % 5 else TransactionType.CREDIT,
+                category=("Food", "Transport", "Shopping")[n % 3],
+                date=today - timedelta(days=n),
+            )
+        )
+    db.commit()
+    return user
+
+
+def _legacy(db: Session, user: User) -> None:
+    today = date.today()
+    for model in USER_MODELS:
+        db.query(model).filter(model.user_id == user.id).all()
+    for start in (today.replace(day=1), today - timedelta(days=56)):
+        db.query(Transaction).filter(
+            Transaction.user_id == user.id, Transaction.date >= start, Transaction.date <= today
+        ).all()
+    (
+        db.query(Transaction)
+        .filter(Transaction.user_id == user.id)
+        .order_by(Transaction.date.desc(), Transaction.created_at.desc())
+        .limit(10)
+        .all()
+    )
+
+
+def _prebuilt(db: Session, user: User) -> None:
+    today = date.today()
+    for model in USER_MODELS:
+        rows_for_user(db, model, user.id)
+    for start in (today.replace(day=1), today - timedelta(days=56)):
+        transactions_between(db, user.id, start, today)
+    latest_transactions(db, user.id, 10)
+
+
+def _time(label: str, fn, iterations: int) -> dict:
+    fn()  # warm the compiled cache
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    per_call = (time.perf_counter() - started) / iterations
+    return {"case": label, "us_per_request": round(per_call * 1e6, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    args = parser.parse_args()
+
+    cached = create_engine("sqlite://")
+    uncached = create_engine("sqlite://", query_cache_size=0)
+    Base.metadata.create_all(cached)
+    Base.metadata.create_all(uncached)
+
+    with Session(cached) as db, Session(uncached) as cold_db:
+        user = _seed(db)
+        cold_user = _seed(cold_db)
+        results = [
+            _time("dashboard queries, legacy query()", lambda: _legacy(db, user), args.iterations),
+            _time("dashboard queries, legacy, no cache", lambda: _legacy(cold_db, cold_user), args.iterations),
+            _time("dashboard queries, prebuilt", lambda: _prebuilt(db, user), args.iterations),
+            _time("build_dashboard_summary", lambda: build_dashboard_summary(db, user), args.iterations),
+            _time(
+                "build_dashboard_summary, no cache",
+                lambda: build_dashboard_summary(cold_db, cold_user),
+                args.iterations,
+            ),
+        ]
+    for row in results:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
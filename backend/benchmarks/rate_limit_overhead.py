@@ -0,0 +1,93 @@
+"""Rate-limit overhead benchmark.
+
+Measures the cost of a single limiter hit and the memory retained per key for
+slowapi's stock fixed-window storage and the GCRA stores, then the end-to-end
+per-request overhead of the rate-limit middleware on a trivial route.
+
+    python -m benchmarks.rate_limit_overhead --keys 50000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+
+from app.middleware.rate_limit import GCRARateLimiter, InMemoryGCRAStore, RedisGCRAStore
+
+
+def _bench_strategy(name: str, limiter, keys: int) -> dict:
+    item = parse("300/minute")
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    started = time.perf_counter()
+    for i in range(keys):
+        limiter.hit(item, f"203.0.113.{i}")
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Hot key: repeated hits on one key, untraced.
+    started = time.perf_counter()
+    for _ in range(keys):
+        limiter.hit(item, "hot-client")
+    hot_elapsed = time.perf_counter() - started
+
+    return {
+        "strategy": name,
+        "us_per_new_key_hit": round(elapsed / keys * 1e6, 2),
+        "us_per_hot_key_hit": round(hot_elapsed / keys * 1e6, 2),
+        "bytes_per_key": round((current - baseline) / keys, 1),
+    }
+
+
+def _bench_requests(requests: int) -> dict:
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.middleware.rate_limit import limiter
+
+    client = TestClient(app)
+
+    def run() -> float:
+        started = time.perf_counter()
+        for i in range(requests):
+            client.get("/", headers={"x-forwarded-for": f"198.51.100.{i}"})
+        return (time.perf_counter() - started) / requests
+
+    limiter.enabled = False
+    disabled = run()
+    limiter.enabled = True
+    limiter.reset()
+    enabled = run()
+    return {
+        "us_per_request_without_limiter": round(disabled * 1e6, 1),
+        "us_per_request_with_limiter": round(enabled * 1e6, 1),
+        "overhead_us": round((enabled - disabled) * 1e6, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--keys", type=int, default=50_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    args = parser.parse_args()
+
+    print(_bench_strategy("fixed-window (limits MemoryStorage)", FixedWindowRateLimiter(MemoryStorage()), args.keys))
+    print(_bench_strategy("gcra (in-memory)", GCRARateLimiter(InMemoryGCRAStore()), args.keys))
+    try:
+        import fakeredis
+
+        store = RedisGCRAStore(fakeredis.FakeRedis())
+        print(_bench_strategy("gcra (fakeredis stand-in)", GCRARateLimiter(store), min(args.keys, 5_000)))
+    except ImportError:
+        print("fakeredis not installed; skipping shared-store benchmark")
+
+    print(_bench_requests(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""Response encoding cost per endpoint: stdlib JSON vs orjson vs bypass.
+
+Serves the two largest payloads three ways each from an in-process app and
+times full requests through ``TestClient``:
+
+* ``GET /transactions/?limit=200`` from an in-memory SQLite copy of a
+  synthetic user's data:
+  - ORM objects validated through ``list[TransactionResponse]``, stdlib
+    ``JSONResponse`` (the previous route);
+  - the same with ``ORJSONResponse``;
+  - column tuples straight to bytes with ``rows_response`` (the current route).
+* ``GET /dashboard/summary``, with the summary computed once up front so only
+  encoding is measured:
+  - validated through ``DashboardSummary``, stdlib ``JSONResponse``;
+  - the same with ``ORJSONResponse``;
+  - returned as an ``ORJSONResponse`` (the current route).
+
+    python -m benchmarks.response_serialization --iterations 500
+"""
+
+import argparse
+import time
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base
+from app.models.transaction import Transaction
+from app.responses import ORJSONResponse, rows_response
+from app.routers.transactions import _RESPONSE_COLUMNS
+from app.schemas.dashboard import DashboardSummary
+from app.schemas.transaction import TransactionResponse
+from app.services.financial import build_dashboard_summary
+from benchmarks.synthetic import generate_user
+
+PAGE = 200
+
+
+def _app(db: Session, user) -> FastAPI:
+    summary = build_dashboard_summary(db, user)
+    page = (
+        select(Transaction)
+        .where(Transaction.user_id == user.id)
+        .order_by(Transaction.date.desc(), Transaction.created_at.desc())
+        .limit(PAGE)
+    )
+    column_page = page.with_only_columns(*_RESPONSE_COLUMNS)
+    app = FastAPI()
+
+    @app.get("/stdlib/transactions", response_model=list[TransactionResponse], response_class=JSONResponse)
+    def stdlib_transactions():
+        return db.scalars(page).all()
+
+    @app.get("/orjson/transactions", response_model=list[TransactionResponse], response_class=ORJSONResponse)
+    def orjson_transactions():
+        return db.scalars(page).all()
+
+    @app.get("/bypass/transactions", response_model=list[TransactionResponse])
+    def bypass_transactions():
+        result = db.execute(column_page)
+        return rows_response(tuple(result.keys()), result)
+
+    @app.get("/stdlib/dashboard", response_model=DashboardSummary, response_class=JSONResponse)
+    def stdlib_dashboard():
+        return summary
+
+    @app.get("/orjson/dashboard", response_model=DashboardSummary, response_class=ORJSONResponse)
+    def orjson_dashboard():
+        return summary
+
+    @app.get("/bypass/dashboard", response_model=DashboardSummary)
+    def bypass_dashboard():
+        return ORJSONResponse(summary)
+
+    return app
+
+
+def _time(client: TestClient, db: Session, path: str, iterations: int) -> dict:
+    body = client.get(path).content  # warm up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        db.expunge_all()  # an empty identity map, as with a per-request session
+        client.get(path)
+    per_request = (time.perf_counter() - started) / iterations
+    return {"endpoint": path, "us_per_request": round(per_request * 1e6, 1), "bytes": len(body)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--transactions", type=int, default=5_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = generate_user(db, transactions=args.transactions)
+        client = TestClient(_app(db, user))
+        for payload in ("transactions", "dashboard"):
+            for variant in ("stdlib", "orjson", "bypass"):
+                print(_time(client, db, f"/{variant}/{payload}", args.iterations))
+
+
+if __name__ == "__main__":
+    main()
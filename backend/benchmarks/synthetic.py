@@ -0,0 +1,313 @@
+"""Seeded synthetic users for benchmarks.
+
+``generate_user`` writes one user with accounts, credit cards, investments,
+an installment plan, recurring and one-off expenses, goals, past weekly
+reviews and ``transactions`` transactions into any database with the app
+schema. The same seed and parameters always produce the same rows (ids
+included), so results stay comparable across runs and commits.
+
+Transactions follow rough real-world shapes rather than uniform noise:
+
+* biweekly paycheques and one debit per month for each monthly recurring
+  expense, with the expense's category and description (so the recurring
+  de-duplication in ``_compute_monthly_expenses`` has real matches to find);
+* the rest drawn from weighted spending categories with log-normal amounts
+  (many small grocery and coffee charges, a few large travel ones) and more
+  activity on Fridays and Saturdays, spread over the last ``days`` days.
+
+Seeding a scratch database from the command line:
+
+    python -m benchmarks.synthetic --database-url postgresql://... --users 10 --transactions 100000
+"""
+
+import argparse
+import math
+import random
+import uuid
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base
+from app.models.account import Account
+from app.models.credit_card import CreditCard
+from app.models.expense import Expense
+from app.models.goal import Goal
+from app.models.installment_plan import InstallmentPlan
+from app.models.investment import Investment
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.weekly_review import WeeklyReview
+
+INSERT_CHUNK = 10_000
+
+# category: (relative frequency, median amount, log-normal sigma)
+SPENDING_CATEGORIES = {
+    "Groceries": (22, 45.0, 0.6),
+    "Dining": (16, 28.0, 0.5),
+    "Coffee": (10, 6.0, 0.3),
+    "Transport": (10, 18.0, 0.7),
+    "Shopping": (12, 60.0, 0.9),
+    "Entertainment": (7, 35.0, 0.6),
+    "Health": (5, 50.0, 0.8),
+    "Utilities": (4, 90.0, 0.4),
+    "Subscriptions": (5, 15.0, 0.4),
+    "Travel": (2, 400.0, 0.9),
+    "Gifts": (3, 70.0, 0.7),
+    "Fees": (4, 8.0, 0.5),
+}
+# Monday first; Friday and Saturday are the busiest.
+WEEKDAY_WEIGHTS = (0.8, 0.8, 0.85, 0.9, 1.2, 1.3, 1.0)
+
+RECURRING_EXPENSES = (
+    ("Housing", "Rent", 1850.0),
+    ("Utilities", "Hydro", 95.0),
+    ("Utilities", "Internet", 80.0),
+    ("Subscriptions", "Streaming", 17.0),
+    ("Transport", "Transit pass", 156.0),
+    ("Health", "Gym", 45.0),
+    ("Insurance", "Tenant insurance", 30.0),
+    ("Subscriptions", "Phone", 65.0),
+)
+
+
+def synthetic_email(seed: int) -> str:
+    return f"synthetic-{seed}@example.com"
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _amount(rng: random.Random, median: float, sigma: float) -> float:
+    return round(max(rng.lognormvariate(math.log(median), sigma), 0.5), 2)
+
+
+def _spending_day(rng: random.Random, today: date, days: int) -> date:
+    peak = max(WEEKDAY_WEIGHTS)
+    while True:
+        day = today - timedelta(days=rng.randrange(days))
+        if rng.random() * peak < WEEKDAY_WEIGHTS[day.weekday()]:
+            return day
+
+
+def _insert(db: Session, model, rows: list[dict]) -> None:
+    for offset in range(0, len(rows), INSERT_CHUNK):
+        db.execute(insert(model), rows[offset : offset + INSERT_CHUNK])
+
+
+def _transactions(rng, user_id, account_ids, recurring, count, today, days) -> list[dict]:
+    chequing = account_ids[0]
+    rows = []
+
+    def add(account_id, amount, kind, category, description, day):
+        rows.append(
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "account_id": account_id,
+                "amount": amount,
+                "transaction_type": kind,
+                "category": category,
+                "description": description,
+                "date": day,
+            }
+        )
+
+    # Structured income and bills first, never more than a fifth of the rows.
+    budget = count // 5
+    payday = today - timedelta(days=today.weekday() + 3)
+    while len(rows) < budget and (today - payday).days < days:
+        add(chequing, 2650.0, "credit", "Income", "Payroll deposit", payday)
+        payday -= timedelta(days=14)
+    month = today.replace(day=1)
+    while len(rows) < budget and (today - month).days < days:
+        for category, description, amount in recurring:
+            if len(rows) < budget:
+                add(chequing, amount, "debit", category, description, month + timedelta(days=rng.randrange(3)))
+        month = (month - timedelta(days=1)).replace(day=1)
+
+    names = list(SPENDING_CATEGORIES)
+    weights = [SPENDING_CATEGORIES[name][0] for name in names]
+    for category in rng.choices(names, weights=weights, k=count - len(rows)):
+        _, median, sigma = SPENDING_CATEGORIES[category]
+        account_id = account_ids[rng.randrange(len(account_ids))]
+        add(account_id, _amount(rng, median, sigma), "debit", category, f"{category} purchase", _spending_day(rng, today, days))
+    return rows
+
+
+def generate_user(
+    db: Session,
+    *,
+    seed: int = 0,
+    transactions: int = 1_000,
+    accounts: int = 3,
+    cards: int = 2,
+    expenses: int = 10,
+    goals: int = 3,
+    investments: int = 2,
+    weekly_reviews: int = 8,
+    days: int = 365,
+    today: date | None = None,
+    hashed_password: str = "x",
+) -> User:
+    """Insert one synthetic user and everything they own, and commit."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    user_id = _uuid(rng)
+
+    db.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "email": synthetic_email(seed),
+                "hashed_password": hashed_password,
+                "full_name": f"Synthetic {seed}",
+            }
+        ],
+    )
+    account_types = ["chequing", "savings"] + ["chequing"] * max(accounts - 2, 0)
+    account_rows = [
+        {
+            "id": _uuid(rng),
+            "user_id": user_id,
+            "name": f"{kind.title()} {n + 1}",
+            "account_type": kind,
+            "balance": _amount(rng, 4000.0, 0.8),
+        }
+        for n, kind in enumerate(account_types[:accounts])
+    ]
+    _insert(db, Account, account_rows)
+    _insert(
+        db,
+        CreditCard,
+        [
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "name": f"Card {n + 1}",
+                "credit_limit": limit,
+                "current_balance": round(limit * rng.uniform(0.05, 0.9), 2),
+                "statement_day": rng.randint(1, 28),
+                "due_day": rng.randint(1, 28),
+                "apr": rng.choice((19.99, 20.99, 22.99)),
+            }
+            for n, limit in enumerate(rng.choice((2000, 5000, 10000)) for _ in range(cards))
+        ],
+    )
+    _insert(
+        db,
+        Investment,
+        [
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "investment_type": rng.choice(("tfsa", "rrsp", "brokerage")),
+                "current_value": _amount(rng, 15000.0, 1.0),
+                "book_value": _amount(rng, 12000.0, 1.0),
+                "monthly_contribution": rng.choice((0, 100, 250, 500)),
+            }
+            for _ in range(investments)
+        ],
+    )
+    _insert(
+        db,
+        InstallmentPlan,
+        [
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "description": "Laptop",
+                "total_amount": 1800,
+                "monthly_payment": 150,
+                "remaining_payments": rng.randint(1, 12),
+                "start_date": today - timedelta(days=90),
+            }
+        ],
+    )
+
+    recurring = RECURRING_EXPENSES[: min(expenses, len(RECURRING_EXPENSES))]
+    expense_rows = [
+        {
+            "id": _uuid(rng),
+            "user_id": user_id,
+            "category": category,
+            "description": description,
+            "amount": amount,
+            "is_recurring": True,
+            "frequency": "monthly",
+        }
+        for category, description, amount in recurring
+    ]
+    for _ in range(expenses - len(recurring)):
+        category = rng.choice(list(SPENDING_CATEGORIES))
+        expense_rows.append(
+            {"id": _uuid(rng), "user_id": user_id, "category": category, "amount": _amount(rng, 80.0, 0.8), "is_recurring": False}
+        )
+    _insert(db, Expense, expense_rows)
+
+    _insert(
+        db,
+        Goal,
+        [
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "title": f"Goal {n + 1}",
+                "goal_type": rng.choice(("save", "invest", "pay_off_debt")),
+                "target_amount": target,
+                "current_amount": round(target * rng.uniform(0, 0.8), 2),
+                "target_date": today + timedelta(days=rng.randint(20, 720)),
+            }
+            for n, target in enumerate(rng.choice((2000, 10000, 25000)) for _ in range(goals))
+        ],
+    )
+
+    this_week = today - timedelta(days=today.weekday())
+    review_rows = []
+    for n in range(1, weekly_reviews + 1):
+        week_start = this_week - timedelta(weeks=n)
+        snapshot = {"net_worth": _amount(rng, 20000.0, 0.3), "weekly_spending": _amount(rng, 600.0, 0.4)}
+        review_rows.append(
+            {
+                "id": _uuid(rng),
+                "user_id": user_id,
+                "week_start": week_start,
+                "week_end": week_start + timedelta(days=6),
+                "snapshot": snapshot,
+                "action_type": rng.choice(("pay_credit_card", "fund_goal", "reduce_spending")),
+                "action_title": "Synthetic action",
+                "action_status": "completed",
+            }
+        )
+    _insert(db, WeeklyReview, review_rows)
+
+    account_ids = [row["id"] for row in account_rows] or [None]
+    _insert(db, Transaction, _transactions(rng, user_id, account_ids, recurring, transactions, today, days))
+    db.commit()
+    return db.get(User, user_id)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="a scratch database; tables are created if missing")
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--transactions", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for n in range(args.users):
+            user = generate_user(db, seed=args.seed + n, transactions=args.transactions, days=args.days)
+            print({"user_id": str(user.id), "email": user.email, "transactions": args.transactions})
+
+
+if __name__ == "__main__":
+    main()
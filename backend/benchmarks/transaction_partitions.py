@@ -0,0 +1,157 @@
+"""Date-range scans on a plain vs. a month-partitioned transactions table.
+
+Builds two copies of a synthetic transactions dataset in a scratch
+``bench_partitions`` schema of a real Postgres database: a plain heap and a
+table partitioned like production (monthly ranges from
+``app.services.partitions``, optionally hash-subpartitioned by user). Each has
+a ``(user_id, date)`` index. It then runs the shapes of query the app issues
+under ``EXPLAIN (ANALYZE, BUFFERS)`` and reports the median execution time and
+buffers touched:
+
+* one user's month to date (dashboard, weekly review);
+* one user's last 56 days (spending trend);
+* one user's latest 10 transactions, no date bound (no pruning possible);
+* every user's spending by category for one month (batch analytics).
+
+Generating 50M rows takes a while and ~10 GB of disk; start smaller.
+
+    python -m benchmarks.transaction_partitions --rows 50000000 --users 200000
+"""
+
+import argparse
+import statistics
+from datetime import date, timedelta
+
+import benchmarks  # noqa: F401  (sets env defaults)
+from sqlalchemy import create_engine, text
+
+from app.config import settings
+from app.services.partitions import partition_statements
+from app.utils.dates import add_months, month_start
+
+SCHEMA = "bench_partitions"
+PLAIN = f"{SCHEMA}.txn_plain"
+PARTITIONED = f"{SCHEMA}.txn_part"
+CHUNK_ROWS = 1_000_000
+
+COLUMNS = """
+    id uuid NOT NULL,
+    account_id uuid NOT NULL,
+    user_id uuid NOT NULL,
+    amount numeric(12, 2) NOT NULL,
+    transaction_type text NOT NULL,
+    category varchar(100),
+    description varchar(500),
+    date date NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now()
+"""
+
+
+def _user_uuid(n) -> str:
+    return f"md5('user-' || ({n}))::uuid"
+
+
+def _create_tables(conn, first_month: date, months: int, hash_partitions: int) -> None:
+    conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+    conn.execute(text(f"CREATE TABLE {PLAIN} ({COLUMNS}, PRIMARY KEY (id))"))
+    conn.execute(text(f"CREATE TABLE {PARTITIONED} ({COLUMNS}, PRIMARY KEY (id, user_id, date)) PARTITION BY RANGE (date)"))
+    conn.execute(text(f"CREATE TABLE {PARTITIONED}_default PARTITION OF {PARTITIONED} DEFAULT"))
+    for n in range(months):
+        for statement in partition_statements(add_months(first_month, n), hash_partitions, table=PARTITIONED):
+            conn.execute(text(statement))
+
+
+def _load(conn, rows: int, users: int, first_month: date, days: int) -> None:
+    for offset in range(0, rows, CHUNK_ROWS):
+        count = min(CHUNK_ROWS, rows - offset)
+        conn.execute(
+            text(
+                f"INSERT INTO {PLAIN} (id, account_id, user_id, amount, transaction_type, category, date) "
+                f"SELECT gen_random_uuid(), {_user_uuid('i % :users')}, {_user_uuid('i % :users')}, "
+                "round((random() * 200)::numeric, 2), "
+                "CASE WHEN random() < 0.9 THEN 'debit' ELSE 'credit' END, "
+                "(ARRAY['Food', 'Transport', 'Shopping', 'Housing', 'Utilities'])[1 + (i % 5)], "
+                "CAST(:first AS date) + CAST(floor(random() * :days) AS int) "
+                "FROM generate_series(:start, :stop) AS i"
+            ),
+            {"users": users, "first": first_month, "days": days, "start": offset, "stop": offset + count - 1},
+        )
+        print(f"loaded {offset + count:,}/{rows:,} rows", flush=True)
+    conn.execute(text(f"INSERT INTO {PARTITIONED} SELECT * FROM {PLAIN}"))
+    for table in (PLAIN, PARTITIONED):
+        conn.execute(text(f"CREATE INDEX ON {table} (user_id, date)"))
+        conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def _explain(conn, sql: str, params: dict) -> tuple[float, int]:
+    plan = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()[0]
+    top = plan["Plan"]
+    return plan["Execution Time"], top.get("Shared Hit Blocks", 0) + top.get("Shared Read Blocks", 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=settings.effective_database_url)
+    parser.add_argument("--rows", type=int, default=50_000_000)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--hash-partitions", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--reuse", action="store_true", help="skip generation and reuse the existing tables")
+    parser.add_argument("--keep", action="store_true", help="leave the bench schema in place afterwards")
+    args = parser.parse_args()
+
+    last_month = month_start(date.today())
+    first_month = add_months(last_month, 1 - args.months)
+    days = (add_months(last_month, 1) - first_month).days
+
+    # No app engine: its statement timeout would cut the data load short.
+    engine = create_engine(args.database_url, isolation_level="AUTOCOMMIT")
+    with engine.connect() as conn:
+        if not args.reuse:
+            _create_tables(conn, first_month, args.months, args.hash_partitions)
+            _load(conn, args.rows, args.users, first_month, days)
+
+        today = add_months(last_month, 1) - timedelta(days=1)
+        user = conn.execute(text(f"SELECT {_user_uuid(':n')}"), {"n": args.users // 2}).scalar()
+        cases = [
+            (
+                "user month to date",
+                "SELECT * FROM {table} WHERE user_id = :user AND date >= :start AND date <= :end",
+                {"user": user, "start": last_month, "end": today},
+            ),
+            (
+                "user last 56 days",
+                "SELECT * FROM {table} WHERE user_id = :user AND date >= :start AND date <= :end",
+                {"user": user, "start": today - timedelta(days=56), "end": today},
+            ),
+            (
+                "user latest 10, unbounded",
+                "SELECT * FROM {table} WHERE user_id = :user ORDER BY date DESC LIMIT 10",
+                {"user": user},
+            ),
+            (
+                "all users, one month by category",
+                "SELECT category, sum(amount) FROM {table} WHERE date >= :start AND date < :end GROUP BY category",
+                {"start": last_month, "end": add_months(last_month, 1)},
+            ),
+        ]
+        for label, sql, params in cases:
+            for kind, table in (("plain", PLAIN), ("partitioned", PARTITIONED)):
+                runs = [_explain(conn, sql.format(table=table), params) for _ in range(args.repeat)]
+                print(
+                    {
+                        "case": label,
+                        "table": kind,
+                        "ms_median": round(statistics.median(ms for ms, _ in runs), 3),
+                        "buffers": runs[-1][1],
+                    }
+                )
+
+        if not args.keep:
+            conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+
+
+if __name__ == "__main__":
+    main()
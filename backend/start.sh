@@ -37,5 +37,11 @@ else
   echo "Skipping Alembic migrations (RUN_MIGRATIONS=${RUN_MIGRATIONS})."
 fi
 
+if [[ -n "${PROMETHEUS_MULTIPROC_DIR:-}" ]]; then
+  # Samples from a previous run would be merged into this one's.
+  rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+  mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 echo "Starting uvicorn on port ${PORT}..."
 exec uvicorn app.main:app --host 0.0.0.0 --port "${PORT}" --log-level info
@@ -0,0 +1,34 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401  (registers every table)
+from app.database import Base
+from app.models.user import User
+
+
+@pytest.fixture
+def db():
+    """A session on a fresh in-memory SQLite database with the full schema.
+
+    One shared connection, so sync routes can use it from the threadpool.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def make_user(db):
+    """Adds a user to ``db`` and flushes it, so it has an id."""
+
+    def make(email: str = "user@example.com") -> User:
+        user = User(email=email, hashed_password="x", full_name="Test")
+        db.add(user)
+        db.flush()
+        return user
+
+    return make
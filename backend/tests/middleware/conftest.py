@@ -0,0 +1,27 @@
+from collections.abc import Callable
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def middleware_client():
+    """Client factory for one ``GET /items/{item_id}`` route wrapped in *middleware*.
+
+    The route calls ``handler(item_id)``, if given, and returns ``{"id": item_id}``.
+    """
+
+    def make(middleware, handler: Callable[[int], object] | None = None, **options) -> TestClient:
+        app = FastAPI()
+        app.add_middleware(middleware, **options)
+
+        @app.get("/items/{item_id}")
+        def read_item(item_id: int):
+            if handler is not None:
+                handler(item_id)
+            return {"id": item_id}
+
+        return TestClient(app)
+
+    return make
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from prometheus_client import REGISTRY
+
+from app.metrics import record_csv_import
+from app.middleware.metrics import PrometheusMiddleware
+
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+
+def _latency_count(route: str, status: str) -> float:
+    value = REGISTRY.get_sample_value(
+        "finpulse_http_request_duration_seconds_count",
+        {"method": "GET", "route": route, "status": status},
+    )
+    return value or 0.0
+
+
+def test_latency_is_recorded_per_route_template(middleware_client):
+    client = middleware_client(PrometheusMiddleware)
+    before = _latency_count("/items/{item_id}", "200")
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    assert _latency_count("/items/{item_id}", "200") == before + 2
+    assert REGISTRY.get_sample_value("finpulse_http_requests_in_progress") == 0
+
+
+def test_unmatched_paths_share_one_label(middleware_client):
+    client = middleware_client(PrometheusMiddleware)
+    before = _latency_count("unmatched", "404")
+
+    client.get("/nope/1")
+    client.get("/nope/2")
+
+    assert _latency_count("unmatched", "404") == before + 2
+
+
+def test_csv_import_counters():
+    before = REGISTRY.get_sample_value("finpulse_csv_import_rows_total", {"outcome": "imported"}) or 0
+
+    record_csv_import(imported=40, duplicates=2, seconds=0.2)
+
+    assert REGISTRY.get_sample_value("finpulse_csv_import_rows_total", {"outcome": "imported"}) == before + 40
+
+
+_WORKER = """
+from app.metrics import observe_request
+observe_request("GET", "/api/v1/dashboard/summary", 200, 0.05)
+"""
+
+_SCRAPE = """
+from app.metrics import render_latest
+print(render_latest()[0].decode())
+"""
+
+
+def test_multiprocess_directory_aggregates_workers(tmp_path):
+    env = {
+        **os.environ,
+        "PROMETHEUS_MULTIPROC_DIR": str(tmp_path),
+        "DATABASE_URL": "postgresql://u:p@localhost/x",
+        "JWT_SECRET": "s",
+        "ENCRYPTION_KEY": "k",
+    }
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", _WORKER], cwd=BACKEND_ROOT, env=env, check=True)
+
+    scrape = subprocess.run(
+        [sys.executable, "-c", _SCRAPE], cwd=BACKEND_ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert (
+        'finpulse_http_request_duration_seconds_count{method="GET",route="/api/v1/dashboard/summary",status="200"} 2.0'
+        in scrape
+    )
@@ -0,0 +1,92 @@
+import json
+import time
+import uuid
+
+import pytest
+from jose import jwt
+
+from app.middleware.profiling import ProfilingMiddleware
+from app.profiling import HotStacks, profiled
+from app.utils.security import create_access_token
+
+
+@profiled("test_section")
+def crunch_numbers(ms: float) -> int:
+    deadline = time.perf_counter() + ms / 1000
+    total = 0
+    while time.perf_counter() < deadline:
+        total += 1
+    return total
+
+
+@pytest.fixture
+def profiled_client(middleware_client):
+    def make(**options):
+        return middleware_client(ProfilingMiddleware, lambda item_id: crunch_numbers(30), interval_ms=1, **options)
+
+    return make
+
+
+def _options(**overrides) -> dict:
+    return {"token": "", "user_ids": frozenset(), "sample_rate": 0.0, "stacks": HotStacks(), **overrides}
+
+
+def test_token_flag_returns_speedscope_profile(profiled_client):
+    client = profiled_client(**_options(token="secret"))
+
+    response = client.get("/items/1", headers={"X-Profile": "secret"})
+
+    assert response.status_code == 200
+    assert response.headers["x-profiled-status"] == "200"
+    document = response.json()
+    assert document["$schema"].startswith("https://www.speedscope.app/")
+    names = {frame["name"] for frame in document["shared"]["frames"]}
+    assert "crunch_numbers" in names
+    assert sum(len(p["samples"]) for p in document["profiles"]) > 0
+
+
+def test_wrong_token_is_not_profiled(profiled_client):
+    client = profiled_client(**_options(token="secret"))
+
+    response = client.get("/items/1?profile=guess")
+
+    assert response.json() == {"id": 1}
+    assert "x-profiled-status" not in response.headers
+
+
+def test_allow_listed_user_profiles_are_stored(profiled_client, tmp_path):
+    user_id = uuid.uuid4()
+    access_token = create_access_token(str(user_id))
+    client = profiled_client(**_options(user_ids=frozenset({str(user_id)}), output_dir=str(tmp_path)))
+
+    response = client.get("/items/2", headers={"Authorization": f"Bearer {access_token}"})
+
+    assert response.json() == {"id": 2}
+    [stored] = tmp_path.glob("*.speedscope.json")
+    assert json.loads(stored.read_text())["profiles"]
+
+
+def test_allow_list_reads_the_subject_without_verifying_the_token(profiled_client, tmp_path):
+    user_id = uuid.uuid4()
+    # Signed with a key this process cannot check (e.g. an unknown Supabase kid).
+    foreign_token = jwt.encode({"sub": str(user_id).upper()}, "someone-elses-key", algorithm="HS256")
+    client = profiled_client(**_options(user_ids=frozenset({str(user_id)}), output_dir=str(tmp_path)))
+
+    client.get("/items/3", headers={"Authorization": "Bearer not-a-jwt"})
+    assert not list(tmp_path.glob("*.speedscope.json"))
+
+    client.get("/items/3", headers={"Authorization": f"Bearer {foreign_token}"})
+    assert len(list(tmp_path.glob("*.speedscope.json"))) == 1
+
+
+def test_sampled_requests_aggregate_hot_stacks_per_route(profiled_client):
+    stacks = HotStacks()
+    client = profiled_client(**_options(sample_rate=1.0, stacks=stacks))
+
+    client.get("/items/1")
+    client.get("/items/2")
+
+    lines = stacks.collapsed().splitlines()
+    assert lines
+    assert all(line.startswith("GET /items/{item_id};") for line in lines)
+    assert any("crunch_numbers" in line for line in lines)
@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+import pytest
+from limits import parse
+
+from app.middleware.rate_limit import GCRARateLimiter, InMemoryGCRAStore, RedisGCRAStore, user_rate_limit_key
+from app.utils.security import create_access_token
+
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_gcra_allows_burst_then_refills_one_per_interval():
+    clock = FakeClock()
+    limiter = GCRARateLimiter(InMemoryGCRAStore(clock=clock))
+    item = parse("300/minute")
+
+    assert all(limiter.hit(item, "client") for _ in range(300))
+    assert not limiter.hit(item, "client")
+
+    clock.now += 0.2
+    assert limiter.hit(item, "client")
+    assert not limiter.hit(item, "client")
+
+
+def test_gcra_window_stats_report_remaining():
+    clock = FakeClock()
+    limiter = GCRARateLimiter(InMemoryGCRAStore(clock=clock))
+    item = parse("5/minute")
+
+    limiter.hit(item, "client")
+    limiter.hit(item, "client")
+
+    assert limiter.get_window_stats(item, "client").remaining == 3
+    assert limiter.test(item, "client")
+
+
+def test_in_memory_store_sweeps_idle_keys():
+    clock = FakeClock()
+    store = InMemoryGCRAStore(sweep_seconds=60, clock=clock)
+    limiter = GCRARateLimiter(store)
+    item = parse("10/minute")
+    for i in range(1000):
+        limiter.hit(item, f"client-{i}")
+    assert len(store) == 1000
+
+    clock.now += 120
+    limiter.hit(item, "fresh")
+    assert len(store) == 1
+
+
+def test_redis_store_is_shared_between_limiters():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    worker_a = GCRARateLimiter(RedisGCRAStore(fakeredis.FakeRedis(server=server)))
+    worker_b = GCRARateLimiter(RedisGCRAStore(fakeredis.FakeRedis(server=server)))
+    item = parse("4/minute")
+
+    assert worker_a.hit(item, "client")
+    assert worker_b.hit(item, "client")
+    assert worker_a.hit(item, "client")
+    assert worker_b.hit(item, "client")
+    assert not worker_a.hit(item, "client")
+    assert not worker_b.hit(item, "client")
+
+
+def _request(headers):
+    return SimpleNamespace(headers=headers, client=SimpleNamespace(host="10.0.0.1"))
+
+
+def test_user_key_uses_verified_token_subject():
+    token = create_access_token("user-123")
+    assert user_rate_limit_key(_request({"authorization": f"Bearer {token}"})) == "user:user-123"
+
+
+def test_user_key_falls_back_to_ip_for_invalid_token():
+    request = _request({"authorization": "Bearer forged", "x-forwarded-for": "1.2.3.4, 10.0.0.1"})
+    assert user_rate_limit_key(request) == "ip:1.2.3.4"
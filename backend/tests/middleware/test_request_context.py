@@ -0,0 +1,74 @@
+import json
+import logging
+
+import pytest
+
+from app.logging_config import JSONFormatter, RequestContextFilter, set_log_user
+from app.middleware.request_context import RequestContextMiddleware
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines: list[str] = []
+        self.addFilter(RequestContextFilter())
+        self.setFormatter(JSONFormatter())
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(self.format(record))
+
+
+@pytest.fixture
+def logged_client(middleware_client):
+    logger = logging.getLogger("finpulse.test_request_context")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    def log_item(item_id: int) -> None:
+        set_log_user("user-7")
+        logger.info("Loaded item %d", item_id)
+
+    def make(handler: logging.Handler):
+        logger.handlers[:] = [handler]
+        return middleware_client(RequestContextMiddleware, log_item)
+
+    return make
+
+
+def test_log_records_carry_request_fields_as_json(logged_client):
+    handler = _ListHandler()
+    client = logged_client(handler)
+
+    response = client.get("/items/3", headers={"X-Request-ID": "lb-abc123"})
+
+    assert response.headers["x-request-id"] == "lb-abc123"
+    record = json.loads(handler.lines[-1])
+    assert record["message"] == "Loaded item 3"
+    assert record["level"] == "INFO"
+    assert record["request_id"] == "lb-abc123"
+    assert record["user_id"] == "user-7"
+    assert record["route"] == "GET /items/{item_id}"
+    assert record["duration_ms"] >= 0
+
+
+def test_invalid_incoming_request_id_is_replaced(logged_client):
+    client = logged_client(_ListHandler())
+
+    response = client.get("/items/1", headers={"X-Request-ID": "bad id\twith spaces"})
+
+    request_id = response.headers["x-request-id"]
+    assert request_id != "bad id\twith spaces"
+    assert len(request_id) == 32
+
+
+def test_records_outside_a_request_have_no_request_fields():
+    handler = _ListHandler()
+    logger = logging.getLogger("finpulse.test_request_context.outside")
+    logger.handlers[:] = [handler]
+    logger.propagate = False
+
+    logger.warning("startup")
+
+    record = json.loads(handler.lines[-1])
+    assert "request_id" not in record
+    assert record["message"] == "startup"
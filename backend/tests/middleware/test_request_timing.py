@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from app.database import QueryStats, instrument_queries
+from app.middleware.timing import RequestTimingMiddleware
+
+
+@pytest.fixture
+def timed_client(middleware_client):
+    engine = instrument_queries(create_engine("sqlite://"))
+
+    def run_queries(count: int) -> None:
+        with engine.connect() as conn:
+            for _ in range(count):
+                conn.execute(text("SELECT 1"))
+
+    def make(**middleware_options):
+        return middleware_client(RequestTimingMiddleware, run_queries, **middleware_options)
+
+    yield make
+    engine.dispose()
+
+
+def test_server_timing_header_reports_statement_count(timed_client):
+    client = timed_client(slow_request_ms=10_000, statement_warn_threshold=100)
+
+    response = client.get("/items/3")
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("app;dur=")
+    assert 'db;dur=' in timing and 'desc="3 queries"' in timing
+
+
+def test_flags_requests_over_the_statement_threshold(timed_client, caplog):
+    client = timed_client(slow_request_ms=10_000, statement_warn_threshold=5)
+
+    with caplog.at_level(logging.WARNING, logger="finpulse.request_timing"):
+        client.get("/items/4")
+        assert not caplog.records
+        client.get("/items/6")
+
+    [record] = caplog.records
+    assert "GET /items/{item_id} issued 6 SQL statements" in record.getMessage()
+
+
+def test_slow_requests_log_their_slowest_statements(timed_client, caplog):
+    client = timed_client(slow_request_ms=0, statement_warn_threshold=100, top_statements=2)
+
+    with caplog.at_level(logging.WARNING, logger="finpulse.request_timing"):
+        client.get("/items/5")
+
+    message = caplog.records[0].getMessage()
+    assert message.startswith("Slow request GET /items/{item_id} -> 200")
+    assert "5 statements" in message
+    assert message.count("SELECT 1") == 2
+
+
+def test_query_stats_keeps_only_the_slowest():
+    stats = QueryStats(keep_slowest=2)
+    for seconds, sql in ((0.1, "a"), (0.5, "b"), (0.2, "c"), (0.05, "d")):
+        stats.add(sql, seconds)
+
+    assert stats.count == 4
+    assert round(stats.seconds, 2) == 0.85
+    assert stats.slowest() == [(0.5, "b"), (0.2, "c")]
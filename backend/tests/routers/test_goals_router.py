@@ -0,0 +1,50 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, update
+
+from app.database import get_db
+from app.dependencies import get_current_user
+from app.models.goal import Goal
+from app.models.goal_contribution import GoalContribution
+from app.routers import goals
+
+
+@pytest.fixture
+def client(db, make_user):
+    user = make_user()
+    app = FastAPI()
+    app.include_router(goals.router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: user
+    with TestClient(app) as client:
+        yield client
+
+
+def test_goal_created_at_zero_gets_a_pace_from_its_first_contribution(client, db):
+    target_date = date.today() + timedelta(days=120)
+    created = client.post(
+        "/goals/",
+        json={"title": "Trip", "goal_type": "save", "target_amount": 1000, "target_date": target_date.isoformat()},
+    )
+    assert created.status_code == 201
+    goal_id = created.json()["id"]
+
+    opening = db.scalars(select(GoalContribution)).all()
+    assert [(float(e.amount), float(e.balance)) for e in opening] == [(0.0, 0.0)]
+
+    # A month passes before the first contribution.
+    month_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    db.execute(update(GoalContribution).values(recorded_at=month_ago))
+    db.execute(update(Goal).values(created_at=month_ago))
+    db.commit()
+
+    updated = client.patch(f"/goals/{goal_id}", json={"current_amount": 300})
+
+    assert updated.status_code == 200
+    body = updated.json()
+    assert body["monthly_rate"] == pytest.approx(300 / 30 * 365.25 / 12, rel=0.01)
+    assert body["projected_completion"] is not None
+    assert body["on_track"] is True
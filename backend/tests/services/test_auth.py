@@ -0,0 +1,60 @@
+import pytest
+
+from app.config import settings
+from app.services import auth
+from app.utils import security
+
+
+@pytest.fixture
+def supabase_login(monkeypatch):
+    """Supabase mode with sign-in stubbed out; counts every bcrypt hash."""
+    monkeypatch.setattr(settings, "supabase_url", "http://supabase.invalid")
+    monkeypatch.setattr(settings, "supabase_anon_key", "anon")
+    hashes = []
+    real_hash = security.hash_password
+
+    def counting_hash(password):
+        hashes.append(password)
+        return real_hash(password)
+
+    monkeypatch.setattr(auth, "hash_password", counting_hash)
+    monkeypatch.setattr(auth, "verify_password", lambda *args: pytest.fail("bcrypt verify on Supabase login"))
+    return hashes
+
+
+def _login(db, user, password, monkeypatch):
+    monkeypatch.setattr(auth, "sign_in_with_password", lambda email, pw: {"user": {"id": str(user.id)}})
+    return auth.authenticate_user(db, user.email, password)
+
+
+def test_supabase_login_with_current_password_does_not_rehash(db, make_user, supabase_login, monkeypatch):
+    user = make_user()
+    auth._sync_local_password_hash(db, user, "Passw0rd!")
+    supabase_login.clear()
+
+    for _ in range(3):
+        assert _login(db, user, "Passw0rd!", monkeypatch) is user
+
+    assert supabase_login == []
+
+
+def test_supabase_password_change_rehashes_exactly_once(db, make_user, supabase_login, monkeypatch):
+    user = make_user()
+    auth._sync_local_password_hash(db, user, "Passw0rd!")
+    supabase_login.clear()
+
+    # The password was changed in Supabase; the local copy is stale.
+    for _ in range(3):
+        _login(db, user, "N3w-Passw0rd!", monkeypatch)
+
+    assert supabase_login == ["N3w-Passw0rd!"]
+    assert security.verify_password("N3w-Passw0rd!", user.hashed_password)
+
+
+def test_user_without_fingerprint_is_rehashed_once(db, make_user, supabase_login, monkeypatch):
+    user = make_user()
+
+    for _ in range(2):
+        _login(db, user, "Passw0rd!", monkeypatch)
+
+    assert supabase_login == ["Passw0rd!"]
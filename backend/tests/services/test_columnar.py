@@ -0,0 +1,96 @@
+import random
+from datetime import date, timedelta
+
+from app.models.transaction import TransactionType
+from app.services.columnar import TransactionColumns
+from app.services.financial import _category_label
+
+TODAY = date(2026, 10, 14)
+CATEGORIES = ["Groceries", " Dining ", "Dining", None, "", "Rent"]
+DESCRIPTIONS = ["Rent", "Coffee", None, "", "Payroll"]
+
+
+def _rows(n: int, seed: int = 0) -> list[tuple]:
+    rng = random.Random(seed)
+    return [
+        (
+            rng.choice(list(TransactionType)),
+            rng.choice(CATEGORIES),
+            rng.choice(DESCRIPTIONS),
+            TODAY - timedelta(days=rng.randrange(90)),
+            rng.randrange(1, 50_000),
+        )
+        for _ in range(n)
+    ]
+
+
+def _category_totals(rows, kind, label) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for row_kind, category, _, _, amount in rows:
+        if row_kind == kind:
+            totals[label(category)] = totals.get(label(category), 0) + amount
+    return totals
+
+
+def test_totals_and_windows_match_python_sums():
+    rows = _rows(2_000)
+    columns = TransactionColumns.from_rows(rows)
+    start, end = TODAY - timedelta(days=30), TODAY - timedelta(days=7)
+    window = [row for row in rows if start <= row[3] <= end]
+
+    for kind in TransactionType:
+        assert columns.total(kind) == sum(row[4] for row in rows if row[0] == kind)
+        assert columns.between(start, end).total(kind) == sum(row[4] for row in window if row[0] == kind)
+    assert len(columns.between(start, end)) == len(window)
+
+
+def test_weekly_totals_match_python_buckets():
+    rows = _rows(2_000, seed=1)
+    first_week = TODAY - timedelta(days=TODAY.weekday() + 7 * 5)
+    expected = [0] * 6
+    for kind, _, _, day, amount in rows:
+        week = (day - first_week).days // 7
+        if kind == TransactionType.DEBIT and 0 <= week < 6:
+            expected[week] += amount
+
+    assert TransactionColumns.from_rows(rows).weekly_totals(TransactionType.DEBIT, first_week, 6) == expected
+
+
+def test_monthly_totals_match_python_buckets():
+    rows = _rows(2_000, seed=4)
+    month_starts = [date(2026, 7, 1), date(2026, 8, 1), date(2026, 9, 1), date(2026, 10, 1)]
+    expected = [0, 0, 0]
+    for kind, _, _, day, amount in rows:
+        if kind == TransactionType.CREDIT and month_starts[0] <= day < month_starts[-1]:
+            expected[day.month - 7] += amount
+
+    assert TransactionColumns.from_rows(rows).monthly_totals(TransactionType.CREDIT, month_starts) == expected
+
+
+def test_category_totals_keep_first_appearance_order():
+    rows = _rows(500, seed=2)
+    columns = TransactionColumns.from_rows(rows).between(TODAY - timedelta(days=20), TODAY)
+    window = [row for row in rows if row[3] >= TODAY - timedelta(days=20)]
+
+    for label in (_category_label, lambda category: category or "Uncategorized"):
+        totals = columns.category_totals(TransactionType.DEBIT, label)
+        expected = _category_totals(window, TransactionType.DEBIT, label)
+        assert list(totals.items()) == list(expected.items())
+
+
+def test_labels_are_the_distinct_category_description_pairs():
+    rows = _rows(500, seed=3)
+    columns = TransactionColumns.from_rows(rows)
+
+    assert columns.labels(TransactionType.CREDIT) == {
+        (category, description) for kind, category, description, _, _ in rows if kind == TransactionType.CREDIT
+    }
+
+
+def test_empty_columns_aggregate_to_zero():
+    columns = TransactionColumns.from_rows([])
+
+    assert columns.total(TransactionType.DEBIT) == 0
+    assert columns.weekly_totals(TransactionType.DEBIT, TODAY, 3) == [0, 0, 0]
+    assert columns.category_totals(TransactionType.DEBIT, _category_label) == {}
+    assert columns.labels(TransactionType.DEBIT) == set()
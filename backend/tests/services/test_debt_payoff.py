@@ -0,0 +1,145 @@
+import random
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import debt_payoff
+from app.services.debt_payoff import (
+    CREDIT_CARD,
+    INSTALLMENT,
+    Debt,
+    build_payoff_plan,
+    minimum_payment,
+    plan_payoff,
+)
+
+TODAY = date(2026, 10, 19)
+
+
+def _card(name: str, balance: int, apr: float, limit: int, min_pct: float = 2.0) -> Debt:
+    return Debt(name, CREDIT_CARD, balance, apr, min_pct, limit, None)
+
+
+def _installment(name: str, payment: int, remaining: int) -> Debt:
+    return Debt(name, INSTALLMENT, payment * remaining, 0.0, 0.0, None, payment)
+
+
+def _reference(debts: list[Debt], budget: int, strategy: str) -> list[list[int]]:
+    """Monthly payments per debt, one debt at a time in plain Python."""
+    balances = [debt.balance for debt in debts]
+    by_apr = sorted(range(len(debts)), key=lambda i: -debts[i].apr)
+    order = sorted(range(len(debts)), key=lambda i: balances[i]) if strategy == "snowball" else by_apr
+    by_utilization = sorted(
+        range(len(debts)), key=lambda i: -(balances[i] / debts[i].credit_limit if debts[i].credit_limit else 0)
+    )
+    schedule = []
+    while any(balances) and len(schedule) < debt_payoff.MAX_MONTHS:
+        payments = []
+        for i, debt in enumerate(debts):
+            balances[i] += round(balances[i] * (debt.apr / 100 / 12))
+            if debt.kind == CREDIT_CARD:
+                payments.append(min(balances[i], max(round(balances[i] * (debt.min_payment_pct / 100)), 1_000)))
+            else:
+                payments.append(min(balances[i], debt.fixed_payment))
+        extra = max(budget - sum(payments), 0)
+        if strategy == "utilization":
+            for i in by_utilization:
+                if debts[i].kind == CREDIT_CARD and debts[i].credit_limit:
+                    above = max(balances[i] - payments[i] - round(0.3 * debts[i].credit_limit), 0)
+                    paid = min(above, extra)
+                    payments[i] += paid
+                    extra -= paid
+        for i in order:
+            paid = min(balances[i] - payments[i], extra)
+            payments[i] += paid
+            extra -= paid
+        balances = [balance - payment for balance, payment in zip(balances, payments)]
+        schedule.append(payments)
+    return schedule
+
+
+def test_strategies_match_a_debt_by_debt_simulation():
+    rng = random.Random(0)
+    debts = [
+        _card(f"Card {i}", rng.randrange(10_000, 1_000_000), rng.choice([0, 12.5, 19.99, 24.99, 29.99]), 1_500_000)
+        for i in range(12)
+    ] + [_installment("Phone", 4_500, 18), _installment("Laptop", 12_000, 7)]
+
+    plan = plan_payoff(debts, 250_000, TODAY)
+
+    for strategy in plan["strategies"]:
+        expected = _reference(debts, 250_000, strategy["strategy"])
+        assert [month["payments"] for month in strategy["schedule"]] == [
+            [payment / 100 for payment in month] for month in expected
+        ]
+        assert strategy["months_to_payoff"] == len(expected)
+        assert strategy["schedule"][-1]["balance"] == 0
+
+
+def test_single_card_amortizes_to_the_cent():
+    # $1,000 at 12% paying $100 a month: ten full payments and a last one of $58.98.
+    plan = plan_payoff([_card("Visa", 100_000, 12, 500_000)], 10_000, TODAY)
+
+    for strategy in plan["strategies"]:
+        assert strategy["months_to_payoff"] == 11
+        assert strategy["payoff_date"] == date(2027, 9, 1)
+        assert strategy["schedule"][-1]["payments"] == [58.98]
+        assert strategy["total_interest"] == pytest.approx(58.98)
+        assert strategy["total_paid"] == pytest.approx(1_058.98)
+
+
+def test_avalanche_saves_interest_and_snowball_clears_the_small_balance_first():
+    debts = [_card("Big", 500_000, 29.99, 600_000), _card("Small", 50_000, 9.99, 100_000)]
+
+    plan = plan_payoff(debts, 60_000, TODAY)
+
+    avalanche, snowball, _ = plan["strategies"]
+    assert avalanche["total_interest"] < snowball["total_interest"]
+    assert snowball["payoff_dates"][1] < avalanche["payoff_dates"][1]
+    assert plan["recommended"] == "avalanche"
+
+
+def test_utilization_strategy_targets_cards_above_thirty_percent_first():
+    # Store is at 90% of its limit but charges the least; the rest goes there first.
+    debts = [_card("Visa", 200_000, 24.99, 1_000_000), _card("Store", 90_000, 9.99, 100_000)]
+
+    plan = plan_payoff(debts, 70_000, TODAY)
+
+    avalanche, _, utilization = plan["strategies"]
+    assert avalanche["schedule"][0]["payments"][0] > utilization["schedule"][0]["payments"][0]
+    store_minimum = plan["debts"][1]["minimum_payment"]
+    assert utilization["schedule"][0]["payments"][1] > store_minimum
+
+
+def test_installments_are_paid_on_schedule_until_the_cards_are_clear():
+    debts = [_card("Visa", 300_000, 19.99, 1_000_000), _installment("Sofa", 10_000, 12)]
+
+    avalanche = plan_payoff(debts, 80_000, TODAY)["strategies"][0]
+
+    assert [month["payments"][1] for month in avalanche["schedule"][:3]] == [100.0, 100.0, 100.0]
+    assert avalanche["payoff_dates"][0] < avalanche["payoff_dates"][1]
+
+
+def test_budget_below_minimums_never_pays_off_and_is_rejected(monkeypatch):
+    debts = [_card("Visa", 1_000_000, 29.99, 1_200_000, min_pct=1)]
+    minimum = minimum_payment(debts)
+    plan = plan_payoff(debts, minimum - 1, TODAY)
+
+    assert plan["minimum_payment"] == minimum / 100
+    assert all(strategy["months_to_payoff"] is None for strategy in plan["strategies"])
+
+    card = SimpleNamespace(name="Visa", current_balance=10_000, apr=29.99, min_payment_pct=1, credit_limit=12_000)
+    monkeypatch.setattr(
+        debt_payoff, "rows_for_user", lambda db, model, user_id: [card] if model is debt_payoff.CreditCard else []
+    )
+    with pytest.raises(HTTPException) as exc:
+        build_payoff_plan(None, SimpleNamespace(id="user-1"), minimum / 100 - 1)
+    assert exc.value.status_code == 400
+
+
+def test_no_debts_is_an_empty_plan():
+    plan = plan_payoff([], 10_000, TODAY)
+
+    assert plan["strategies"] == [] and plan["recommended"] is None
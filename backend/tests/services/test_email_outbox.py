@@ -0,0 +1,227 @@
+import smtplib
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select
+
+from app.config import settings
+from app.models.email_outbox import EmailOutbox, OutboxStatus
+from app.services import email_outbox
+from app.services.email_outbox import (
+    ClaimedEmail,
+    failure_values,
+    purge_finished_emails,
+    queue_notification_email,
+    record_outcomes,
+    send_claimed,
+)
+from app.services.notifications import SMTPConnectionPool, _open_smtp_connection
+
+
+class RecordingHandler:
+    """aiosmtpd handler that stores messages and rejects one mailbox."""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("bounce@"):
+            return "550 5.1.1 No such mailbox"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_stub(monkeypatch):
+    # Only the SMTP round-trip tests need a server; the rest run without aiosmtpd.
+    aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+    handler = RecordingHandler()
+    port = _free_port()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", port)
+    monkeypatch.setattr(settings, "smtp_use_tls", False)
+    monkeypatch.setattr(settings, "smtp_username", None)
+    monkeypatch.setattr(settings, "smtp_from_email", "noreply@finpulse.test")
+    try:
+        yield handler
+    finally:
+        controller.stop()
+
+
+def _claimed(to_email: str, attempts: int = 1) -> ClaimedEmail:
+    return ClaimedEmail(uuid.uuid4(), to_email, "Weekly snapshot", "hello", attempts)
+
+
+def test_send_claimed_delivers_batch_over_pooled_sessions(smtp_stub):
+    pool = SMTPConnectionPool(2, 100, idle_seconds=60, connect=_open_smtp_connection)
+    emails = [_claimed(f"user{n}@example.com") for n in range(20)]
+
+    outcomes = send_claimed(emails, pool, max_workers=2)
+    pool.close_all()
+
+    assert all(exc is None for _, exc in outcomes)
+    assert len(smtp_stub.messages) == 20
+    assert pool.connections_opened <= 2
+    assert smtp_stub.messages[0].mail_from == "noreply@finpulse.test"
+
+
+def test_rejected_mailbox_fails_permanently(smtp_stub):
+    pool = SMTPConnectionPool(1, 100, idle_seconds=60, connect=_open_smtp_connection)
+    now = datetime(2026, 3, 2, tzinfo=timezone.utc)
+
+    [(email, exc)] = send_claimed([_claimed("bounce@example.com")], pool, max_workers=1)
+    pool.close_all()
+
+    assert isinstance(exc, smtplib.SMTPRecipientsRefused)
+    assert failure_values(email.attempts, exc, now)["status"] == OutboxStatus.FAILED
+
+
+def test_transient_failure_is_rescheduled_with_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "email_outbox_backoff_base_seconds", 30)
+    monkeypatch.setattr(settings, "email_outbox_backoff_max_seconds", 3600)
+    now = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    exc = smtplib.SMTPServerDisconnected("timed out")
+
+    first = failure_values(1, exc, now)
+    third = failure_values(3, exc, now)
+
+    assert first["status"] == OutboxStatus.PENDING
+    assert now + timedelta(seconds=15) <= first["next_attempt_at"] <= now + timedelta(seconds=30)
+    assert now + timedelta(seconds=60) <= third["next_attempt_at"] <= now + timedelta(seconds=120)
+
+
+def test_gives_up_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(settings, "email_outbox_max_attempts", 3)
+    exc = smtplib.SMTPServerDisconnected("timed out")
+
+    values = failure_values(3, exc, datetime.now(timezone.utc))
+
+    assert values["status"] == OutboxStatus.FAILED
+    assert "SMTPServerDisconnected" in values["last_error"]
+
+
+class FakeSession:
+    def __init__(self):
+        self.added = []
+        self.commits = 0
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def commit(self):
+        self.commits += 1
+
+
+def test_queue_only_inserts_a_row(monkeypatch):
+    monkeypatch.setattr(settings, "smtp_host", "smtp.example.com")
+    monkeypatch.setattr(settings, "smtp_from_email", "noreply@finpulse.test")
+    woken = SimpleNamespace(count=0)
+    monkeypatch.setattr(email_outbox.outbox_worker, "notify", lambda: setattr(woken, "count", woken.count + 1))
+    db = FakeSession()
+
+    assert queue_notification_email(db, "a@example.com", "Reset", "body") is True
+
+    [entry] = db.added
+    assert entry.to_email == "a@example.com"
+    assert db.commits == 1
+    assert woken.count == 1
+
+
+def test_queue_skips_when_smtp_not_configured(monkeypatch):
+    monkeypatch.setattr(settings, "smtp_host", None)
+    db = FakeSession()
+
+    assert queue_notification_email(db, "a@example.com", "Reset", "body") is False
+    assert db.added == []
+
+
+def _row(db, status, queued_days_ago, now):
+    entry = EmailOutbox(
+        to_email="a@example.com",
+        subject="Reset",
+        body="https://finpulse.test/login?mode=reset&token=secret",
+        status=status,
+        created_at=now - timedelta(days=queued_days_ago),
+    )
+    db.add(entry)
+    db.commit()
+    return entry.id
+
+
+def test_purge_deletes_only_finished_rows_past_retention(db, monkeypatch):
+    monkeypatch.setattr(settings, "email_outbox_retention_days", 7)
+    now = datetime.now(timezone.utc)
+    old_sent = _row(db, OutboxStatus.SENT, 8, now)
+    old_failed = _row(db, OutboxStatus.FAILED, 30, now)
+    old_pending = _row(db, OutboxStatus.PENDING, 8, now)
+    recent_sent = _row(db, OutboxStatus.SENT, 1, now)
+
+    assert purge_finished_emails(db, now, batch_size=1) == 1
+    assert purge_finished_emails(db, now, batch_size=10) == 1
+
+    remaining = set(db.scalars(select(EmailOutbox.id)))
+    assert remaining == {old_pending, recent_sent}
+    assert not remaining & {old_sent, old_failed}
+
+
+def test_sent_rows_lose_their_body(db):
+    now = datetime.now(timezone.utc)
+    sent_id = _row(db, OutboxStatus.SENDING, 0, now)
+    failed_id = _row(db, OutboxStatus.SENDING, 0, now)
+
+    record_outcomes(
+        db,
+        [
+            (ClaimedEmail(sent_id, "a@example.com", "Reset", "body", 1), None),
+            (ClaimedEmail(failed_id, "a@example.com", "Reset", "body", 1), smtplib.SMTPServerDisconnected("x")),
+        ],
+        now,
+    )
+
+    db.expire_all()
+    assert db.get(EmailOutbox, sent_id).body == ""
+    assert db.get(EmailOutbox, failed_id).body.startswith("https://")
+
+
+def test_worker_purges_on_its_own_interval():
+    now = [0.0]
+    purges = []
+    delivered = threading.Event()
+
+    def deliver():
+        now[0] += 600
+        if now[0] >= 3 * 3600:
+            delivered.set()
+        return {"claimed": 0}
+
+    worker = email_outbox.EmailOutboxWorker(
+        poll_seconds=0,
+        deliver=deliver,
+        purge=lambda: purges.append(now[0]) or 0,
+        purge_interval_seconds=3600,
+        clock=lambda: now[0],
+    )
+    worker.start()
+    try:
+        assert delivered.wait(2)
+    finally:
+        worker.stop()
+
+    # Delivery ran every ten minutes of fake time; purges only hourly.
+    assert purges[:3] == [600, 4200, 7800]
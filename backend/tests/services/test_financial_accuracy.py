@@ -1,3 +1,4 @@
+from collections import namedtuple
 from datetime import date, timedelta
 from types import SimpleNamespace
 
@@ -11,7 +12,9 @@ from app.models.investment import Investment
 from app.models.transaction import Transaction, TransactionType
 from app.models.weekly_review import WeeklyReview
 from app.services.analysis import generate_analysis
+from app.services.columnar import load_transactions
 from app.services.financial import _compute_monthly_expenses, build_dashboard_summary
+from app.services.money import to_cents
 from app.services.weekly_review import _build_weekly_snapshot, _generate_action
 
 
@@ -32,6 +35,9 @@ class FakeQuery:
     def all(self):
         return list(self._items)
 
+    def __iter__(self):
+        return iter(self._items)
+
     def first(self):
         return self._items[0] if self._items else None
 
@@ -46,6 +52,29 @@ class FakeSession:
     def query(self, model):
         return FakeQuery(self._data.get(model, []))
 
+    def _select(self, statement, params):
+        # Prebuilt statements (app.services.queries) carry their filters as
+        # bound parameters; like FakeQuery, only the limit is honoured.
+        columns = statement.column_descriptions
+        items = self._data.get(columns[0]["entity"], [])
+        if params and "limit" in params:
+            items = items[: params["limit"]]
+        if columns[0]["expr"] is columns[0]["entity"]:
+            return items
+        # Rows are tuples with named fields, like SQLAlchemy's Row.
+        row = namedtuple("Row", [c["name"] for c in columns])
+        return [row(*(_column_value(item, c["name"]) for c in columns)) for item in items]
+
+    def scalars(self, statement, params=None):
+        first = statement.column_descriptions[0]
+        items = self._select(statement, params)
+        if first["expr"] is not first["entity"]:
+            items = [getattr(item, first["name"]) for item in items]
+        return FakeQuery(items)
+
+    def execute(self, statement, params=None):
+        return FakeQuery(self._select(statement, params))
+
     def add(self, obj):
         self.added.append(obj)
 
@@ -56,6 +85,18 @@ class FakeSession:
         self.rollbacks += 1
 
 
+def _column_value(item, name):
+    # A projected column is either an attribute of the fake row or, for
+    # JSON key projections like ``snapshot['weekly_spending']``, a key of
+    # one of its documents.
+    if hasattr(item, name):
+        return getattr(item, name)
+    for document in (getattr(item, "snapshot", None), getattr(item, "raw_data", None)):
+        if document and name in document:
+            return document[name]
+    return None
+
+
 def _make_user():
     return SimpleNamespace(id="user-1")
 
@@ -75,6 +116,7 @@ def _txn(amount, txn_type, category, description=None, d=None):
     return SimpleNamespace(
         id=f"txn-{amount}-{category}",
         amount=amount,
+        amount_cents=to_cents(amount),
         transaction_type=txn_type,
         category=category,
         description=description,
@@ -88,13 +130,18 @@ def test_compute_monthly_expenses_avoids_recurring_double_count():
         _expense("Housing", 2000, description="Rent", frequency="monthly"),
         _expense("Insurance", 100, description="Auto", frequency="monthly"),
     ]
-    month_txns = [
-        _txn(2000, TransactionType.DEBIT, "Housing", description="Rent"),
-        _txn(500, TransactionType.DEBIT, "Food", description="Groceries"),
-    ]
+    db = FakeSession(
+        {
+            Transaction: [
+                _txn(2000, TransactionType.DEBIT, "Housing", description="Rent"),
+                _txn(500, TransactionType.DEBIT, "Food", description="Groceries"),
+            ]
+        }
+    )
+    month_txns = load_transactions(db, "user-1", date.today().replace(day=1), date.today())
 
     monthly_expenses = _compute_monthly_expenses(expenses, month_txns)
-    assert monthly_expenses == 2600
+    assert monthly_expenses == 260_000
 
 
 def test_dashboard_summary_uses_deduped_monthly_expenses():
@@ -167,8 +214,9 @@ def test_generate_action_anti_repeat_falls_back_when_no_alternative():
     db = FakeSession(
         {
             CreditCard: [
-                SimpleNamespace(name="Visa", current_balance=6000, credit_limit=7000),
+                SimpleNamespace(name="Visa", current_balance=6000, credit_limit=7000, apr=None, min_payment_pct=2),
             ],
+            InstallmentPlan: [],
             Goal: [],
             WeeklyReview: [
                 SimpleNamespace(action_type="pay_credit_card", snapshot=None),
@@ -179,6 +227,7 @@ def test_generate_action_anti_repeat_falls_back_when_no_alternative():
     )
     snapshot = {
         "credit_utilization_pct": 85,
+        "cash_flow": 0,
         "savings_balance": 0,
         "monthly_expenses": 0,
         "weekly_spending": 0,
@@ -193,8 +242,9 @@ def test_generate_action_anti_repeat_chooses_different_high_priority_action():
     db = FakeSession(
         {
             CreditCard: [
-                SimpleNamespace(name="Visa", current_balance=6000, credit_limit=7000),
+                SimpleNamespace(name="Visa", current_balance=6000, credit_limit=7000, apr=None, min_payment_pct=2),
             ],
+            InstallmentPlan: [],
             Goal: [],
             WeeklyReview: [
                 SimpleNamespace(action_type="pay_credit_card", snapshot=None),
@@ -205,6 +255,7 @@ def test_generate_action_anti_repeat_chooses_different_high_priority_action():
     )
     snapshot = {
         "credit_utilization_pct": 85,
+        "cash_flow": 0,
         "savings_balance": 100,
         "monthly_expenses": 1000,
         "weekly_spending": 0,
@@ -214,6 +265,37 @@ def test_generate_action_anti_repeat_chooses_different_high_priority_action():
     assert action["type"] == "build_emergency_fund"
 
 
+def test_generate_action_pays_the_card_the_payoff_plan_funds_first():
+    user = _make_user()
+    db = FakeSession(
+        {
+            CreditCard: [
+                SimpleNamespace(name="Visa", current_balance=6000, credit_limit=7000, apr=20, min_payment_pct=2),
+                SimpleNamespace(name="Amex", current_balance=2000, credit_limit=3000, apr=25, min_payment_pct=2),
+            ],
+            InstallmentPlan: [],
+            Goal: [],
+            WeeklyReview: [],
+            Transaction: [],
+        }
+    )
+    snapshot = {
+        "credit_utilization_pct": 80,
+        "cash_flow": 1000,
+        "savings_balance": 5000,
+        "monthly_expenses": 1000,
+        "weekly_spending": 0,
+    }
+
+    action = _generate_action(db, user, snapshot, date.today())
+
+    # Half the surplus on top of Amex's minimum: the highest APR goes first.
+    assert action["type"] == "pay_credit_card"
+    assert action["target_name"] == "Amex"
+    assert action["target_amount"] == 540.83
+    assert "avalanche plan" in action["detail"]
+
+
 def test_analysis_uses_monthly_normalized_expense_runway():
     user = _make_user()
     db = FakeSession(
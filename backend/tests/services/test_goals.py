@@ -0,0 +1,125 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.goal import Goal, GoalType
+from app.models.goal_contribution import GoalContribution
+from app.models.user import User
+from app.services.goals import (
+    calculate_goal_forecast,
+    get_goals_with_forecasts,
+    list_goals_with_forecasts,
+    record_contribution,
+)
+
+
+def _goal(db: Session, user: User, history: list[tuple[int, float]], target=5000, target_date=None) -> Goal:
+    """A goal whose balance was ``amount`` ``days_ago`` days ago, for each entry."""
+    now = datetime.now(timezone.utc)
+    goal = Goal(
+        user_id=user.id,
+        title=f"Goal {len(history)}",
+        goal_type=GoalType.SAVE,
+        target_amount=target,
+        current_amount=history[-1][1] if history else 0,
+        target_date=target_date,
+        created_at=now - timedelta(days=history[0][0] if history else 0),
+    )
+    db.add(goal)
+    for days_ago, balance in history:
+        db.add(GoalContribution(goal=goal, user_id=user.id, amount=0, balance=balance, recorded_at=now - timedelta(days=days_ago)))
+    db.commit()
+    return goal
+
+
+def test_forecast_fits_the_contribution_rate(db, make_user):
+    user = make_user()
+    today = date.today()
+    goal = _goal(db, user, [(100, 0), (50, 1000), (0, 2000)], target_date=today + timedelta(days=200))
+
+    forecast = calculate_goal_forecast(db, goal)
+
+    # 20/day; 3000 to go is 150 days. An exact fit has no spread.
+    assert forecast["monthly_rate"] == pytest.approx(20 * 365.25 / 12, abs=0.05)
+    assert forecast["projected_completion"] == today + timedelta(days=150)
+    assert forecast["completion_earliest"] == forecast["completion_latest"] == forecast["projected_completion"]
+    assert forecast["on_track"] is True
+
+
+def test_noisy_history_gets_a_band_and_a_late_target_is_off_track(db, make_user):
+    user = make_user()
+    today = date.today()
+    goal = _goal(
+        db, user, [(120, 0), (90, 900), (60, 1100), (30, 2100), (0, 2400)], target_date=today + timedelta(days=30)
+    )
+
+    forecast = calculate_goal_forecast(db, goal)
+
+    assert forecast["completion_earliest"] < forecast["projected_completion"] < forecast["completion_latest"]
+    assert forecast["on_track"] is False
+
+
+def test_goal_without_history_falls_back_to_elapsed_time(db, make_user):
+    user = make_user()
+    goal = _goal(db, user, [], target_date=date.today() + timedelta(days=90))
+
+    forecast = calculate_goal_forecast(db, goal)
+
+    assert forecast["monthly_rate"] is None
+    assert forecast["projected_completion"] is None
+    assert forecast["on_track"] is True
+    assert forecast["monthly_needed"] == pytest.approx(5000 / (90 / (365.25 / 12)), abs=0.01)
+
+
+def test_migrated_goal_is_fitted_from_its_backfilled_opening(db, make_user):
+    user = make_user()
+    today = date.today()
+    # Migration 009: zero at creation, then the balance as of the last update.
+    goal = _goal(db, user, [(100, 0), (10, 500)], target=1000, target_date=today + timedelta(days=100))
+
+    forecast = calculate_goal_forecast(db, goal)
+
+    assert forecast["monthly_rate"] > 0
+    assert today < forecast["projected_completion"] <= goal.target_date
+    assert forecast["on_track"] is True
+
+
+def test_single_recorded_balance_falls_back_to_elapsed_time(db, make_user):
+    user = make_user()
+    # Only the migrated balance: carried forward to today it would fit a rate of zero.
+    goal = _goal(db, user, [(10, 500)], target=1000, target_date=date.today() + timedelta(days=100))
+
+    forecast = calculate_goal_forecast(db, goal)
+
+    assert forecast["monthly_rate"] is None
+    assert forecast["on_track"] is True
+
+
+def test_listing_forecasts_every_goal_from_one_query(db, make_user):
+    user = make_user()
+    _goal(db, user, [(10, 0), (0, 100)])
+    _goal(db, user, [])
+    _goal(db, user, [(30, 5000)])
+
+    page = list_goals_with_forecasts(db, user.id, limit=2, offset=0)
+    everything = get_goals_with_forecasts(db, user.id)
+
+    assert len(page) == 2
+    assert len(everything) == 3
+    completed = next(g for g in everything if g["current_amount"] == 5000)
+    assert completed["projected_completion"] == date.today()
+
+
+def test_record_contribution_only_logs_changes(db, make_user):
+    user = make_user()
+    goal = _goal(db, user, [])
+
+    record_contribution(db, goal, 0)
+    goal.current_amount = 250
+    record_contribution(db, goal, 0)
+    db.commit()
+
+    entries = db.scalars(select(GoalContribution).where(GoalContribution.goal_id == goal.id)).all()
+    assert [(float(e.amount), float(e.balance)) for e in entries] == [(250.0, 250.0)]
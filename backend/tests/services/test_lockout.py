@@ -0,0 +1,173 @@
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.login_failure import LoginFailure
+from app.services.lockout import DatabaseLockoutStore, InMemoryLockoutStore
+
+WINDOW = 900
+
+
+class FakeClock:
+    def __init__(self, now=WINDOW * 1000):
+        self.now = float(now)
+
+    def __call__(self):
+        return self.now
+
+
+def test_in_memory_store_counts_and_resets():
+    clock = FakeClock()
+    store = InMemoryLockoutStore(WINDOW, max_entries=10, clock=clock)
+
+    for _ in range(5):
+        store.record_failure("User@Example.com")
+
+    assert store.failure_count("user@example.com") == 5
+    store.reset("user@example.com")
+    assert store.failure_count("user@example.com") == 0
+
+
+def test_in_memory_store_slides_previous_window_out():
+    clock = FakeClock()
+    store = InMemoryLockoutStore(WINDOW, max_entries=10, clock=clock)
+    for _ in range(4):
+        store.record_failure("a@example.com")
+
+    # Half-way into the next window, the previous window counts for half.
+    clock.now += WINDOW * 1.5
+    assert store.failure_count("a@example.com") == 2
+
+    # Two full windows later nothing remains.
+    clock.now += WINDOW
+    assert store.failure_count("a@example.com") == 0
+
+
+def test_in_memory_store_evicts_expired_entries():
+    clock = FakeClock()
+    store = InMemoryLockoutStore(WINDOW, max_entries=100, clock=clock)
+    for i in range(50):
+        store.record_failure(f"old-{i}@example.com")
+
+    clock.now += WINDOW * 3
+    store.record_failure("new@example.com")
+
+    assert len(store) == 1
+
+
+def test_in_memory_store_memory_is_bounded_under_email_spray():
+    clock = FakeClock()
+    store = InMemoryLockoutStore(WINDOW, max_entries=10_000, clock=clock)
+
+    # Warm up to the cap so the measured delta is steady-state growth only.
+    for i in range(10_000):
+        store.record_failure(f"warm-{i}@example.com")
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        for i in range(1_000_000):
+            store.record_failure(f"spray-{i}@example.com")
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(store) == 10_000
+    # A million distinct keys would need well over 100 MB if retained.
+    assert current - baseline < 2 * 1024 * 1024
+
+
+def test_in_memory_store_keeps_live_counters_when_full():
+    clock = FakeClock()
+    store = InMemoryLockoutStore(WINDOW, max_entries=3, clock=clock)
+    for _ in range(3):
+        store.record_failure("victim@example.com")
+
+    # Spraying throwaway addresses must not flush the victim's counter.
+    for i in range(100):
+        store.record_failure(f"spray-{i}@example.com")
+
+    assert store.failure_count("victim@example.com") == 3
+    assert len(store) == 3
+
+
+def test_spray_past_the_cap_does_not_lock_out_unrelated_addresses():
+    clock = FakeClock()
+    store = InMemoryLockoutStore(WINDOW, max_entries=100, clock=clock)
+
+    # One client fills the table, then keeps failing with fresh addresses.
+    for i in range(5_000):
+        store.record_failure(f"spray-{i}@example.com")
+
+    assert len(store) == 100
+    untouched = [f"user-{i}@example.com" for i in range(1_000)]
+    assert max(store.failure_count(email) for email in untouched) < 5
+
+    # Untracked keys are still counted, in their own buckets.
+    for _ in range(5):
+        store.record_failure("guessed@example.com")
+    assert store.failure_count("guessed@example.com") >= 5
+
+    # Once the spray's windows expire there is room again.
+    clock.now += WINDOW * 3
+    assert store.failure_count("guessed@example.com") == 0
+    store.record_failure("someone-new@example.com")
+    assert store.failure_count("someone-new@example.com") == 1
+    assert len(store) == 1
+
+
+@pytest.fixture
+def database_store():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    LoginFailure.__table__.create(engine)
+    clock = FakeClock()
+    yield DatabaseLockoutStore(WINDOW, session_factory=sessionmaker(engine), clock=clock), clock, sessionmaker(engine)
+    engine.dispose()
+
+
+def test_database_store_counts_slides_and_resets(database_store):
+    store, clock, _ = database_store
+    for _ in range(4):
+        store.record_failure("User@Example.com")
+    assert store.failure_count("user@example.com") == 4
+
+    clock.now += WINDOW * 1.5
+    assert store.failure_count("user@example.com") == 2
+    assert store.record_failure("user@example.com") == 3
+
+    store.reset("user@example.com")
+    assert store.failure_count("user@example.com") == 0
+
+
+def test_database_store_persists_only_key_hashes(database_store):
+    store, _, sessions = database_store
+    store.record_failure("secret@example.com")
+
+    with sessions() as db:
+        hashes = db.scalars(select(LoginFailure.key_hash)).all()
+    assert hashes == [DatabaseLockoutStore._key_hash("secret@example.com")]
+    assert "secret" not in hashes[0]
+
+
+def test_database_store_sweeps_expired_rows_at_most_once_per_interval(database_store):
+    store, clock, sessions = database_store
+    stale = datetime.now(timezone.utc) - timedelta(seconds=WINDOW * 3)
+    with sessions() as db:
+        db.add(LoginFailure(key_hash="stale", window_index=0, prev_count=0, curr_count=9, updated_at=stale))
+        db.commit()
+
+    store.record_failure("a@example.com")
+    with sessions() as db:
+        assert db.get(LoginFailure, "stale") is None
+        db.add(LoginFailure(key_hash="stale", window_index=0, prev_count=0, curr_count=9, updated_at=stale))
+        db.commit()
+
+    # Within the sweep interval the next failure does not sweep again.
+    clock.now += 1
+    store.record_failure("a@example.com")
+    with sessions() as db:
+        assert db.get(LoginFailure, "stale") is not None
@@ -0,0 +1,25 @@
+from decimal import Decimal
+
+from app.services.financial import _normalize_to_monthly
+from app.services.money import from_cents, to_cents
+
+
+def test_to_cents_accepts_every_loaded_representation():
+    assert to_cents(Decimal("19.99")) == 1999
+    assert to_cents(0.29) == 29
+    assert to_cents(2000) == 200_000
+    assert to_cents(None) == 0
+
+
+def test_cent_sums_are_exact():
+    amounts = [0.1] * 10 + [0.2] * 5
+    assert sum(amounts) != 2.0
+    assert from_cents(sum(to_cents(a) for a in amounts)) == 2.0
+
+
+def test_normalize_to_monthly_rounds_to_the_nearest_cent():
+    assert _normalize_to_monthly(10_000, "weekly") == 43_333
+    assert _normalize_to_monthly(10_000, "biweekly") == 21_667
+    assert _normalize_to_monthly(120_000, "yearly") == 10_000
+    assert _normalize_to_monthly(5_000, "monthly") == 5_000
+    assert _normalize_to_monthly(5_000, None) == 5_000
@@ -0,0 +1,94 @@
+import threading
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.services.partitions import (
+    PartitionMaintenance,
+    ensure_transaction_partitions,
+    partition_name,
+    partition_statements,
+    wanted_months,
+)
+from app.utils.dates import add_months
+
+
+def test_add_months_crosses_year_boundaries():
+    assert add_months(date(2026, 11, 1), 1) == date(2026, 12, 1)
+    assert add_months(date(2026, 12, 1), 1) == date(2027, 1, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert add_months(date(2026, 3, 1), -27) == date(2023, 12, 1)
+
+
+def test_partition_statements_move_default_rows_before_attaching():
+    statements = partition_statements(date(2026, 12, 1))
+
+    assert partition_name(date(2026, 12, 1)) == "transactions_y2026m12"
+    assert statements[0].startswith("CREATE TABLE transactions_y2026m12 (LIKE transactions")
+    assert "DELETE FROM transactions_default WHERE date >= '2026-12-01' AND date < '2027-01-01'" in statements[1]
+    assert statements[2] == (
+        "ALTER TABLE transactions ATTACH PARTITION transactions_y2026m12 "
+        "FOR VALUES FROM ('2026-12-01') TO ('2027-01-01')"
+    )
+
+
+def test_partition_statements_hash_subpartitions():
+    statements = partition_statements(date(2026, 10, 1), hash_partitions=4, table="bench.txn")
+
+    assert statements[0].endswith("PARTITION BY HASH (user_id)")
+    assert statements[1:5] == [
+        f"CREATE TABLE bench.txn_y2026m10_h{r} PARTITION OF bench.txn_y2026m10 "
+        f"FOR VALUES WITH (MODULUS 4, REMAINDER {r})"
+        for r in range(4)
+    ]
+    assert "DELETE FROM bench.txn_default" in statements[5]
+
+
+def test_partition_statements_quote_identifiers_that_need_it():
+    statements = partition_statements(date(2026, 10, 1), hash_partitions=2, table="Bench.Txn")
+
+    assert statements[0].startswith('CREATE TABLE "Bench"."Txn_y2026m10" (LIKE "Bench"."Txn" ')
+    assert statements[1].startswith('CREATE TABLE "Bench"."Txn_y2026m10_h0" PARTITION OF "Bench"."Txn_y2026m10"')
+    assert 'DELETE FROM "Bench"."Txn_default"' in statements[3]
+    assert statements[4].startswith('ALTER TABLE "Bench"."Txn" ATTACH PARTITION "Bench"."Txn_y2026m10"')
+
+
+def test_wanted_months_ignore_default_rows_outside_the_window():
+    in_default = {date(9999, 12, 1), date(1970, 1, 1), date(2019, 3, 1), date(2027, 1, 1), date(2027, 6, 1)}
+
+    wanted = wanted_months(date(2026, 10, 19), 3, in_default)
+
+    assert wanted == {
+        date(2019, 3, 1),
+        date(2026, 10, 1),
+        date(2026, 11, 1),
+        date(2026, 12, 1),
+        date(2027, 1, 1),
+    }
+    for month in wanted:
+        partition_statements(month)
+
+
+def test_ensure_partitions_is_a_noop_off_postgres():
+    engine = create_engine("sqlite://")
+    with Session(engine) as db:
+        assert ensure_transaction_partitions(db) == []
+
+
+def test_maintenance_thread_survives_failures():
+    calls = []
+    retried = threading.Event()
+
+    def maintain():
+        calls.append(1)
+        if len(calls) >= 2:
+            retried.set()
+        raise RuntimeError("database unavailable")
+
+    maintenance = PartitionMaintenance(interval_seconds=0.01, maintain=maintain)
+    maintenance.start()
+    try:
+        assert retried.wait(2)
+    finally:
+        maintenance.stop()
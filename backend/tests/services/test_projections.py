@@ -0,0 +1,132 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.models.account import Account
+from app.models.expense import Expense
+from app.models.goal import Goal, GoalType
+from app.models.installment_plan import InstallmentPlan
+from app.models.transaction import Transaction, TransactionType
+from app.services import projections
+from app.services.projections import ProjectionGoal, ProjectionInputs, load_projection_inputs, project, simulate
+
+TODAY = date(2026, 10, 19)
+
+
+def _inputs(**overrides) -> ProjectionInputs:
+    fields = {
+        "start": TODAY,
+        "cash": 1_000_000,
+        "invested": 0,
+        "card_debt": 50_000,
+        "monthly_contribution": 0,
+        "recurring_monthly": 0,
+        "installments": (),
+        "income_history": (500_000,) * 6,
+        "spending_history": (400_000,) * 6,
+        "goals": (),
+    }
+    return ProjectionInputs(**{**fields, **overrides})
+
+
+def test_steady_cash_flow_without_investments_is_exact():
+    result = simulate(_inputs(installments=((10_000, 18),)), years=3, paths=200, seed=1)
+
+    # 1,000 a month saved, less 100 a month for 18 months of installments.
+    expected = [10_000 + 1_000 * 12 * year - 100 * min(12 * year, 18) - 500 for year in (1, 2, 3)]
+    expected[0] -= 100 * 6  # six installments still owed after a year
+    for band, value in zip(result["net_worth"], expected):
+        assert band["p10"] == band["p50"] == band["p90"] == pytest.approx(value)
+    assert [band["date"] for band in result["net_worth"]] == [date(2027, 10, 1), date(2028, 10, 1), date(2029, 10, 1)]
+
+
+def test_recurring_schedule_is_a_floor_on_spending():
+    result = simulate(_inputs(recurring_monthly=450_000), years=1, paths=10, seed=1)
+
+    assert result["net_worth"][0]["p50"] == pytest.approx(10_000 + 500 * 12 - 500)
+
+
+def test_volatile_income_and_returns_spread_the_bands_and_repeat_per_seed():
+    inputs = _inputs(
+        invested=5_000_000, monthly_contribution=50_000, income_history=(300_000, 700_000, 450_000, 650_000)
+    )
+
+    result = simulate(inputs, years=10, paths=2_000, seed=7)
+
+    for band in result["net_worth"]:
+        assert band["p10"] < band["p25"] < band["p50"] < band["p75"] < band["p90"]
+    spreads = [band["p90"] - band["p10"] for band in result["net_worth"]]
+    assert spreads == sorted(spreads)
+    assert simulate(inputs, years=10, paths=2_000, seed=7) == result
+
+
+def test_goal_attainment_by_target_date():
+    goals = (
+        ProjectionGoal("done", "Done", 0, None),
+        ProjectionGoal("easy", "Easy", 500_000, date(2027, 10, 19)),
+        ProjectionGoal("hard", "Hard", 5_000_000, date(2027, 10, 19)),
+        ProjectionGoal("past", "Past", 100, date(2026, 1, 1)),
+        ProjectionGoal("open", "Open", 2_000_000, None),
+    )
+
+    result = simulate(_inputs(goals=goals), years=2, paths=100, seed=1)
+
+    probabilities = {goal["goal_id"]: goal["probability"] for goal in result["goals"]}
+    assert probabilities == {"done": 1.0, "easy": 1.0, "hard": 0.0, "past": 0.0, "open": 1.0}
+    assert result["goals"][4]["evaluated_on"] == date(2028, 10, 1)
+
+
+def test_inputs_load_balances_schedules_and_monthly_history(db, make_user):
+    user = make_user("projections@example.com")
+    account = Account(user_id=user.id, name="Chequing", account_type="chequing", balance=1234.56)
+    db.add_all(
+        [
+            account,
+            Expense(user_id=user.id, category="Gym", amount=12, is_recurring=True, frequency="weekly"),
+            Expense(user_id=user.id, category="Once", amount=999, is_recurring=False),
+            InstallmentPlan(
+                user_id=user.id,
+                description="Laptop",
+                total_amount=1200,
+                monthly_payment=100,
+                remaining_payments=4,
+                start_date=TODAY,
+            ),
+            Goal(user_id=user.id, title="Trip", goal_type=GoalType.SAVE, target_amount=3000, current_amount=500),
+        ]
+    )
+    db.flush()
+    for day, kind, amount in [
+        (date(2026, 8, 3), TransactionType.CREDIT, 4000),
+        (date(2026, 8, 20), TransactionType.DEBIT, 2500.25),
+        (date(2026, 9, 30), TransactionType.CREDIT, 4100),
+        (date(2026, 10, 2), TransactionType.CREDIT, 9999),  # current month: not history
+    ]:
+        db.add(Transaction(user_id=user.id, account_id=account.id, amount=amount, transaction_type=kind, date=day))
+    db.commit()
+
+    inputs = load_projection_inputs(db, user, today=TODAY)
+
+    assert inputs.cash == 123_456
+    assert inputs.recurring_monthly == 5_200
+    assert inputs.installments == ((10_000, 4),)
+    # History starts at the first month with transactions.
+    assert inputs.income_history == (400_000, 410_000)
+    assert inputs.spending_history == (250_025, 0)
+    assert [(goal.title, goal.needed) for goal in inputs.goals] == [("Trip", 250_000)]
+
+
+def test_project_runs_on_the_pool_and_caches_per_user_and_inputs():
+    projections.cache.clear()
+    inputs = _inputs()
+    try:
+        first = asyncio.run(project("user-1", inputs, 2))
+        again = asyncio.run(project("user-1", inputs, 2))
+        other = asyncio.run(project("user-1", inputs._replace(cash=0), 2))
+    finally:
+        projections.stop_projection_pool()
+
+    assert again is first
+    assert first["years"] == 2 and len(first["net_worth"]) == 2
+    assert other["net_worth"][0]["p50"] == pytest.approx(first["net_worth"][0]["p50"] - 10_000)
@@ -0,0 +1,135 @@
+from datetime import date, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models.account import Account
+from app.models.analysis_result import AnalysisResult
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.models.weekly_review import WeeklyReview
+from app.services.queries import (
+    get_user,
+    latest_transactions,
+    net_worth_before,
+    previous_snapshot,
+    recent_actions,
+    review_history,
+    rows_for_user,
+    transactions_between,
+)
+from app.services.weekly_review import _history_row_to_dict
+
+
+def _with_account(db: Session, user: User) -> tuple[User, Account]:
+    account = Account(user_id=user.id, name="Chequing", account_type="chequing", balance=0)
+    db.add(account)
+    db.flush()
+    return user, account
+
+
+def _add_txn(db: Session, user: User, account: Account, days_ago: int, txn_type=TransactionType.DEBIT, amount=10):
+    db.add(
+        Transaction(
+            user_id=user.id,
+            account_id=account.id,
+            amount=amount,
+            transaction_type=txn_type,
+            date=date.today() - timedelta(days=days_ago),
+        )
+    )
+
+
+def test_prebuilt_queries_are_scoped_to_the_user(db, make_user):
+    alice, alice_account = _with_account(db, make_user("alice@example.com"))
+    bob, bob_account = _with_account(db, make_user("bob@example.com"))
+    for days_ago in range(10):
+        _add_txn(db, alice, alice_account, days_ago)
+    _add_txn(db, bob, bob_account, 0)
+    db.commit()
+
+    assert [a.id for a in rows_for_user(db, Account, alice.id)] == [alice_account.id]
+    assert len(latest_transactions(db, alice.id, 3)) == 3
+    assert len(latest_transactions(db, bob.id, 3)) == 1
+    assert get_user(db, bob.id) is bob
+
+
+def test_transactions_between_is_inclusive_and_filters_debits(db, make_user):
+    user, account = _with_account(db, make_user("carol@example.com"))
+    for days_ago in range(7):
+        _add_txn(db, user, account, days_ago)
+    _add_txn(db, user, account, 0, TransactionType.CREDIT)
+    db.commit()
+    today = date.today()
+
+    in_range = transactions_between(db, user.id, today - timedelta(days=2), today)
+    debits = transactions_between(db, user.id, today - timedelta(days=2), today, debits_only=True)
+
+    assert len(in_range) == 4
+    assert len(debits) == 3
+
+
+def test_transactions_between_loads_amounts_as_exact_cents(db, make_user):
+    user, account = _with_account(db, make_user("dave@example.com"))
+    # 0.29 * 100 is 28.999... in binary floating point.
+    for amount in (0.29, 19.99, 1234567.89):
+        _add_txn(db, user, account, 0, amount=amount)
+    db.commit()
+
+    rows = transactions_between(db, user.id, date.today(), date.today())
+
+    assert sorted(row.amount_cents for row in rows) == [29, 1999, 123456789]
+    assert all(type(row.amount_cents) is int for row in rows)
+
+
+def _add_review(db: Session, user: User, weeks_ago: int, **snapshot):
+    week_start = date(2026, 10, 5) - timedelta(weeks=weeks_ago)
+    db.add(
+        WeeklyReview(
+            user_id=user.id,
+            week_start=week_start,
+            week_end=week_start + timedelta(days=6),
+            snapshot=snapshot,
+            prev_snapshot={"net_worth": 0},
+            changes=None,
+            action_type=f"action-{weeks_ago}",
+            action_title="Do the thing",
+        )
+    )
+
+
+def test_review_queries_project_snapshot_keys(db, make_user):
+    user = make_user("dave@example.com")
+    _add_review(db, user, 2, net_worth=100.0, weekly_spending=40.0)
+    _add_review(db, user, 1, net_worth=150.5, weekly_spending=75.25)
+    _add_review(db, user, 0, net_worth=175.0, weekly_spending=20.0)
+    db.commit()
+    this_week = date(2026, 10, 5)
+
+    assert previous_snapshot(db, user.id, this_week) == {"net_worth": 150.5, "weekly_spending": 75.25}
+    actions = recent_actions(db, user.id, this_week, 2)
+    assert [(a.action_type, a.weekly_spending) for a in actions] == [("action-1", 75.25), ("action-2", 40.0)]
+
+    history = [_history_row_to_dict(row) for row in review_history(db, user.id, 2)]
+    assert [h["week_start"] for h in history] == ["2026-10-05", "2026-09-28"]
+    assert history[0]["snapshot"]["net_worth"] == 175.0
+    assert history[0]["snapshot"]["total_assets"] is None
+    assert history[1]["action"]["type"] == "action-1"
+
+
+def test_net_worth_before_reads_latest_earlier_analysis(db, make_user):
+    user = make_user("erin@example.com")
+    for days_ago, net_worth in ((14, 900), (7, 1000), (0, 1200)):
+        db.add(
+            AnalysisResult(
+                user_id=user.id,
+                snapshot_date=date(2026, 10, 19) - timedelta(days=days_ago),
+                insights=[],
+                warnings=[],
+                recommendations=[],
+                raw_data={"net_worth": net_worth},
+            )
+        )
+    db.commit()
+
+    assert net_worth_before(db, user.id, date(2026, 10, 19)) == 1000
+    assert net_worth_before(db, user.id, date(2026, 10, 1)) is None
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.config import settings
+from app.services import supabase_auth
+from app.services.supabase_auth import CircuitBreaker, SupabaseAuthError
+
+
+class StubSupabaseHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Shared list of (status, body) responses to serve before defaulting to 200.
+    queued: list[tuple[int, dict]] = []
+    paths: list[str] = []
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.paths.append(self.path)
+        status, body = self.queued.pop(0) if self.queued else (200, {"user": {"id": "abc"}})
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    do_POST = _respond
+    do_PUT = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def stub_supabase(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSupabaseHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    StubSupabaseHandler.queued = []
+    StubSupabaseHandler.paths = []
+    monkeypatch.setattr(settings, "supabase_url", f"http://127.0.0.1:{server.server_port}")
+    monkeypatch.setattr(settings, "supabase_anon_key", "anon")
+    monkeypatch.setattr(supabase_auth, "_breaker", CircuitBreaker(3, 60))
+    monkeypatch.setattr(supabase_auth, "_retry_delay", lambda attempt: 0)
+    for key in supabase_auth._metrics:
+        monkeypatch.setitem(supabase_auth._metrics, key, 0)
+    supabase_auth.close_supabase_clients()
+    try:
+        yield StubSupabaseHandler
+    finally:
+        asyncio.run(supabase_auth.aclose_supabase_clients())
+        server.shutdown()
+        server.server_close()
+
+
+def test_pooled_client_reuses_connections(stub_supabase):
+    for _ in range(5):
+        result = supabase_auth.sign_in_with_password("a@example.com", "Password1!")
+        assert result["user"]["id"] == "abc"
+
+    metrics = supabase_auth.supabase_http_metrics()
+    assert metrics["requests"] == 5
+    assert metrics["new_connections"] == 1
+    assert metrics["reused_connections"] == 4
+    assert stub_supabase.paths[0] == "/auth/v1/token?grant_type=password"
+
+
+def test_retries_server_errors_then_succeeds(stub_supabase):
+    stub_supabase.queued = [(503, {"msg": "busy"}), (502, {"msg": "bad gateway"})]
+
+    result = supabase_auth.sign_in_with_password("a@example.com", "Password1!")
+
+    assert result["user"]["id"] == "abc"
+    assert supabase_auth.supabase_http_metrics()["retries"] == 2
+
+
+def test_client_errors_are_not_retried(stub_supabase):
+    stub_supabase.queued = [(400, {"error_description": "Invalid login credentials"})]
+
+    with pytest.raises(SupabaseAuthError) as exc_info:
+        supabase_auth.sign_in_with_password("a@example.com", "wrong")
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Invalid login credentials"
+    assert supabase_auth.supabase_http_metrics()["retries"] == 0
+
+
+def test_non_idempotent_requests_are_not_retried(stub_supabase):
+    stub_supabase.queued = [(503, {"msg": "busy"})] * 2
+
+    with pytest.raises(SupabaseAuthError):
+        supabase_auth.send_recovery_email("a@example.com", None)
+    with pytest.raises(SupabaseAuthError):
+        supabase_auth.sign_up_user("a@example.com", "Password1!", "A")
+
+    assert stub_supabase.paths == ["/auth/v1/recover", "/auth/v1/signup"]
+    assert supabase_auth.supabase_http_metrics()["retries"] == 0
+
+
+def test_circuit_opens_after_repeated_failures(stub_supabase):
+    stub_supabase.queued = [(500, {"msg": "down"})] * 3
+
+    with pytest.raises(SupabaseAuthError):
+        supabase_auth.sign_in_with_password("a@example.com", "Password1!")
+
+    with pytest.raises(SupabaseAuthError) as exc_info:
+        supabase_auth.sign_in_with_password("a@example.com", "Password1!")
+
+    assert exc_info.value.status_code == 503
+    metrics = supabase_auth.supabase_http_metrics()
+    assert metrics["circuit_state"] == "open"
+    assert metrics["circuit_rejections"] == 1
+
+
+def test_async_client_reuses_connections(stub_supabase):
+    async def run():
+        for _ in range(3):
+            await supabase_auth.sign_in_with_password_async("a@example.com", "Password1!")
+        await supabase_auth.aclose_supabase_clients()
+
+    asyncio.run(run())
+
+    metrics = supabase_auth.supabase_http_metrics()
+    assert metrics["requests"] == 3
+    assert metrics["new_connections"] == 1
+
+
+def test_circuit_breaker_half_open_allows_single_trial():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+    breaker.record_failure()
+    assert not breaker.allow_request()
+
+    now[0] = 11
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_unexpected_error_releases_the_half_open_trial(stub_supabase, monkeypatch, use_async):
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=lambda: now[0])
+    monkeypatch.setattr(supabase_auth, "_breaker", breaker)
+    breaker.record_failure()
+    now[0] = 11
+
+    def broken_trace(*args):
+        raise RuntimeError("bug in a hook")
+
+    monkeypatch.setattr(supabase_auth, "_trace", broken_trace)
+    with pytest.raises(RuntimeError):
+        if use_async:
+            asyncio.run(supabase_auth.sign_in_with_password_async("a@example.com", "Password1!"))
+        else:
+            supabase_auth.sign_in_with_password("a@example.com", "Password1!")
+
+    # The failed trial re-opened the circuit instead of leaving it stuck half-open.
+    assert breaker.state == "open"
+    now[0] = 22
+    assert breaker.allow_request()
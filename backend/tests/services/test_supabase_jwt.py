@@ -0,0 +1,150 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+
+from app.config import settings
+from app.services import supabase_jwt
+from app.services.supabase_jwt import SupabaseJWKSCache, verify_supabase_access_token
+
+SUPABASE_URL = "https://project.supabase.co"
+
+
+def _rsa_keypair(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = kid
+    return private_pem, public_jwk
+
+
+def _token(key, algorithm, kid=None, **overrides):
+    claims = {
+        "sub": "6f1d2b1e-8d3c-4c4e-9a51-2f1f0f7d9c11",
+        "aud": "authenticated",
+        "iss": f"{SUPABASE_URL}/auth/v1",
+        "exp": datetime.now(timezone.utc) + timedelta(minutes=5),
+    }
+    claims.update(overrides)
+    headers = {"kid": kid} if kid else None
+    return jwt.encode(claims, key, algorithm=algorithm, headers=headers)
+
+
+@pytest.fixture
+def supabase_settings(monkeypatch):
+    monkeypatch.setattr(settings, "supabase_url", SUPABASE_URL)
+    monkeypatch.setattr(settings, "supabase_anon_key", "anon")
+    monkeypatch.setattr(settings, "supabase_jwt_secret", "supabase-shared-secret")
+
+
+def test_verifies_hs256_token_with_shared_secret(supabase_settings):
+    token = _token("supabase-shared-secret", "HS256")
+    claims = verify_supabase_access_token(token)
+    assert claims["sub"] == "6f1d2b1e-8d3c-4c4e-9a51-2f1f0f7d9c11"
+
+
+def test_rejects_wrong_audience(supabase_settings):
+    token = _token("supabase-shared-secret", "HS256", aud="anon")
+    with pytest.raises(JWTError):
+        verify_supabase_access_token(token)
+
+
+def _signal_refreshes(cache, monkeypatch) -> threading.Event:
+    """Returns an event set each time ``cache`` finishes a refresh."""
+    refreshed = threading.Event()
+    original = cache.refresh
+
+    def refresh():
+        try:
+            return original()
+        finally:
+            refreshed.set()
+
+    monkeypatch.setattr(cache, "refresh", refresh)
+    return refreshed
+
+
+def test_verifies_rotated_jwks_key_without_restart(supabase_settings, monkeypatch):
+    old_private, old_public = _rsa_keypair("old")
+    new_private, new_public = _rsa_keypair("new")
+    published = {"keys": [old_public]}
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return published
+
+    now = [1000.0]
+    cache = SupabaseJWKSCache(fetch=fetch, clock=lambda: now[0])
+    fetched = _signal_refreshes(cache, monkeypatch)
+    cache.start()
+    assert fetched.wait(5)
+    fetched.clear()
+    monkeypatch.setattr(supabase_jwt, "jwks_cache", cache)
+
+    try:
+        assert verify_supabase_access_token(_token(old_private, "RS256", kid="old"))["aud"] == "authenticated"
+
+        # Supabase rotates keys. The first token with the unknown kid is rejected
+        # without waiting on the network, and wakes the background refresh.
+        published = {"keys": [old_public, new_public]}
+        now[0] += 60
+        with pytest.raises(JWTError):
+            verify_supabase_access_token(_token(new_private, "RS256", kid="new"))
+        assert fetched.wait(5)
+        assert verify_supabase_access_token(_token(new_private, "RS256", kid="new"))
+        assert len(fetches) == 2
+
+        # Cached keys are used from then on with no further fetches.
+        verify_supabase_access_token(_token(new_private, "RS256", kid="new"))
+        assert len(fetches) == 2
+    finally:
+        cache.stop()
+
+
+def test_unknown_kid_does_not_fetch_on_the_calling_thread(supabase_settings, monkeypatch):
+    private, public = _rsa_keypair("known")
+    fetch_threads = []
+
+    def fetch():
+        fetch_threads.append(threading.current_thread())
+        return {"keys": [public]}
+
+    cache = SupabaseJWKSCache(fetch=fetch, clock=lambda: 1000.0)
+    fetched = _signal_refreshes(cache, monkeypatch)
+    monkeypatch.setattr(supabase_jwt, "jwks_cache", cache)
+
+    with pytest.raises(JWTError):
+        verify_supabase_access_token(_token(private, "RS256", kid="known"))
+    assert fetched.wait(5)
+    assert fetch_threads[0] is not threading.current_thread()
+    assert verify_supabase_access_token(_token(private, "RS256", kid="known"))
+
+
+def test_unknown_kid_refreshes_are_rate_limited(supabase_settings, monkeypatch):
+    private, public = _rsa_keypair("known")
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return {"keys": [public]}
+
+    cache = SupabaseJWKSCache(fetch=fetch, clock=lambda: 1000.0)
+    cache.refresh()
+    monkeypatch.setattr(supabase_jwt, "jwks_cache", cache)
+
+    for _ in range(5):
+        with pytest.raises(JWTError):
+            verify_supabase_access_token(_token(private, "RS256", kid="forged"))
+    assert len(fetches) == 1
@@ -0,0 +1,105 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.database import Base, RoutingSession
+from app.models.user import User
+from app.models.weekly_review import WeeklyReview
+from app.services import weekly_review
+from app.services.weekly_review import _iso_week_bounds, get_or_create_weekly_review
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for bind in (primary, replica):
+        Base.metadata.create_all(bind)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _review(user_id, title: str) -> WeeklyReview:
+    week_start, week_end = _iso_week_bounds(date.today())
+    return WeeklyReview(
+        user_id=user_id,
+        week_start=week_start,
+        week_end=week_end,
+        snapshot={},
+        action_type="review",
+        action_title=title,
+    )
+
+
+def _seed_user(bind) -> User:
+    factory = sessionmaker(bind)
+    with factory() as db:
+        user = User(email="review@example.com", hashed_password="x", full_name="Test")
+        db.add(user)
+        db.commit()
+        db.refresh(user)
+        db.expunge(user)
+    return user
+
+
+def test_existing_review_is_read_from_the_replica(engines):
+    primary, replica = engines
+    user = _seed_user(primary)
+    with sessionmaker(replica)() as db:
+        db.add(_review(user.id, "Replicated"))
+        db.commit()
+
+    with sessionmaker(class_=RoutingSession, bind=primary)() as db:
+        db.info["replica_bind"] = replica
+        review = get_or_create_weekly_review(db, user)
+        pinned = db.info.get("use_primary")
+
+    assert review["action"]["title"] == "Replicated"
+    assert not pinned
+
+
+def test_replica_miss_returns_the_primary_row_without_a_conflict(engines):
+    primary, replica = engines
+    user = _seed_user(primary)
+    with sessionmaker(primary)() as db:
+        db.add(_review(user.id, "Created on the primary"))
+        db.commit()
+
+    with sessionmaker(class_=RoutingSession, bind=primary)() as db:
+        db.info["replica_bind"] = replica  # has not caught up
+        review = get_or_create_weekly_review(db, user)
+
+    with sessionmaker(primary)() as db:
+        count = db.scalar(select(func.count()).select_from(WeeklyReview))
+    assert review["action"]["title"] == "Created on the primary"
+    assert count == 1
+
+
+def test_review_created_concurrently_is_returned_instead_of_conflicting(engines, monkeypatch):
+    primary, _ = engines
+    user = _seed_user(primary)
+    lookup = weekly_review.review_for_week
+    looked = []
+
+    def review_for_week(db, user_id, week_start):
+        # Another worker creates the review just after this request first looked.
+        if not looked:
+            looked.append(True)
+            with sessionmaker(primary)() as other:
+                other.add(_review(user_id, "Created by another worker"))
+                other.commit()
+            return None
+        return lookup(db, user_id, week_start)
+
+    monkeypatch.setattr(weekly_review, "review_for_week", review_for_week)
+
+    with sessionmaker(class_=RoutingSession, bind=primary)() as db:
+        review = get_or_create_weekly_review(db, user)
+        count = db.scalar(select(func.count()).select_from(WeeklyReview))
+
+    assert review["action"]["title"] == "Created by another worker"
+    assert count == 1
@@ -0,0 +1,123 @@
+import smtplib
+from datetime import datetime, timezone
+from email.message import EmailMessage
+
+import pytest
+
+from app.services.notifications import SMTPConnectionPool
+from app.services.weekly_summaries import due_schedule_slots
+
+
+class FakeSMTP:
+    def __init__(self, fail_first_send: bool = False):
+        self.sent: list[EmailMessage] = []
+        self.closed = False
+        self._fail_next = fail_first_send
+
+    def send_message(self, message):
+        if self._fail_next:
+            self._fail_next = False
+            raise smtplib.SMTPServerDisconnected("idle timeout")
+        self.sent.append(message)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+def _message(n: int) -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = f"user{n}@example.com"
+    message.set_content("hello")
+    return message
+
+
+def _pool(factory, **kwargs) -> SMTPConnectionPool:
+    options = {"max_connections": 2, "max_messages_per_connection": 100, "idle_seconds": 60}
+    options.update(kwargs)
+    return SMTPConnectionPool(connect=factory, **options)
+
+
+def test_pool_reuses_one_session_for_many_messages():
+    servers = []
+
+    def connect():
+        servers.append(FakeSMTP())
+        return servers[-1]
+
+    pool = _pool(connect)
+    for n in range(50):
+        pool.send(_message(n))
+
+    assert pool.connections_opened == 1
+    assert pool.messages_sent == 50
+    assert len(servers[0].sent) == 50
+
+
+def test_pool_rotates_sessions_after_message_cap():
+    servers = []
+
+    def connect():
+        servers.append(FakeSMTP())
+        return servers[-1]
+
+    pool = _pool(connect, max_messages_per_connection=10)
+    for n in range(25):
+        pool.send(_message(n))
+
+    assert pool.connections_opened == 3
+    assert [len(s.sent) for s in servers] == [10, 10, 5]
+    assert servers[0].closed and servers[1].closed
+
+
+def test_pool_discards_sessions_idle_past_limit():
+    servers = [FakeSMTP(), FakeSMTP()]
+    opened = list(servers)
+    now = [0.0]
+    pool = SMTPConnectionPool(2, 100, idle_seconds=60, connect=lambda: servers.pop(0), clock=lambda: now[0])
+
+    pool.send(_message(1))
+    now[0] = 120
+    pool.send(_message(2))
+
+    assert pool.connections_opened == 2
+    assert opened[0].closed
+    assert len(opened[1].sent) == 1
+
+
+def test_pool_retries_once_on_disconnect():
+    servers = [FakeSMTP(fail_first_send=True), FakeSMTP()]
+    delivered_by = list(servers)
+    pool = _pool(lambda: servers.pop(0))
+
+    pool.send(_message(1))
+
+    assert delivered_by[0].sent == []
+    assert len(delivered_by[1].sent) == 1
+
+
+def test_pool_gives_up_after_second_disconnect():
+    pool = _pool(lambda: FakeSMTP(fail_first_send=True))
+
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        pool.send(_message(1))
+
+
+def test_due_slots_follow_each_users_local_time():
+    now = datetime(2026, 3, 2, 14, 0, tzinfo=timezone.utc)  # Monday 14:00 UTC
+
+    slots = due_schedule_slots(["America/Toronto", "Asia/Tokyo", "UTC"], now)
+
+    assert slots == [
+        ("America/Toronto", 0, 9),
+        ("Asia/Tokyo", 0, 23),
+        ("UTC", 0, 14),
+    ]
+
+
+def test_due_slots_skip_unknown_timezones():
+    now = datetime(2026, 3, 2, 14, 0, tzinfo=timezone.utc)
+
+    assert due_schedule_slots(["Not/AZone", "Europe/London"], now) == [("Europe/London", 0, 14)]
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.config import settings
+from app.database import InstrumentedQueuePool, _connect_args, api_threadpool_size, pool_metrics
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics_track_checkouts_and_timeouts(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        assert pool_metrics(sqlite_engine)["checked_out"] == 1
+        with pytest.raises(PoolTimeoutError):
+            sqlite_engine.connect()
+
+    metrics = pool_metrics(sqlite_engine)
+    assert metrics["checked_out"] == 0
+    assert metrics["checkouts"] == 2
+    assert metrics["timeouts"] == 1
+    assert metrics["wait_ms_max"] >= 40
+
+
+def test_pool_metrics_survive_dispose(sqlite_engine):
+    with sqlite_engine.connect():
+        pass
+    sqlite_engine.dispose()
+
+    assert pool_metrics(sqlite_engine)["checkouts"] == 1
+
+
+def test_postgres_connections_carry_server_timeouts():
+    args = _connect_args("postgresql://u:p@localhost/x")
+
+    assert f"statement_timeout={settings.db_statement_timeout_ms}" in args["options"]
+    assert "idle_in_transaction_session_timeout" in args["options"]
+    assert _connect_args("sqlite://") == {}
+
+
+def test_threadpool_defaults_to_pool_capacity(monkeypatch):
+    monkeypatch.setattr(settings, "api_threadpool_size", None)
+
+    assert api_threadpool_size() == settings.db_pool_size + settings.db_max_overflow
+
+
+def test_threadpool_larger_than_pool_capacity_fails_startup(monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 10)
+    monkeypatch.setattr(settings, "db_max_overflow", 5)
+    monkeypatch.setattr(settings, "api_threadpool_size", 16)
+
+    with pytest.raises(RuntimeError, match="API_THREADPOOL_SIZE"):
+        api_threadpool_size()
+
+    monkeypatch.setattr(settings, "api_threadpool_size", 12)
+    assert api_threadpool_size() == 12
+
+
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("postgres://u:p@db/x", "postgresql+asyncpg://u:p@db/x"),
+        ("postgresql+psycopg2://u:p@db/x?sslmode=require", "postgresql+asyncpg://u:p@db/x?ssl=require"),
+    ],
+)
+def test_async_database_url_uses_asyncpg(monkeypatch, url, expected):
+    monkeypatch.setattr(settings, "database_url", url)
+
+    assert settings.async_database_url == expected
+
+
+def test_async_engine_uses_instrumented_pool():
+    pytest.importorskip("asyncpg")
+    from app.database import InstrumentedAsyncQueuePool, build_async_engine
+
+    async_engine = build_async_engine("postgresql+asyncpg://u:p@localhost/x")
+
+    assert isinstance(async_engine.sync_engine.pool, InstrumentedAsyncQueuePool)
+    assert pool_metrics(async_engine.sync_engine)["checked_out"] == 0
@@ -0,0 +1,64 @@
+import json
+import logging
+import queue
+
+from app.logging_config import BoundedQueueHandler, DrainingQueueListener, JSONFormatter
+
+
+def _logger(handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger("finpulse.test_logging_config")
+    logger.handlers[:] = [handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = BoundedQueueHandler(queue.Queue(maxsize=2), block_seconds=0.01)
+    logger = _logger(handler)
+
+    for n in range(5):
+        logger.info("burst %d", n)
+    logger.error("still bounded")
+
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 4
+
+
+def test_queued_records_are_rendered_before_args_can_change():
+    handler = BoundedQueueHandler(queue.Queue(), block_seconds=0.01)
+    logger = _logger(handler)
+    payload = {"state": "before"}
+
+    logger.info("payload=%s", payload)
+    payload["state"] = "after"
+
+    record = handler.queue.get_nowait()
+    assert record.getMessage() == "payload={'state': 'before'}"
+
+
+def test_listener_formats_json_and_drains_on_stop():
+    lines = []
+
+    class _Sink(logging.Handler):
+        def emit(self, record):
+            lines.append(self.format(record))
+
+    sink = _Sink()
+    sink.setFormatter(JSONFormatter())
+    handler = BoundedQueueHandler(queue.Queue(maxsize=4), block_seconds=0.01)
+    logger = _logger(handler)
+    listener = DrainingQueueListener(handler.queue, sink)
+
+    for n in range(3):
+        logger.info("queued %d", n)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("failed")
+    listener.start()
+    listener.stop()
+
+    records = [json.loads(line) for line in lines]
+    assert [r["message"] for r in records] == ["queued 0", "queued 1", "queued 2", "failed"]
+    assert "ZeroDivisionError" in records[3]["exc"]
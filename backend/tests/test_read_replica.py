@@ -0,0 +1,145 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Integer, String, create_engine, select, text, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, sessionmaker
+
+from app import database
+from app.database import READ_YOUR_WRITES_COOKIE, RecentWriters, RoutingSession
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+
+
+class _Base(DeclarativeBase):
+    pass
+
+
+class Note(_Base):
+    __tablename__ = "notes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source: Mapped[str] = mapped_column(String(20))
+
+
+@pytest.fixture
+def engines(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for bind, label in ((primary, "primary"), (replica, "replica")):
+        _Base.metadata.create_all(bind)
+        with bind.begin() as conn:
+            conn.execute(Note.__table__.insert(), {"id": 1, "source": label})
+    try:
+        yield primary, replica
+    finally:
+        primary.dispose()
+        replica.dispose()
+
+
+@pytest.fixture
+def make_session(engines, monkeypatch):
+    primary, replica = engines
+    monkeypatch.setattr(database, "recent_writers", RecentWriters(window_seconds=5))
+    factory = sessionmaker(class_=RoutingSession, bind=primary)
+
+    def make(read_only: bool = True) -> RoutingSession:
+        db = factory()
+        if read_only:
+            db.info["replica_bind"] = replica
+        return db
+
+    return make
+
+
+def _source(db) -> str:
+    return db.scalar(select(Note.source).where(Note.id == 1))
+
+
+def test_reads_go_to_replica_only_for_read_only_sessions(make_session):
+    with make_session() as db:
+        assert _source(db) == "replica"
+    with make_session(read_only=False) as db:
+        assert _source(db) == "primary"
+
+
+def test_flush_goes_to_primary_and_pins_session(make_session, engines):
+    primary, _ = engines
+    with make_session() as db:
+        db.add(Note(id=2, source="new"))
+        db.commit()
+        assert _source(db) == "primary"
+
+    with primary.connect() as conn:
+        assert conn.execute(text("SELECT source FROM notes WHERE id = 2")).scalar() == "new"
+
+
+def test_dml_and_locking_reads_go_to_primary(make_session):
+    with make_session() as db:
+        db.execute(update(Note).where(Note.id == 1).values(source="edited"))
+        db.commit()
+        assert _source(db) == "edited"
+
+    with make_session() as db:
+        db.execute(select(Note).with_for_update())
+        assert db.info["use_primary"]
+
+
+def test_user_reads_own_writes_within_window(make_session):
+    with make_session() as db:
+        db.bind_user("user-1")
+        db.add(Note(id=3, source="new"))
+        db.commit()
+
+    with make_session() as db:
+        db.bind_user("user-1")
+        assert not db.reads_from_replica
+        assert _source(db) == "primary"
+
+    with make_session() as db:
+        db.bind_user("user-2")
+        assert _source(db) == "replica"
+
+
+def test_recent_writers_expire_and_stay_bounded():
+    now = [0.0]
+    writers = RecentWriters(window_seconds=5, max_entries=2, clock=lambda: now[0])
+    writers.mark("a")
+    writers.mark("b")
+    writers.mark("c")
+
+    assert not writers.is_recent("a")
+    assert writers.is_recent("c")
+    now[0] = 6
+    assert not writers.is_recent("c")
+
+
+def test_write_cookie_pins_reads_to_primary_on_another_worker(make_session, monkeypatch):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.post("/notes")
+    def write_note():
+        with make_session(read_only=False) as db:
+            db.bind_user("user-1")
+            db.add(Note(id=4, source="new"))
+            db.commit()
+        return {}
+
+    @app.get("/notes/1")
+    def read_note():
+        with make_session() as db:
+            db.bind_user("user-1")
+            return {"source": _source(db)}
+
+    client = TestClient(app)
+    assert READ_YOUR_WRITES_COOKIE not in client.get("/notes/1").cookies
+
+    response = client.post("/notes")
+    assert READ_YOUR_WRITES_COOKIE in response.cookies
+    # Another worker has not seen the write; only the cookie tells it.
+    monkeypatch.setattr(database, "recent_writers", RecentWriters(window_seconds=5))
+    assert client.get("/notes/1").json() == {"source": "primary"}
+
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, "1.0")  # long expired
+    assert client.get("/notes/1").json() == {"source": "replica"}
+    client.cookies.set(READ_YOUR_WRITES_COOKIE, "not-a-time")
+    assert client.get("/notes/1").json() == {"source": "replica"}
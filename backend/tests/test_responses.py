@@ -0,0 +1,74 @@
+import json
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401
+from app.database import Base
+from app.models.account import Account
+from app.models.transaction import Transaction, TransactionType
+from app.models.user import User
+from app.responses import ORJSONResponse, dumps, rows_response
+from app.routers.transactions import _RESPONSE_COLUMNS
+from app.schemas.transaction import TransactionResponse
+
+
+def test_rows_match_the_pydantic_encoding():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        user = User(email="rows@example.com", hashed_password="x", full_name="Rows")
+        db.add(user)
+        db.flush()
+        account = Account(user_id=user.id, name="Chequing", account_type="chequing", balance=0)
+        db.add(account)
+        db.flush()
+        for n, kind in enumerate((TransactionType.DEBIT, TransactionType.CREDIT)):
+            db.add(
+                Transaction(
+                    user_id=user.id,
+                    account_id=account.id,
+                    amount=Decimal("12.34") + n,
+                    transaction_type=kind,
+                    category=None if n else "Food",
+                    description="Lunch",
+                    date=date(2025, 3, 1 + n),
+                )
+            )
+        db.commit()
+
+        result = db.execute(select(*_RESPONSE_COLUMNS).order_by(Transaction.date))
+        fast = json.loads(rows_response(tuple(result.keys()), result).body)
+        validated = [
+            TransactionResponse.model_validate(t).model_dump(mode="json")
+            for t in db.scalars(select(Transaction).order_by(Transaction.date))
+        ]
+
+    assert fast == validated
+    engine.dispose()
+
+
+def test_aware_datetimes_and_decimals_encode_like_pydantic():
+    row = {
+        "id": uuid.uuid4(),
+        "user_id": uuid.uuid4(),
+        "account_id": uuid.uuid4(),
+        "amount": Decimal("1999.99"),
+        "transaction_type": TransactionType.DEBIT,
+        "category": "Travel",
+        "description": None,
+        "date": date(2025, 1, 31),
+        "created_at": datetime(2025, 1, 31, 8, 30, 15, 123456, tzinfo=timezone.utc),
+    }
+
+    assert json.loads(dumps(row)) == TransactionResponse.model_validate(row).model_dump(mode="json")
+
+
+def test_response_class_uses_orjson_encoding():
+    response = ORJSONResponse({"when": datetime(2025, 1, 1, tzinfo=timezone.utc), "amount": Decimal("2.50")})
+
+    assert response.body == b'{"when":"2025-01-01T00:00:00Z","amount":2.5}'
+    assert response.media_type == "application/json"